@@ -77,6 +77,62 @@ DEFAULT_EXCLUDED_DIRS = [
 # ==============================================================================
 HASH_BLOCK_SIZE = 8192
 
+# ==============================================================================
+# RECORRIDO CONCURRENTE (--walk-threads)
+# On NFS/FUSE mounts every scandir() is a network round trip; listing several
+# directories at once hides that latency. 1 keeps the sequential walker.
+# WALK_QUEUE_SIZE bounds the per-directory batches waiting for the hashing
+# stage, so a slow hasher throttles the walkers instead of buffering the tree.
+# ==============================================================================
+WALK_THREADS = 1
+WALK_QUEUE_SIZE = 256
+
+# ==============================================================================
+# PIPELINE EN STREAMING (--stream)
+# Hashing threads and the maximum number of files queued for hashing at once.
+# When the limit is reached the walk waits, which bounds memory on huge trees.
+# ==============================================================================
+HASH_WORKERS = 4
+HASH_QUEUE_SIZE = 64
+
+# ==============================================================================
+# CHECKPOINTS (--checkpoint / --resume)
+# Scan progress (walked/pending directories and computed hashes) is saved
+# every CHECKPOINT_INTERVAL seconds under CHECKPOINT_DIR, one file per
+# (directory, filename, exclusions) combination. The file is removed when
+# the run finishes successfully.
+# ==============================================================================
+CHECKPOINT_DIR = "~/.cache/hardlinks-creator"
+CHECKPOINT_INTERVAL = 30
+
+# ==============================================================================
+# FASE DE ENLACE (--link-workers)
+# Links run on a thread pool, one target directory per work unit, behind a
+# write-ahead journal stored in JOURNAL_DIR. Journals left by a crashed run
+# are replayed or rolled back automatically before the next apply phase.
+# ==============================================================================
+LINK_WORKERS = 4
+JOURNAL_DIR = "~/.cache/hardlinks-creator/journal"
+
+# Directory descriptors kept open (LRU) so rename/link/unlink run relative
+# to their parent directory instead of resolving the full path every call.
+DIRFD_CACHE_SIZE = 256
+
+# ==============================================================================
+# INVENTARIO (--inventory)
+# Number of inode groups with the largest savings shown on the terminal.
+# The JSON/NDJSON report always contains every group.
+# ==============================================================================
+INVENTORY_TOP_N = 10
+
+# ==============================================================================
+# MODO VIGILANCIA (--watch)
+# Seconds without new inotify events for a path before it is checked.
+# Quarto writes each file several times per render; the debounce collapses
+# those bursts into a single hash-and-link.
+# ==============================================================================
+WATCH_DEBOUNCE = 2.0
+
 # ==============================================================================
 # LOGGING
 # Log file path. Set to None to disable file logging.
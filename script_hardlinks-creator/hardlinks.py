@@ -0,0 +1,199 @@
+"""
+hardlinks.py — Embeddable library API for hardlinks-creator.
+
+Lets a long-lived process run many dedup jobs in-process instead of
+forking main.py once per filename. Nothing here prints, prompts or
+calls sys.exit(): failures raise lib.errors.HardlinksError subclasses
+and progress is delivered to an on_event callback.
+
+Typical use from an orchestrator (script directory on sys.path):
+
+    import hardlinks
+
+    cache = {}                                  # shared digest cache
+    for name in ("_metadata.yml", "_quarto.yml"):
+        groups = hardlinks.scan("/home/me/Documents", name, cache=cache)
+        plan = hardlinks.plan(groups)
+        stats = hardlinks.apply(plan, on_event=print)
+
+main.py is a thin CLI over these same functions.
+
+Only 'hardlinks' itself is imported by name: config.py and lib/ are
+loaded as submodules of the private package PACKAGE, so they never
+shadow (or get shadowed by) an orchestrator's own 'config' or 'lib'.
+"""
+
+import importlib.util
+import os
+import sys
+from importlib.machinery import ModuleSpec
+
+PACKAGE = "hardlinks_creator"
+
+if PACKAGE not in sys.modules:
+    _spec = ModuleSpec(PACKAGE, None, is_package=True)
+    _spec.submodule_search_locations = [os.path.dirname(os.path.abspath(__file__))]
+    sys.modules[PACKAGE] = importlib.util.module_from_spec(_spec)
+
+from hardlinks_creator.config import DEFAULT_EXCLUDED_DIRS, LINK_WORKERS, WATCH_DEBOUNCE, HASH_WORKERS
+from hardlinks_creator.lib.errors import (
+    HardlinksError, InvalidFilenameError, DirectoryNotFoundError,
+    DirectoryNotReadableError, ReportWriteError,
+)
+from hardlinks_creator.lib.validator import validate_directory, validate_filename
+from hardlinks_creator.lib.scanner import scan_files, stream_groups, build_exclusion_set
+from hardlinks_creator.lib.linker import plan_groups, apply_plan
+from hardlinks_creator.lib.inventory import build_inventory
+from hardlinks_creator.lib.watcher import watch as watch_tree
+
+__all__ = [
+    "scan", "stream", "plan", "apply", "inventory", "watch",
+    "HardlinksError", "InvalidFilenameError", "DirectoryNotFoundError",
+    "DirectoryNotReadableError", "ReportWriteError",
+]
+
+
+def scan(
+    directory: str,
+    filename: str,
+    exclusions: list | None = None,
+    walk_threads: int = 1,
+    checkpoint=None,
+    cache: dict | None = None,
+) -> dict:
+    """
+    Finds every file named 'filename' under 'directory' and groups by SHA-256.
+
+    Args:
+        directory:    Root directory to scan.
+        filename:     Exact filename to match.
+        exclusions:   Paths relative to directory to skip
+                      (None = DEFAULT_EXCLUDED_DIRS from config.py).
+        walk_threads: Directory-listing threads (1 = sequential walk).
+        checkpoint:   Optional lib.checkpoint.ScanCheckpoint.
+        cache:        Optional dict reused across calls to skip re-hashing
+                      files whose size/mtime/inode did not change.
+
+    Returns:
+        Dict mapping SHA-256 hex digest → sorted list of absolute paths.
+
+    Raises:
+        InvalidFilenameError, DirectoryNotFoundError, DirectoryNotReadableError.
+    """
+    validate_filename(filename)
+    search_dir = validate_directory(directory)
+    raw = DEFAULT_EXCLUDED_DIRS if exclusions is None else exclusions
+    exclusion_set = build_exclusion_set(search_dir, raw)
+    return scan_files(search_dir, filename, exclusion_set, walk_threads, checkpoint, cache)
+
+
+def stream(
+    directory: str,
+    filename: str,
+    exclusions: list | None = None,
+    walk_threads: int = 1,
+    hash_workers: int = HASH_WORKERS,
+    conservative: bool = False,
+):
+    """
+    Like scan(), but yields (digest, paths) chunks while the walk runs.
+
+    Each chunk can go straight to plan()/apply(), so linking starts
+    before the tree is fully walked. See lib.scanner.stream_groups()
+    for the eager/conservative semantics.
+
+    Raises:
+        InvalidFilenameError, DirectoryNotFoundError, DirectoryNotReadableError
+        (immediately, before the first chunk is requested).
+    """
+    validate_filename(filename)
+    search_dir = validate_directory(directory)
+    raw = DEFAULT_EXCLUDED_DIRS if exclusions is None else exclusions
+    exclusion_set = build_exclusion_set(search_dir, raw)
+    return stream_groups(
+        search_dir, filename, exclusion_set, walk_threads, hash_workers, conservative
+    )
+
+
+def plan(hash_groups: dict, start: int = 1) -> list:
+    """
+    Builds the link plan for the groups returned by scan() or stream().
+
+    See lib.linker.plan_groups() for the group dict layout.
+    """
+    return plan_groups(hash_groups, start)
+
+
+def apply(
+    link_plan: list,
+    dry_run: bool = False,
+    confirm=None,
+    on_event=None,
+    workers: int = LINK_WORKERS,
+) -> dict:
+    """
+    Executes a plan and returns the stats dict.
+
+    Args:
+        link_plan: Output from plan().
+        dry_run:   Simulate without making changes.
+        confirm:   Optional callable(group) -> bool; False skips the group.
+        on_event:  Optional callable(event) receiving progress events
+                   (see lib.linker.apply_plan() for event types).
+        workers:   Threads in the journaled link pool.
+    """
+    return apply_plan(link_plan, dry_run, confirm, on_event, workers)
+
+
+def inventory(
+    directory: str,
+    filename: str | None = None,
+    exclusions: list | None = None,
+    walk_threads: int = 1,
+) -> list:
+    """
+    Lists existing hard links (nlink > 1) without hashing.
+
+    Returns:
+        Inode group dicts from lib.inventory.build_inventory().
+
+    Raises:
+        InvalidFilenameError, DirectoryNotFoundError, DirectoryNotReadableError.
+    """
+    if filename is not None:
+        validate_filename(filename)
+    search_dir = validate_directory(directory)
+    raw = DEFAULT_EXCLUDED_DIRS if exclusions is None else exclusions
+    exclusion_set = build_exclusion_set(search_dir, raw)
+    return build_inventory(search_dir, exclusion_set, filename, walk_threads)
+
+
+def watch(
+    directory: str,
+    filename: str,
+    exclusions: list | None = None,
+    dry_run: bool = False,
+    on_event=None,
+    workers: int = LINK_WORKERS,
+    debounce: float = WATCH_DEBOUNCE,
+    stop=None,
+) -> dict:
+    """
+    Links existing duplicates, then keeps linking new ones via inotify.
+
+    Blocks until 'stop' (a threading.Event) is set; run it in its own
+    thread when embedding. Linux only.
+
+    Returns:
+        Accumulated stats dict for the session.
+
+    Raises:
+        InvalidFilenameError, DirectoryNotFoundError, DirectoryNotReadableError.
+    """
+    validate_filename(filename)
+    search_dir = validate_directory(directory)
+    raw = DEFAULT_EXCLUDED_DIRS if exclusions is None else exclusions
+    exclusion_set = build_exclusion_set(search_dir, raw)
+    return watch_tree(
+        search_dir, filename, exclusion_set, dry_run, on_event, workers, debounce, stop
+    )
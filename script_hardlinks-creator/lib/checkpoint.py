@@ -0,0 +1,188 @@
+"""
+lib/checkpoint.py — Scan checkpoints and resume for hardlinks-creator.
+
+Hashing a large volume can take hours; an interrupted run (Ctrl-C, OOM
+kill, reboot) used to throw all of it away. The scanner now saves its
+progress periodically — walked directories, pending directories and
+hashed records — and --resume continues from the last save, re-hashing
+only files whose stat changed in the meantime.
+
+Checkpoints are plain JSON written atomically (temp file + os.replace),
+so a crash while saving never corrupts the previous checkpoint.
+"""
+
+import hashlib
+import json
+import os
+import logging
+import time
+from typing import Dict, List, Set, Tuple
+
+from ..config import CHECKPOINT_DIR, CHECKPOINT_INTERVAL
+from .scanner import compute_sha256
+
+logger = logging.getLogger("hardlinks-creator")
+
+_FORMAT_VERSION = 1
+
+
+def checkpoint_key(search_dir: str, filename: str, exclusion_set: Set[str]) -> str:
+    """
+    Identifies a scan by its parameters.
+
+    A checkpoint is only valid for the exact same root, filename and
+    exclusions — resuming with different ones would mix results.
+
+    Returns:
+        Hex digest used both as file name and as integrity check.
+    """
+    payload = json.dumps([search_dir, filename, sorted(exclusion_set)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def checkpoint_path(key: str) -> str:
+    """Returns the checkpoint file path for a scan key."""
+    return os.path.join(os.path.expanduser(CHECKPOINT_DIR), f"scan-{key}.json")
+
+
+class ScanCheckpoint:
+    """
+    Mutable scan state shared with scanner.scan_files().
+
+    Attributes:
+        walked:  Directory → mtime_ns at the time it was listed.
+        pending: Directories discovered but not yet listed.
+        records: File path → [size, mtime_ns, inode, sha256].
+    """
+
+    def __init__(self, path: str, key: str) -> None:
+        self.path = path
+        self.key = key
+        self.walked: Dict[str, int | None] = {}
+        self.pending: Set[str] = set()
+        self.records: Dict[str, list] = {}
+        self.resumed = False
+        self._last_save = time.monotonic()
+
+    @classmethod
+    def load(cls, path: str, key: str) -> "ScanCheckpoint | None":
+        """
+        Reads a checkpoint written by save().
+
+        Returns:
+            ScanCheckpoint, or None if missing, unreadable or for another scan.
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Checkpoint ilegible en '{path}', se ignora: {exc}")
+            return None
+
+        if data.get("version") != _FORMAT_VERSION or data.get("key") != key:
+            logger.warning(f"Checkpoint '{path}' no corresponde a este escaneo, se ignora.")
+            return None
+
+        state = cls(path, key)
+        state.walked = data["walked"]
+        state.pending = set(data["pending"])
+        state.records = data["records"]
+        state.resumed = True
+        return state
+
+    def save(self) -> None:
+        """Writes the checkpoint atomically; failures are logged, not fatal."""
+        data = {
+            "version": _FORMAT_VERSION,
+            "key": self.key,
+            "saved_at": time.time(),
+            "walked": self.walked,
+            "pending": sorted(self.pending),
+            "records": self.records,
+        }
+        tmp_path = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            logger.debug(
+                f"Checkpoint guardado: {len(self.walked)} dir(s), "
+                f"{len(self.pending)} pendiente(s), {len(self.records)} hash(es)."
+            )
+        except OSError as exc:
+            logger.warning(f"No se pudo guardar el checkpoint '{self.path}': {exc}")
+        self._last_save = time.monotonic()
+
+    def maybe_save(self) -> None:
+        """Saves when CHECKPOINT_INTERVAL seconds have passed since the last save."""
+        if time.monotonic() - self._last_save >= CHECKPOINT_INTERVAL:
+            self.save()
+
+    def discard(self) -> None:
+        """Removes the checkpoint file once the run no longer needs it."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            logger.warning(f"No se pudo eliminar el checkpoint '{self.path}': {exc}")
+
+    def resume_frontier(self, search_dir: str) -> Tuple[List[str], Set[str]]:
+        """
+        Computes where the walk must (re)start and revalidates records.
+
+        For a fresh checkpoint the frontier is just search_dir. For a
+        loaded one:
+          - recorded files are stat'ed: vanished ones are dropped,
+            changed ones (size, mtime or inode) are re-hashed;
+          - walked directories whose mtime changed are listed again,
+            since entries were added or removed there (vanished ones
+            are forgotten);
+          - pending directories are listed as usual.
+
+        Returns:
+            (roots to walk, directories already walked).
+        """
+        if not self.resumed:
+            self.pending = {search_dir}
+            return [search_dir], set()
+
+        rehashed = dropped = 0
+        for path, record in list(self.records.items()):
+            try:
+                st = os.stat(path, follow_symlinks=False)
+            except OSError:
+                del self.records[path]
+                dropped += 1
+                continue
+            signature = [st.st_size, st.st_mtime_ns, st.st_ino]
+            if record[:3] != signature:
+                file_hash = compute_sha256(path)
+                if file_hash is None:
+                    del self.records[path]
+                    dropped += 1
+                else:
+                    self.records[path] = signature + [file_hash]
+                    rehashed += 1
+
+        changed = []
+        for directory, mtime_ns in list(self.walked.items()):
+            try:
+                current = os.stat(directory).st_mtime_ns
+            except OSError:
+                del self.walked[directory]     # vanished: nothing left to list
+                continue
+            if current != mtime_ns:
+                del self.walked[directory]
+                changed.append(directory)
+
+        self.pending.update(changed)
+        logger.info(
+            f"Reanudando escaneo: {len(self.records) - rehashed} hash(es) reutilizado(s), "
+            f"{rehashed} recalculado(s), {dropped} descartado(s), "
+            f"{len(self.pending)} directorio(s) por recorrer."
+        )
+        return sorted(self.pending), set(self.walked)
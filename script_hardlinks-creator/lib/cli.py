@@ -6,7 +6,7 @@ and makes it trivial to add new flags without touching business logic.
 """
 
 import argparse
-from config import VERSION
+from ..config import VERSION, WALK_THREADS, LINK_WORKERS
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -43,6 +43,22 @@ Ejemplos:
   # Exportar reporte JSON
   python main.py _metadata.yml --report-json /tmp/report.json
 
+  # Inventario de hard links existentes (sin hashing) en NDJSON
+  python main.py --inventory --report-json /tmp/links.ndjson --report-format ndjson
+
+  # Recorrido concurrente para NFS/FUSE (8 hilos listando directorios)
+  python main.py _metadata.yml --walk-threads 8 --dry-run
+
+  # Pipeline en streaming: enlazar cada grupo en cuanto se detecta
+  python main.py _metadata.yml --stream --auto
+
+  # Escaneo largo con checkpoints; si se interrumpe, continuar después
+  python main.py _metadata.yml --checkpoint --dry-run
+  python main.py _metadata.yml --resume --dry-run
+
+  # Vigilar el árbol y enlazar cada re-render en cuanto termine de escribirse
+  python main.py _metadata.yml --watch
+
   # Sin colores (para logs, CI/CD)
   python main.py _metadata.yml --no-color
         """,
@@ -50,7 +66,11 @@ Ejemplos:
 
     parser.add_argument(
         "filename",
-        help="Nombre exacto del archivo a buscar (ej. '_metadata.yml', '.editorconfig')",
+        nargs="?",
+        help=(
+            "Nombre exacto del archivo a buscar (ej. '_metadata.yml', '.editorconfig'). "
+            "Opcional con --inventory"
+        ),
     )
 
     parser.add_argument(
@@ -74,12 +94,62 @@ Ejemplos:
         help="Reemplaza completamente la lista de exclusiones predefinida",
     )
 
+    parser.add_argument(
+        "--walk-threads",
+        type=int,
+        default=WALK_THREADS,
+        metavar="N",
+        help=(
+            "Hilos para listar directorios en paralelo (útil en NFS/FUSE). "
+            f"Predeterminado: {WALK_THREADS} (recorrido secuencial)"
+        ),
+    )
+
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Guardar checkpoints periódicos del escaneo para poder reanudarlo con --resume",
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Reanudar desde el último checkpoint: solo se recalculan los hashes "
+            "de archivos cuyo stat cambió (implica --checkpoint)"
+        ),
+    )
+
     parser.add_argument(
         "--auto",
         action="store_true",
         help="Crear todos los grupos sin confirmación interactiva",
     )
 
+    parser.add_argument(
+        "--stream",
+        nargs="?",
+        const="eager",
+        choices=["eager", "conservative"],
+        metavar="MODO",
+        help=(
+            "Recorrer, hashear y enlazar en paralelo por etapas. eager (defecto): "
+            "cada grupo se procesa en cuanto aparece; conservative: grupos completos "
+            "y ordenados al final del recorrido"
+        ),
+    )
+
+    parser.add_argument(
+        "--link-workers",
+        type=int,
+        default=LINK_WORKERS,
+        metavar="N",
+        help=(
+            "Hilos que crean enlaces en paralelo (un directorio por unidad de trabajo). "
+            f"Predeterminado: {LINK_WORKERS}"
+        ),
+    )
+
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -92,6 +162,31 @@ Ejemplos:
         help="Guardar un reporte JSON de la operación en la ruta indicada",
     )
 
+    parser.add_argument(
+        "--report-format",
+        choices=["json", "ndjson"],
+        default="json",
+        help="Formato del reporte: JSON indentado o NDJSON (una línea por grupo)",
+    )
+
+    parser.add_argument(
+        "--inventory",
+        action="store_true",
+        help=(
+            "Inventariar los hard links existentes (nlink > 1) y el espacio ahorrado, "
+            "sin calcular hashes ni modificar nada"
+        ),
+    )
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Tras el escaneo inicial, seguir vigilando el árbol con inotify y enlazar "
+            "los archivos nuevos o reescritos (sin confirmación; Ctrl+C para salir)"
+        ),
+    )
+
     parser.add_argument(
         "--no-color", action="store_true", help="Desactivar colores ANSI en la salida"
     )
@@ -0,0 +1,113 @@
+"""
+lib/dirfd.py — Cached directory file descriptors for hardlinks-creator.
+
+Every path-based syscall makes the kernel resolve each component of the
+path again. In deeply nested Quarto trees the linker used to do that five
+or six times per target (access, stat, rename, link, remove). Opening the
+parent directory once and passing it as dir_fd / src_dir_fd / dst_dir_fd
+reduces each call to a single-component lookup.
+
+It also closes a TOCTOU window: once a directory is open, a rename of
+one of its parents cannot redirect the rename/link/unlink sequence to a
+different directory halfway through.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+from ..config import DIRFD_CACHE_SIZE
+
+logger = logging.getLogger("hardlinks-creator")
+
+_OPEN_FLAGS = os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC
+
+
+def split_path(path: str) -> Tuple[str, str]:
+    """Returns (parent directory, final component) of an absolute path."""
+    return os.path.dirname(path), os.path.basename(path)
+
+
+class DirFdCache:
+    """
+    Thread-safe LRU of open directory descriptors.
+
+    Descriptors are pinned while in use: eviction of a pinned entry only
+    detaches it from the LRU, and it is closed when its last user
+    releases it. Without pinning a worker thread could evict and close
+    a descriptor that another worker is about to pass to linkat(), and
+    the reused fd number could point to an unrelated directory.
+    """
+
+    def __init__(self, capacity: int = DIRFD_CACHE_SIZE) -> None:
+        self.capacity = max(1, capacity)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, list]" = OrderedDict()   # dir → [fd, pins]
+        self._detached: dict = {}                                  # fd → pins
+
+    @contextmanager
+    def opened(self, directory: str) -> Iterator[int]:
+        """
+        Yields an open descriptor for directory, opening it on a cache miss.
+
+        Raises:
+            OSError: The directory cannot be opened.
+        """
+        fd = self._acquire(directory)
+        try:
+            yield fd
+        finally:
+            self._release(directory, fd)
+
+    def _acquire(self, directory: str) -> int:
+        with self._lock:
+            entry = self._entries.get(directory)
+            if entry is not None:
+                entry[1] += 1
+                self._entries.move_to_end(directory)
+                return entry[0]
+
+        fd = os.open(directory, _OPEN_FLAGS)       # outside the lock: may block on NFS
+
+        with self._lock:
+            entry = self._entries.get(directory)
+            if entry is not None:                  # another thread won the race
+                os.close(fd)
+                entry[1] += 1
+                self._entries.move_to_end(directory)
+                return entry[0]
+            self._entries[directory] = [fd, 1]
+            self._evict()
+            return fd
+
+    def _release(self, directory: str, fd: int) -> None:
+        with self._lock:
+            entry = self._entries.get(directory)
+            if entry is not None and entry[0] == fd:
+                entry[1] -= 1
+                return
+            self._detached[fd] -= 1
+            if self._detached[fd] == 0:
+                del self._detached[fd]
+                os.close(fd)
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.capacity:
+            _, (fd, pins) = self._entries.popitem(last=False)
+            if pins == 0:
+                os.close(fd)
+            else:
+                self._detached[fd] = pins
+
+    def close_all(self) -> None:
+        """Closes every unpinned descriptor; call when the phase is over."""
+        with self._lock:
+            for fd, pins in self._entries.values():
+                if pins == 0:
+                    os.close(fd)
+                else:
+                    self._detached[fd] = pins
+            self._entries.clear()
@@ -0,0 +1,39 @@
+"""
+lib/errors.py — Exception hierarchy for hardlinks-creator.
+
+Library code raises these instead of calling sys.exit(), so a long-lived
+process can run many jobs and decide what a failure means. The CLI maps
+each exception to its POSIX exit code through the exit_code attribute.
+"""
+
+from ..config import EXIT_ERROR, EXIT_BAD_ARGS, EXIT_NOT_FOUND, EXIT_NO_PERMISSION
+
+
+class HardlinksError(Exception):
+    """Base class for every error raised by the hardlinks API."""
+
+    exit_code = EXIT_ERROR
+
+
+class InvalidFilenameError(HardlinksError):
+    """The search filename is empty or contains a path separator."""
+
+    exit_code = EXIT_BAD_ARGS
+
+
+class DirectoryNotFoundError(HardlinksError):
+    """The directory to scan does not exist."""
+
+    exit_code = EXIT_NOT_FOUND
+
+
+class DirectoryNotReadableError(HardlinksError):
+    """The directory to scan exists but cannot be read."""
+
+    exit_code = EXIT_NO_PERMISSION
+
+
+class ReportWriteError(HardlinksError):
+    """The JSON/NDJSON report could not be written."""
+
+    exit_code = EXIT_ERROR
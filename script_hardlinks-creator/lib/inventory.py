@@ -0,0 +1,97 @@
+"""
+lib/inventory.py — Existing hard link inventory for hardlinks-creator.
+
+Audits the links already present in a tree instead of creating new ones.
+It reuses the scanner's scandir walker and reads only inode metadata —
+no file is opened or hashed — so it replaces the `find -links +1 -exec stat`
+pipeline of hardlinks-detector on large trees.
+"""
+
+import logging
+from typing import Dict, List, Set, Tuple
+
+from .scanner import iter_files
+
+logger = logging.getLogger("hardlinks-creator")
+
+
+def build_inventory(
+    search_dir: str,
+    exclusion_set: Set[str],
+    filename: str | None = None,
+    walk_threads: int = 1,
+) -> List[dict]:
+    """
+    Indexes every file with st_nlink > 1 by its (device, inode) pair.
+
+    Space accounting per inode group, in apparent size (st_size; sparse
+    files and block rounding make the allocated size differ):
+      - space_used:  size of the single shared copy of the data.
+      - space_saved: size that separate copies for the other
+                     nlink - 1 names would have needed.
+
+    nlink counts every name of the inode, including names outside the
+    scanned tree; links_outside makes that difference explicit.
+
+    Args:
+        search_dir:    Root directory to scan.
+        exclusion_set: Set of absolute paths to skip.
+        filename:      Optional exact filename filter (None = every file).
+        walk_threads:  Directory-listing threads (1 = sequential walk).
+
+    Returns:
+        List of group dicts, largest savings first, paths sorted.
+    """
+    groups: Dict[Tuple[int, int], dict] = {}
+
+    for entry in iter_files(search_dir, exclusion_set, filename, walk_threads):
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except OSError as exc:
+            logger.warning(f"stat falló para '{entry.path}': {exc}")
+            continue
+        if st.st_nlink < 2:
+            continue
+
+        key = (st.st_dev, st.st_ino)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {
+                "device": st.st_dev,
+                "inode": st.st_ino,
+                "nlink": st.st_nlink,
+                "size": st.st_size,
+                "paths": [],
+            }
+        group["paths"].append(entry.path)
+
+    result = []
+    for group in groups.values():
+        group["paths"].sort()
+        group["links_found"] = len(group["paths"])
+        group["links_outside"] = group["nlink"] - group["links_found"]
+        group["space_used"] = group["size"]
+        group["space_saved"] = group["size"] * (group["nlink"] - 1)
+        result.append(group)
+
+    result.sort(key=lambda g: (-g["space_saved"], g["paths"][0]))
+    logger.debug(f"Inventario completado: {len(result)} inodo(s) con enlaces múltiples.")
+    return result
+
+
+def summarize_inventory(groups: List[dict]) -> dict:
+    """
+    Aggregates per-group numbers into run totals.
+
+    Args:
+        groups: Output from build_inventory().
+
+    Returns:
+        Dict with keys: inode_groups, files, space_used, space_saved.
+    """
+    return dict(
+        inode_groups=len(groups),
+        files=sum(g["links_found"] for g in groups),
+        space_used=sum(g["space_used"] for g in groups),
+        space_saved=sum(g["space_saved"] for g in groups),
+    )
@@ -0,0 +1,182 @@
+"""
+lib/journal.py — Write-ahead journal and crash recovery for the apply phase.
+
+_atomic_link() renames the target to target.hltmp before linking. A crash
+(kill -9, power loss) between the rename and the link leaves the original
+content stranded under .hltmp with nothing pointing back to it. The
+journal fixes that: every intended (source, target) operation is written
+and fsync'ed before any link is attempted, and completed operations are
+appended as they finish. A journal that still exists at startup belongs
+to a run that never finished; recover_journals() inspects each of its
+pending targets and either completes or reverts the operation.
+
+Journals are JSON Lines files under JOURNAL_DIR. The owning process holds
+an exclusive flock on its journal, so recovery never touches the journal
+of a run that is still alive. The journal is created and locked under a
+hidden temporary name and only then renamed into place, so no unlocked
+journal of a live run is ever visible to recover_journals().
+"""
+
+import fcntl
+import json
+import os
+import logging
+import time
+from typing import List, Tuple
+
+from ..config import JOURNAL_DIR
+
+logger = logging.getLogger("hardlinks-creator")
+
+TMP_SUFFIX = ".hltmp"
+# Journals without records younger than this may belong to a run that is starting
+EMPTY_JOURNAL_MIN_AGE = 60.0
+
+
+class LinkJournal:
+    """Append-only journal of link operations, owned by one apply run."""
+
+    def __init__(self, journal_dir: str = JOURNAL_DIR) -> None:
+        directory = os.path.expanduser(journal_dir)
+        os.makedirs(directory, exist_ok=True)
+        name = f"apply-{os.getpid()}-{time.time_ns()}.jsonl"
+        self.path = os.path.join(directory, name)
+        # Lock first, publish second: the .tmp name is ignored by recovery
+        staging = os.path.join(directory, f".{name}.tmp")
+        self._file = open(staging, "a", encoding="utf-8")
+        try:
+            fcntl.flock(self._file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            os.rename(staging, self.path)
+        except OSError:
+            self._file.close()
+            os.remove(staging)
+            raise
+
+    def write_intents(self, ops: List[Tuple[str, str]]) -> None:
+        """Records (source, target) pairs and forces them to disk before linking."""
+        for source, target in ops:
+            self._file.write(json.dumps({"op": "intent", "source": source, "target": target}) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def mark_done(self, targets: List[str]) -> None:
+        """Records finished targets (linked or restored); fsync is not needed here."""
+        for target in targets:
+            self._file.write(json.dumps({"op": "done", "target": target}) + "\n")
+        self._file.flush()
+
+    def close(self, remove: bool = True) -> None:
+        """
+        Closes the journal (releasing its lock) and, by default, deletes it.
+
+        remove=False keeps the file so the next run's recover_journals()
+        double-checks every pending target.
+        """
+        self._file.close()
+        if not remove:
+            return
+        try:
+            os.remove(self.path)
+        except OSError as exc:
+            logger.warning(f"No se pudo eliminar el journal '{self.path}': {exc}")
+
+
+def _recover_target(source: str, target: str) -> str:
+    """
+    Resolves one unfinished operation from the filesystem state.
+
+    Returns:
+        "clean"      — no .hltmp left, nothing to do.
+        "forward"    — target already links to source; leftover .hltmp removed.
+        "rollback"   — target missing; original restored from .hltmp.
+        "unresolved" — state is ambiguous; .hltmp kept for manual review.
+    """
+    tmp_path = target + TMP_SUFFIX
+    if not os.path.lexists(tmp_path):
+        return "clean"
+
+    try:
+        if os.path.lexists(target):
+            if os.path.samefile(source, target):
+                os.remove(tmp_path)
+                return "forward"
+            logger.error(
+                f"CRÍTICO: '{target}' existe y no es enlace de '{source}'; "
+                f"se conserva '{tmp_path}' para revisión manual."
+            )
+            return "unresolved"
+        os.rename(tmp_path, target)
+        return "rollback"
+    except OSError as exc:
+        logger.error(f"CRÍTICO: no se pudo recuperar '{target}' desde '{tmp_path}': {exc}")
+        return "unresolved"
+
+
+def recover_journals(journal_dir: str = JOURNAL_DIR) -> dict:
+    """
+    Replays or rolls back every journal left behind by a crashed run.
+
+    Journals locked by a live process are skipped, and so are journals
+    with no records that are younger than EMPTY_JOURNAL_MIN_AGE. A
+    journal is deleted once all its pending targets are resolved; if any
+    remains unresolved the journal is kept so the next run retries.
+
+    Returns:
+        Counts per outcome: forward, rollback, unresolved.
+    """
+    counts = dict(forward=0, rollback=0, unresolved=0)
+    directory = os.path.expanduser(journal_dir)
+    try:
+        names = sorted(n for n in os.listdir(directory) if n.endswith(".jsonl"))
+    except FileNotFoundError:
+        return counts
+
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            f = open(path, "r+", encoding="utf-8")
+        except OSError as exc:
+            logger.warning(f"No se pudo abrir el journal '{path}': {exc}")
+            continue
+        with f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue                          # owner still running
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:
+                continue                          # owner finished and removed it
+            info = os.fstat(f.fileno())
+            if (info.st_dev, info.st_ino) != (current.st_dev, current.st_ino):
+                continue                          # replaced while we were opening it
+            if info.st_size == 0 and time.time() - info.st_mtime < EMPTY_JOURNAL_MIN_AGE:
+                continue                          # possibly a run that is just starting
+
+            pending = {}
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue                      # torn last line after a crash
+                if record.get("op") == "intent":
+                    pending[record["target"]] = record["source"]
+                elif record.get("op") == "done":
+                    pending.pop(record["target"], None)
+
+            unresolved = 0
+            for target, source in pending.items():
+                outcome = _recover_target(source, target)
+                if outcome != "clean":
+                    counts[outcome] += 1
+                unresolved += outcome == "unresolved"
+
+            if unresolved == 0:
+                os.remove(path)
+
+    if counts["forward"] or counts["rollback"] or counts["unresolved"]:
+        logger.warning(
+            f"Recuperación de enlaces interrumpidos: {counts['forward']} completado(s), "
+            f"{counts['rollback']} revertido(s), {counts['unresolved']} sin resolver."
+        )
+    return counts
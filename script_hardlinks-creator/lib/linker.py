@@ -9,15 +9,22 @@ This module fixes that by using an atomic rename-based approach:
   3. If link succeeds → remove the .bak.
   4. If link fails → restore the .bak to its original path.
 The file is never left in a destroyed state.
+
+The apply phase runs those links on a worker pool, one directory per
+work unit, behind a write-ahead journal (lib/journal.py) so that even a
+crash between steps 1 and 2 is repaired automatically on the next run.
 """
 
 import os
 import logging
 from collections import defaultdict
-from typing import Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Tuple
 
-from lib import ui
-from lib.validator import validate_write_permission, same_filesystem
+from ..config import LINK_WORKERS
+from .dirfd import DirFdCache, split_path
+from .journal import LinkJournal, recover_journals, TMP_SUFFIX
+from .validator import validate_write_permission, same_filesystem
 
 logger = logging.getLogger("hardlinks-creator")
 
@@ -60,170 +67,284 @@ def _safe_inode(path: str) -> int | None:
 # Atomic link operation
 # ---------------------------------------------------------------------------
 
-def _atomic_link(source: str, target: str) -> bool:
+def _atomic_link(source: str, target: str, fds: DirFdCache) -> str | None:
     """
     Replaces 'target' with a hard link to 'source' without data loss.
 
     Strategy: rename target → target.hltmp (atomic), then link.
     If linking fails, the .hltmp rename is reversed.
 
+    All three syscalls are issued relative to descriptors of the source
+    and target directories (renameat/linkat/unlinkat), so the kernel
+    resolves one component per call and a concurrent rename of a parent
+    directory cannot redirect the sequence.
+
     Args:
         source: The file to link from (content is preserved).
         target: The path to replace with a hard link.
+        fds:    Directory descriptor cache shared by the apply phase.
 
     Returns:
-        True on success, False on any failure.
+        None on success, or the error message on any failure.
     """
-    tmp_path = target + ".hltmp"
+    source_dir, source_name = split_path(source)
+    target_dir, target_name = split_path(target)
+    tmp_name = target_name + TMP_SUFFIX
+    tmp_path = target + TMP_SUFFIX
+
     try:
-        os.rename(target, tmp_path)       # atomic on same filesystem
+        with fds.opened(source_dir) as sfd, fds.opened(target_dir) as tfd:
+            try:
+                # atomic on same filesystem
+                os.rename(target_name, tmp_name, src_dir_fd=tfd, dst_dir_fd=tfd)
+            except OSError as exc:
+                logger.error(f"No se pudo preparar '{target}' para enlace: {exc}")
+                return str(exc)
+
+            try:
+                os.link(source_name, target_name, src_dir_fd=sfd, dst_dir_fd=tfd)
+                os.remove(tmp_name, dir_fd=tfd)   # clean up backup only after success
+                return None
+            except OSError as exc:
+                logger.error(f"No se pudo crear hard link '{target}': {exc}")
+                # Restore original file — never leave the user with missing data
+                try:
+                    os.rename(tmp_name, target_name, src_dir_fd=tfd, dst_dir_fd=tfd)
+                except OSError as restore_exc:
+                    logger.error(
+                        f"CRÍTICO: no se pudo restaurar '{target}' desde '{tmp_path}'. "
+                        f"Recupera manualmente el archivo: {restore_exc}"
+                    )
+                return str(exc)
     except OSError as exc:
-        logger.error(f"No se pudo preparar '{target}' para enlace: {exc}")
-        return False
+        logger.error(f"No se pudo abrir el directorio de '{target}': {exc}")
+        return str(exc)
+
+
+# ---------------------------------------------------------------------------
+# Parallel journaled executor
+# ---------------------------------------------------------------------------
+
+def _link_unit(
+    ops: List[Tuple[dict, str]],
+    fds: DirFdCache,
+) -> List[Tuple[dict, str, str | None]]:
+    """Links every target of one directory, in order; runs in a worker thread."""
+    return [
+        (group, target, _atomic_link(group["source"], target, fds))
+        for group, target in ops
+    ]
+
+
+def _execute_links(
+    ops: List[Tuple[dict, str]],
+    workers: int,
+    stats: dict,
+    emit: Callable[[dict], None],
+) -> None:
+    """
+    Runs (group, target) link operations concurrently behind a journal.
+
+    All intents are journaled and fsync'ed first. Operations are then
+    bucketed by target directory: targets in different directories are
+    independent, so each bucket is one work unit for the pool, while
+    renames within a directory stay sequential. Results are consumed on
+    the calling thread, so on_event callbacks never run concurrently.
+
+    On an exception (e.g. Ctrl-C) queued units are cancelled, running
+    ones finish, and the journal is kept for the next run to verify.
+    """
+    journal = LinkJournal()
+    journal.write_intents([(group["source"], target) for group, target in ops])
+
+    units: Dict[str, List[Tuple[dict, str]]] = defaultdict(list)
+    for group, target in ops:
+        units[os.path.dirname(target)].append((group, target))
 
+    successes: Dict[int, int] = defaultdict(int)
+    fds = DirFdCache()
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="link")
     try:
-        os.link(source, target)
-        os.remove(tmp_path)               # clean up backup only after success
-        return True
-    except OSError as exc:
-        logger.error(f"No se pudo crear hard link '{target}': {exc}")
-        # Restore original file — never leave the user with missing data
-        try:
-            os.rename(tmp_path, target)
-        except OSError as restore_exc:
-            logger.error(
-                f"CRÍTICO: no se pudo restaurar '{target}' desde '{tmp_path}'. "
-                f"Recupera manualmente el archivo: {restore_exc}"
-            )
-        return False
+        futures = [pool.submit(_link_unit, unit, fds) for unit in units.values()]
+        for future in as_completed(futures):
+            results = future.result()
+            journal.mark_done([target for _, target, _ in results])
+            for group, target, error in results:
+                if error is None:
+                    successes[group["number"]] += 1
+                    emit({"type": "linked", "group": group, "target": target})
+                else:
+                    stats["errors"] += 1
+                    emit({"type": "link_failed", "group": group, "target": target, "error": error})
+    except BaseException:
+        pool.shutdown(wait=True, cancel_futures=True)
+        fds.close_all()
+        journal.close(remove=False)
+        raise
+    pool.shutdown(wait=True)
+    fds.close_all()
+    journal.close()
+
+    stats["links_created"] += sum(successes.values())
+    stats["groups_created"] += len(successes)
 
 
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
-def process_groups(
-    hash_groups: Dict[str, List[str]],
-    search_dir: str,
-    auto_mode: bool,
-    dry_run: bool,
-) -> dict:
+def new_stats() -> dict:
+    """Returns a zeroed stats dict (same keys the summary and report use)."""
+    return dict(
+        groups_found=0, groups_created=0, groups_skipped=0,
+        links_created=0, files_skipped=0, errors=0,
+    )
+
+
+def plan_groups(hash_groups: Dict[str, List[str]], start: int = 1) -> List[dict]:
     """
-    Iterates over hash groups and creates hard links as appropriate.
+    Turns hash groups into a link plan without touching the filesystem.
 
     For each group with ≥2 members:
-      - Identifies existing links (same inode) and new candidates.
-      - Asks user confirmation unless auto_mode or dry_run.
-      - Calls _atomic_link for each candidate (unless dry_run).
+      - Identifies existing links (same inode as the source) and
+        candidates (other inodes).
+      - Rejects candidates on another filesystem or without write
+        permission, recording the reason.
+
+    The source is the first path of the first inode group; scan_files()
+    returns sorted paths, so the choice is stable between runs.
 
     Args:
         hash_groups: Output from scanner.scan_files().
-        search_dir:  Root directory (used for relative path display).
-        auto_mode:   Skip confirmation prompts.
-        dry_run:     Simulate without making changes.
+        start:       Number of the first group; streaming callers pass
+                     the running count so numbers keep increasing.
 
     Returns:
-        Stats dict with keys: groups_found, groups_created, groups_skipped,
-        links_created, files_skipped, errors.
+        List of group dicts with keys: number, hash, source, inode, size,
+        already_linked, candidates, rejected [(path, reason)], error.
     """
-    stats = dict(
-        groups_found=0, groups_created=0, groups_skipped=0,
-        links_created=0, files_skipped=0, errors=0,
-    )
-
+    plan = []
     linkable = [(h, paths) for h, paths in hash_groups.items() if len(paths) >= 2]
-    stats["groups_found"] = len(linkable)
-
-    if not linkable:
-        ui.print_info("Todos los archivos tienen contenido único. No hay candidatos.")
-        return stats
-
-    ui.print_success(f"Se encontraron {stats['groups_found']} grupo(s) con contenido idéntico.\n")
+    fds = DirFdCache()
 
-    for group_num, (file_hash, file_list) in enumerate(linkable, start=1):
-        ui.print_separator()
-        ui.print_group_header(group_num, file_hash)
+    for group_num, (file_hash, file_list) in enumerate(linkable, start=start):
+        group = dict(
+            number=group_num, hash=file_hash, source=None, inode=None, size=None,
+            already_linked=[], candidates=[], rejected=[], error=None,
+        )
+        plan.append(group)
 
         inode_groups = _group_by_inode(file_list)
         if not inode_groups:
-            stats["errors"] += 1
+            group["error"] = "stat"
             continue
 
-        # The first inode group provides the source file
         source_inode, source_group = next(iter(inode_groups.items()))
         source_path = source_group[0]
+        group.update(
+            source=source_path,
+            inode=source_inode,
+            size=_safe_stat_size(source_path),
+            already_linked=source_group[1:],
+        )
+
+        for inode, paths in inode_groups.items():
+            if inode == source_inode:
+                continue
+            for p in paths:
+                if not same_filesystem(source_path, p, fds):
+                    group["rejected"].append((p, "cross_device"))
+                elif not validate_write_permission(p, fds):
+                    group["rejected"].append((p, "no_permission"))
+                else:
+                    group["candidates"].append(p)
+
+    fds.close_all()
+    return plan
+
+
+def apply_plan(
+    plan: List[dict],
+    dry_run: bool,
+    confirm: Callable[[dict], bool] | None = None,
+    on_event: Callable[[dict], None] | None = None,
+    workers: int = LINK_WORKERS,
+) -> dict:
+    """
+    Executes a plan from plan_groups() and reports progress as events.
+
+    Before linking, journals left by a crashed run are recovered. In auto
+    mode (confirm is None) the links of every group are executed together
+    on the worker pool once planning events are out; with confirm, each
+    accepted group is executed right after its confirmation.
+
+    Every event is a dict with a "type" key and the affected "group":
+      group         — a group is about to be processed (always first)
+      group_skipped — nothing done; "reason" is all_linked, no_valid,
+                      declined or stat_error
+      dry_run       — simulation; "count" links would be created
+      linked        — "target" now is a hard link to the source
+      link_failed   — "target" could not be linked; "error" explains why
 
-        already_linked = source_group[1:]          # same inode as source
-        candidates = [                              # different inode → need linking
-            p for inode, paths in inode_groups.items()
-            if inode != source_inode
-            for p in paths
-        ]
-
-        file_size = _safe_stat_size(source_path)
-        size_str = ui.format_size(file_size) if file_size is not None else "?"
-        rel = lambda p: os.path.relpath(p, search_dir)
-
-        ui.print_field("Archivo fuente", rel(source_path), "📌")
-        print(f"   Tamaño: {size_str} | Inodo: {source_inode}\n")
-
-        if already_linked:
-            ui.print_skip(f"Ya enlazados ({len(already_linked)}):")
-            for p in already_linked:
-                print(f"   • {rel(p)}")
-            print()
-            stats["files_skipped"] += len(already_linked)
-
-        if not candidates:
-            ui.print_info("Todos los archivos de este grupo ya están enlazados.")
+    Args:
+        plan:     Output from plan_groups().
+        dry_run:  Simulate without making changes.
+        confirm:  Called with the group before linking; returning False
+                  skips it. None links every group (auto mode).
+        on_event: Receives each event; None discards them.
+        workers:  Threads in the link pool (one directory per work unit).
+
+    Returns:
+        Stats dict with keys: groups_found, groups_created, groups_skipped,
+        links_created, files_skipped, errors.
+    """
+    emit = on_event or (lambda event: None)
+    stats = new_stats()
+    stats["groups_found"] = len(plan)
+    deferred: List[Tuple[dict, str]] = []
+
+    if not dry_run:
+        recover_journals()
+
+    for group in plan:
+        emit({"type": "group", "group": group})
+
+        if group["error"]:
+            stats["errors"] += 1
+            emit({"type": "group_skipped", "group": group, "reason": "stat_error"})
             continue
 
-        print(f"📋 Candidatos a enlazar ({len(candidates)}):")
-        for i, p in enumerate(candidates, 1):
-            print(f"   {i}. {rel(p)}")
-        print()
-
-        # Cross-filesystem guard: warn and skip incompatible candidates
-        valid_candidates = []
-        for p in candidates:
-            if not same_filesystem(source_path, p):
-                ui.print_warning(
-                    f"'{rel(p)}' está en un sistema de archivos diferente. Omitido."
-                )
-                stats["errors"] += 1
-            elif not validate_write_permission(p):
-                ui.print_warning(f"Sin permisos de escritura en '{rel(p)}'. Omitido.")
-                stats["errors"] += 1
-            else:
-                valid_candidates.append(p)
+        stats["files_skipped"] += len(group["already_linked"])
+        stats["errors"] += len(group["rejected"])
 
-        if not valid_candidates:
-            stats["groups_skipped"] += 1
+        if not group["candidates"]:
+            if group["rejected"]:
+                stats["groups_skipped"] += 1
+                reason = "no_valid"
+            else:
+                reason = "all_linked"
+            emit({"type": "group_skipped", "group": group, "reason": reason})
             continue
 
         if dry_run:
-            ui.print_info(f"[SIMULACIÓN] Se crearían {len(valid_candidates)} hard link(s).")
-            stats["links_created"] += len(valid_candidates)
+            stats["links_created"] += len(group["candidates"])
             stats["groups_created"] += 1
+            emit({"type": "dry_run", "group": group, "count": len(group["candidates"])})
             continue
 
-        if not auto_mode and not ui.confirm_group(group_num):
-            ui.print_warning("Grupo omitido por el usuario.")
+        if confirm is not None and not confirm(group):
             stats["groups_skipped"] += 1
+            emit({"type": "group_skipped", "group": group, "reason": "declined"})
             continue
 
-        # --- Perform linking ---
-        success = 0
-        for target in valid_candidates:
-            if _atomic_link(source_path, target):
-                ui.print_success(f"Hard link creado: {rel(target)}")
-                success += 1
-            else:
-                stats["errors"] += 1
+        ops = [(group, target) for target in group["candidates"]]
+        if confirm is None:
+            deferred.extend(ops)
+        else:
+            _execute_links(ops, workers, stats, emit)
 
-        stats["links_created"] += success
-        if success > 0:
-            stats["groups_created"] += 1
+    if deferred:
+        _execute_links(deferred, workers, stats, emit)
 
     return stats
 
@@ -43,7 +43,7 @@ def disable_colors() -> None:
     are NOT affected — they must import at call time or use
     the module-level attribute lookup pattern.
     """
-    import lib.logger as _self
+    _self = sys.modules[__name__]
     for key in _COLORS:
         setattr(_self, key, "")
 
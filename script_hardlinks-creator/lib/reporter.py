@@ -1,5 +1,5 @@
 """
-lib/reporter.py — JSON report export for hardlinks-creator.
+lib/reporter.py — JSON/NDJSON report export for hardlinks-creator.
 
 NEW FEATURE: Exports a machine-readable summary of the operation
 so CI pipelines, Quarto automation scripts, or external tools can
@@ -15,6 +15,8 @@ import logging
 from datetime import datetime
 from typing import Dict, List
 
+from .errors import ReportWriteError
+
 logger = logging.getLogger("hardlinks-creator")
 
 
@@ -61,26 +63,75 @@ def build_report(
     }
 
 
-def save_report(report: dict, output_path: str) -> None:
+def build_inventory_report(
+    groups: List[dict],
+    summary: dict,
+    filename: str | None,
+    search_dir: str,
+) -> dict:
+    """
+    Assembles the report for --inventory runs (existing links only).
+
+    Args:
+        groups:     Output from inventory.build_inventory().
+        summary:    Output from inventory.summarize_inventory().
+        filename:   Optional filename filter that was applied.
+        search_dir: Root directory that was scanned.
+
+    Returns:
+        Dict ready for json.dumps(), same envelope as build_report().
+    """
+    groups_detail = []
+    for group in groups:
+        detail = {k: v for k, v in group.items() if k != "paths"}
+        detail["files"] = [os.path.relpath(p, search_dir) for p in group["paths"]]
+        groups_detail.append(detail)
+
+    return {
+        "tool": "hardlinks-creator",
+        "version": "3.0.0",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "parameters": {
+            "mode": "inventory",
+            "filename": filename,
+            "search_directory": search_dir,
+        },
+        "summary": summary,
+        "groups": groups_detail,
+    }
+
+
+def save_report(report: dict, output_path: str, fmt: str = "json") -> None:
     """
-    Writes the report dict as pretty-printed JSON.
+    Writes the report dict as pretty-printed JSON or as NDJSON.
+
+    NDJSON puts the envelope (everything but 'groups') on the first line
+    with "type": "summary", then one "type": "group" line per group, so
+    large inventories can be streamed through jq or grep line by line.
 
     Creates parent directories if they don't exist so the caller
     can pass paths like '/tmp/reports/run-001.json' without pre-creating them.
 
     Args:
-        report:      Dict built by build_report().
+        report:      Dict built by build_report() or build_inventory_report().
         output_path: Destination file path.
+        fmt:         "json" (default) or "ndjson".
 
     Raises:
-        SystemExit(1) on write failure (logged before exit).
+        ReportWriteError: The file could not be written.
     """
-    import sys
     try:
         os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
         with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
-        logger.info(f"Reporte JSON guardado en: {output_path}")
+            if fmt == "ndjson":
+                header = {k: v for k, v in report.items() if k != "groups"}
+                f.write(json.dumps({"type": "summary", **header}, ensure_ascii=False) + "\n")
+                for group in report.get("groups", []):
+                    f.write(json.dumps({"type": "group", **group}, ensure_ascii=False) + "\n")
+            else:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f"Reporte {fmt.upper()} guardado en: {output_path}")
     except OSError as exc:
-        logger.error(f"No se pudo guardar el reporte en '{output_path}': {exc}")
-        sys.exit(1)
+        raise ReportWriteError(
+            f"No se pudo guardar el reporte en '{output_path}': {exc}"
+        ) from exc
@@ -9,10 +9,13 @@ without any conditional branching in the main flow.
 import hashlib
 import os
 import logging
-from collections import defaultdict
-from typing import Dict, List, Set
+import queue
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Set, Tuple
 
-from config import HASH_BLOCK_SIZE
+from ..config import HASH_BLOCK_SIZE, WALK_QUEUE_SIZE, HASH_WORKERS, HASH_QUEUE_SIZE
 
 logger = logging.getLogger("hardlinks-creator")
 
@@ -81,10 +84,242 @@ def get_inode(filepath: str) -> int | None:
         return None
 
 
+def _scan_dir(
+    current: str,
+    exclusion_set: Set[str],
+    filename: str | None,
+) -> Tuple[int | None, List[str], List[os.DirEntry]]:
+    """
+    Lists one directory: returns (dir mtime_ns, subdirs, matching file entries).
+
+    This is the unit of work of both walkers. Exclusion pruning happens
+    here, so excluded directories are never queued nor listed. The
+    directory's mtime is read before listing so a checkpoint can later
+    tell whether entries were added or removed since this listing.
+    """
+    try:
+        mtime_ns = os.stat(current).st_mtime_ns
+        with os.scandir(current) as it:
+            entries = list(it)
+    except OSError as exc:
+        logger.warning(f"No se pudo listar '{current}': {exc}")
+        return None, [], []
+
+    subdirs, files = [], []
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                path = os.path.normpath(entry.path)
+                if path not in exclusion_set:
+                    subdirs.append(path)
+            elif entry.is_file(follow_symlinks=False):
+                if filename is None or entry.name == filename:
+                    files.append(entry)
+        except OSError as exc:
+            logger.warning(f"No se pudo leer '{entry.path}': {exc}")
+    return mtime_ns, subdirs, files
+
+
+def walk_dirs(
+    roots: List[str],
+    exclusion_set: Set[str],
+    filename: str | None = None,
+    threads: int = 1,
+    known: Set[str] | None = None,
+) -> Iterator[Tuple[str, int | None, List[str], List[os.DirEntry]]]:
+    """
+    Walks the trees under roots, yielding one event per listed directory.
+
+    Each event is (directory, mtime_ns, newly queued subdirs, matching
+    file entries). Directories in 'known' are treated as already walked
+    and are not descended again; roots and every queued subdirectory are
+    added to it. Checkpoint/resume relies on this to continue a walk
+    from a saved frontier without relisting finished directories.
+
+    With threads == 1 directories are visited depth-first in sorted
+    order. With threads > 1 the listing is spread over a thread pool
+    (see _walk_dirs_parallel) and event order is NOT deterministic —
+    callers that need stable output sort their results, as scan_files()
+    and build_inventory() do.
+
+    Symlinks are never followed nor yielded — linking through them
+    would touch files outside the scanned tree.
+
+    Args:
+        roots:         Directories to start from.
+        exclusion_set: Set of absolute paths to skip.
+        filename:      Exact filename to match, or None for every file.
+        threads:       Number of directory-listing threads.
+        known:         Directories already walked or queued (mutated).
+
+    Yields:
+        (directory, mtime_ns, subdirs, files) per listed directory.
+    """
+    known = set() if known is None else known
+    known.update(roots)
+
+    if threads > 1:
+        yield from _walk_dirs_parallel(roots, exclusion_set, filename, threads, known)
+        return
+
+    # Reverse-sorted push → sorted pop order (depth-first, like os.walk)
+    stack = sorted(roots, reverse=True)
+    while stack:
+        current = stack.pop()
+        mtime_ns, subdirs, files = _scan_dir(current, exclusion_set, filename)
+        new = [d for d in subdirs if d not in known]
+        known.update(new)
+        yield current, mtime_ns, new, files
+        stack.extend(sorted(new, reverse=True))
+
+
+def iter_files(
+    search_dir: str,
+    exclusion_set: Set[str],
+    filename: str | None = None,
+    threads: int = 1,
+) -> Iterator[os.DirEntry]:
+    """
+    Yields regular-file entries under search_dir using os.scandir.
+
+    This is the shared walker for every mode: excluded directories are
+    pruned before descending, and the DirEntry objects are handed to the
+    caller so type checks (and, for inventory, stat data) come from the
+    directory listing instead of a fresh lookup per path.
+
+    Args:
+        search_dir:    Root directory to scan.
+        exclusion_set: Set of absolute paths to skip.
+        filename:      Exact filename to match, or None for every file.
+        threads:       Number of directory-listing threads.
+
+    Yields:
+        os.DirEntry for each matching regular file.
+    """
+    for _, _, _, files in walk_dirs([search_dir], exclusion_set, filename, threads):
+        yield from files
+
+
+def _walk_dirs_parallel(
+    roots: List[str],
+    exclusion_set: Set[str],
+    filename: str | None,
+    threads: int,
+    known: Set[str],
+) -> Iterator[Tuple[str, int | None, List[str], List[os.DirEntry]]]:
+    """
+    Concurrent walker for high-latency storage (NFS, FUSE).
+
+    On those mounts each scandir() is a round trip, so a single-threaded
+    walk spends most of its time waiting. Here a pool of threads pulls
+    directories from a shared work queue, lists them via _scan_dir()
+    (pruning included) and pushes subdirectories back onto the queue.
+    Directory events are handed to the caller — the hashing stage —
+    through a bounded queue, so a slow consumer applies backpressure
+    instead of buffering the whole tree.
+
+    The walk ends when the count of queued-but-unfinished directories
+    drops to zero. If the caller stops iterating early, the finally
+    block signals the workers and joins them.
+    """
+    if not roots:
+        return
+
+    dirs: queue.Queue = queue.Queue()
+    results: queue.Queue = queue.Queue(maxsize=WALK_QUEUE_SIZE)
+    stop = threading.Event()
+    lock = threading.Lock()
+    pending = len(roots)
+    done = object()
+
+    def offer(event) -> None:
+        while not stop.is_set():
+            try:
+                results.put(event, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def worker() -> None:
+        nonlocal pending
+        while not stop.is_set():
+            current = dirs.get()
+            if current is None:
+                return
+            try:
+                mtime_ns, subdirs, files = _scan_dir(current, exclusion_set, filename)
+                with lock:
+                    new = [d for d in subdirs if d not in known]
+                    known.update(new)
+                    pending += len(new)
+                for path in new:
+                    dirs.put(path)
+                offer((current, mtime_ns, new, files))
+            finally:
+                with lock:
+                    pending -= 1
+                    finished = pending == 0
+                if finished:
+                    offer(done)
+
+    for root in roots:
+        dirs.put(root)
+    pool = [
+        threading.Thread(target=worker, name=f"walk-{n}", daemon=True)
+        for n in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+
+    try:
+        while True:
+            event = results.get()
+            if event is done:
+                break
+            yield event
+    finally:
+        stop.set()
+        for _ in pool:
+            dirs.put(None)
+        for thread in pool:
+            thread.join()
+
+
+def _hash_entry(entry: os.DirEntry, records: Dict[str, list]) -> bool:
+    """
+    Hashes one matching file into records, reusing a still-valid digest.
+
+    A record is [size, mtime_ns, inode, digest]; when the file's current
+    stat matches the first three fields the stored digest is kept and the
+    file is not read. Returns True when the file was actually hashed.
+    """
+    try:
+        st = entry.stat(follow_symlinks=False)
+    except OSError as exc:
+        logger.warning(f"stat falló para '{entry.path}': {exc}")
+        records.pop(entry.path, None)
+        return False
+
+    signature = [st.st_size, st.st_mtime_ns, st.st_ino]
+    record = records.get(entry.path)
+    if record is not None and record[:3] == signature:
+        return False
+
+    file_hash = compute_sha256(entry.path)
+    if file_hash is None:
+        records.pop(entry.path, None)
+        return False
+    records[entry.path] = signature + [file_hash]
+    return True
+
+
 def scan_files(
     search_dir: str,
     filename: str,
     exclusion_set: Set[str],
+    walk_threads: int = 1,
+    checkpoint=None,
+    cache: Dict[str, list] | None = None,
 ) -> Dict[str, List[str]]:
     """
     Walks the directory tree and groups matching files by content hash.
@@ -96,33 +331,185 @@ def scan_files(
     but filtering is left to the caller (linker.py) so this function
     remains a pure data-gathering step.
 
+    The result is normalized regardless of walk order: paths inside each
+    group are sorted and groups are ordered by their first path. The
+    linker picks its source from that order, so parallel and sequential
+    walks yield identical plans and reports that can be diffed.
+
+    When a checkpoint (lib.checkpoint.ScanCheckpoint) is given, progress
+    is saved periodically and a loaded checkpoint is resumed: only its
+    pending directories and walked directories whose mtime changed are
+    listed, and recorded digests are reused for files whose stat is
+    unchanged.
+
+    Without a checkpoint, 'cache' (path → [size, mtime_ns, inode, sha256])
+    plays the same role across calls: a long-lived process passing one
+    dict to many scans only re-reads files that changed in between. The
+    result still contains only the files found by this walk.
+
     Args:
         search_dir:    Root directory to scan.
         filename:      Exact filename to match (case-sensitive).
         exclusion_set: Set of absolute paths to skip.
+        walk_threads:  Directory-listing threads (1 = sequential walk).
+        checkpoint:    Optional ScanCheckpoint to save to / resume from.
+        cache:         Optional digest cache shared between scans.
 
     Returns:
-        Dict mapping SHA-256 hex digest → list of absolute file paths.
+        Dict mapping SHA-256 hex digest → sorted list of absolute file paths.
     """
+    if checkpoint is not None:
+        roots, known = checkpoint.resume_frontier(search_dir)
+        records, walked, pending = checkpoint.records, checkpoint.walked, checkpoint.pending
+        found = None                      # every record belongs to this scan
+    else:
+        roots, known = [search_dir], set()
+        records = cache if cache is not None else {}
+        walked, pending = {}, set()
+        found = []
+
+    total_hashed = 0
+    for current, mtime_ns, subdirs, files in walk_dirs(
+        roots, exclusion_set, filename, walk_threads, known
+    ):
+        for entry in files:
+            total_hashed += _hash_entry(entry, records)
+            if found is not None and entry.path in records:
+                found.append(entry.path)
+
+        # Update order keeps the frontier a superset at every instant:
+        # children become pending before their parent stops being pending.
+        pending.update(d for d in subdirs if d not in walked)
+        walked[current] = mtime_ns
+        pending.discard(current)
+
+        if checkpoint is not None:
+            checkpoint.maybe_save()
+
+    if checkpoint is not None:
+        checkpoint.save()
+
+    paths = records.keys() if found is None else found
+    logger.debug(
+        f"Escaneado completado: {len(paths)} archivo(s) encontrado(s), "
+        f"{total_hashed} hash(es) calculado(s)."
+    )
     hash_groups: Dict[str, List[str]] = defaultdict(list)
-    total_found = 0
+    for path in paths:
+        hash_groups[records[path][3]].append(path)
+    for paths in hash_groups.values():
+        paths.sort()
+    return dict(sorted(hash_groups.items(), key=lambda item: item[1][0]))
+
+
+def _hash_path(path: str) -> Tuple[str, str | None]:
+    """Hash-stage task for stream_groups(): returns (path, digest or None)."""
+    return path, compute_sha256(path)
+
+
+def stream_groups(
+    search_dir: str,
+    filename: str,
+    exclusion_set: Set[str],
+    walk_threads: int = 1,
+    hash_workers: int = HASH_WORKERS,
+    conservative: bool = False,
+) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Streaming counterpart of scan_files(): yields groups while the walk runs.
+
+    Stages:
+      walk      — walk_dirs() events through its own bounded queue.
+      size      — files are bucketed by size; a file is only queued for
+                  hashing once another file of the same size exists, so
+                  unique sizes are never read.
+      hash      — a pool of hash_workers threads with at most
+                  HASH_QUEUE_SIZE files in flight; the walk pauses when
+                  the pool is saturated.
+      finalize  — digests are grouped in submission (walk) order, not in
+                  completion order, so the result does not depend on
+                  which hash worker finishes first.
+
+    The queues are bounded; the two indexes are not. The size index keeps
+    one path per distinct size and the digest index one path per digest
+    (every member in conservative mode), so memory grows with the number
+    of files, never with their contents.
+
+    In eager mode (default) a chunk is yielded as soon as a digest gains
+    a member: (digest, [source, new member]). The source is the first file
+    of the group in walk order and later chunks of the same digest repeat
+    it, so a sequential walk (walk_threads=1) yields the same chunks on
+    every run. No size bucket is provably complete until the walk ends, so
+    eager chunks are partial groups — linking them incrementally is safe
+    because the linker skips paths already sharing the source inode.
+
+    In conservative mode nothing is yielded until the walk is done; each
+    group then comes out once, complete, with the same sorted order as
+    scan_files() — identical plans and reports, minus the hashing of
+    files whose size is unique.
+
+    Args:
+        search_dir:    Root directory to scan.
+        filename:      Exact filename to match (case-sensitive).
+        exclusion_set: Set of absolute paths to skip.
+        walk_threads:  Directory-listing threads (1 = sequential walk).
+        hash_workers:  Hashing threads.
+        conservative:  Emit only complete, sorted groups at the end.
+
+    Yields:
+        (SHA-256 hex digest, list of absolute paths) chunks.
+    """
+    singles: Dict[int, str | None] = {}     # size → unhashed path, None once hashed
+    # digest → members; eager mode keeps only the source once a chunk is out
+    groups: Dict[str, List[str]] = defaultdict(list)
+    inflight: deque = deque()               # hash futures in submission order
+    total_files = total_hashed = 0
+
+    def finalize(future) -> Iterator[Tuple[str, List[str]]]:
+        path, digest = future.result()
+        if digest is None:
+            return
+        members = groups[digest]
+        members.append(path)
+        if conservative or len(members) < 2:
+            return
+        yield digest, list(members)
+        del members[1:]
 
-    for root, dirs, files in os.walk(search_dir, topdown=True):
-        # Prune excluded dirs in-place so os.walk won't descend into them
-        dirs[:] = [
-            d for d in dirs
-            if os.path.normpath(os.path.join(root, d)) not in exclusion_set
-        ]
+    with ThreadPoolExecutor(max_workers=hash_workers) as pool:
+        for _, _, _, files in walk_dirs([search_dir], exclusion_set, filename, walk_threads):
+            for entry in files:
+                try:
+                    size = entry.stat(follow_symlinks=False).st_size
+                except OSError as exc:
+                    logger.warning(f"stat falló para '{entry.path}': {exc}")
+                    continue
+                total_files += 1
 
-        if filename not in files:
-            continue
+                if size not in singles:
+                    singles[size] = entry.path
+                    continue
+                to_hash = [entry.path]
+                if singles[size] is not None:
+                    to_hash.insert(0, singles[size])
+                    singles[size] = None
 
-        filepath = os.path.join(root, filename)
-        total_found += 1
-        file_hash = compute_sha256(filepath)
+                for path in to_hash:
+                    inflight.append(pool.submit(_hash_path, path))
+                    total_hashed += 1
+                while inflight and (len(inflight) >= HASH_QUEUE_SIZE or inflight[0].done()):
+                    yield from finalize(inflight.popleft())
 
-        if file_hash is not None:
-            hash_groups[file_hash].append(filepath)
+        while inflight:
+            yield from finalize(inflight.popleft())
 
-    logger.debug(f"Escaneado completado: {total_found} archivo(s) encontrado(s).")
-    return hash_groups
+    logger.debug(
+        f"Escaneado completado: {total_files} archivo(s) encontrado(s), "
+        f"{total_hashed} hash(es) calculado(s)."
+    )
+    if conservative:
+        for members in groups.values():
+            members.sort()
+        for digest, members in sorted(groups.items(), key=lambda item: item[1][0]):
+            if len(members) >= 2:
+                yield digest, members
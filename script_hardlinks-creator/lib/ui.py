@@ -5,7 +5,9 @@ All formatted output (headers, separators, status messages) lives here
 so the business logic modules stay free of print() calls.
 """
 
-import lib.logger as C  # Color constants resolved at call time → respects disable_colors()
+import os
+
+from . import logger as C  # Color constants resolved at call time → respects disable_colors()
 
 
 def print_header(text: str) -> None:
@@ -71,19 +73,7 @@ def print_summary(stats: dict) -> None:
     if stats["errors"] > 0:
         rows.append((C.RED, "❌ Errores", stats["errors"]))
 
-    inner_width = 76
-    border = f"{C.BOLD}{C.BLUE}"
-    print(f"{border}╠{'═' * inner_width}╣{C.RESET}")
-    for color, label, value in rows:
-        content = f"  {color}{label}:{C.RESET} {C.BOLD}{value}{C.RESET}"
-        # Strip ANSI for length calculation
-        import re
-
-        ansi_escape = re.compile(r"\x1b\[[0-9;]*m")
-        visible_len = len(ansi_escape.sub("", content))
-        pad = inner_width - visible_len
-        print(f"{border}║{C.RESET}{content}{' ' * max(pad, 0)}{border}║{C.RESET}")
-    print(f"{border}╚{'═' * inner_width}╝{C.RESET}")
+    _print_box_rows(rows)
 
     if stats["groups_created"] > 0:
         print(f"\n{C.GREEN}{C.BOLD}✨ ¡Proceso completado exitosamente!{C.RESET}")
@@ -102,6 +92,47 @@ def print_summary(stats: dict) -> None:
         print(f"\n{C.CYAN}ℹ️  No se requirieron cambios.{C.RESET}\n")
 
 
+def _print_box_rows(rows: list) -> None:
+    """Renders (color, label, value) rows inside the summary box frame."""
+    inner_width = 76
+    border = f"{C.BOLD}{C.BLUE}"
+    print(f"{border}╠{'═' * inner_width}╣{C.RESET}")
+    for color, label, value in rows:
+        content = f"  {color}{label}:{C.RESET} {C.BOLD}{value}{C.RESET}"
+        # Strip ANSI for length calculation
+        import re
+
+        ansi_escape = re.compile(r"\x1b\[[0-9;]*m")
+        visible_len = len(ansi_escape.sub("", content))
+        pad = inner_width - visible_len
+        print(f"{border}║{C.RESET}{content}{' ' * max(pad, 0)}{border}║{C.RESET}")
+    print(f"{border}╚{'═' * inner_width}╝{C.RESET}")
+
+
+def print_inventory_summary(summary: dict, top_groups: list, search_dir: str) -> None:
+    """Renders the --inventory totals and the groups with the largest savings."""
+    print_separator()
+    print_header("INVENTARIO DE HARD LINKS EXISTENTES")
+
+    if top_groups:
+        print(f"{C.BOLD}🏆 Mayores ahorros:{C.RESET}")
+        for group in top_groups:
+            print(
+                f"   {C.CYAN}{format_size(group['space_saved']):>12}{C.RESET}  "
+                f"{C.GRAY}nlink={group['nlink']} inodo={group['inode']}{C.RESET}  "
+                f"{os.path.relpath(group['paths'][0], search_dir)}"
+            )
+        print()
+
+    _print_box_rows([
+        (C.CYAN, "🔗 Inodos con enlaces múltiples", summary["inode_groups"]),
+        (C.CYAN, "📄 Rutas enlazadas encontradas", summary["files"]),
+        (C.GRAY, "💾 Espacio usado", format_size(summary["space_used"])),
+        (C.GREEN, "✨ Espacio ahorrado", format_size(summary["space_saved"])),
+    ])
+    print()
+
+
 def format_size(size_bytes: int) -> str:
     """Returns a human-readable file size string."""
     for unit in ["B", "KB", "MB", "GB", "TB"]:
@@ -111,6 +142,60 @@ def format_size(size_bytes: int) -> str:
     return f"{size_bytes:.2f} PB"
 
 
+def print_group_plan(group: dict, search_dir: str) -> None:
+    """Renders one planned group: source, existing links, candidates, rejections."""
+    rel = lambda p: os.path.relpath(p, search_dir)
+
+    print_separator()
+    print_group_header(group["number"], group["hash"])
+
+    if group["error"]:
+        print_error("No se pudo leer ningún archivo del grupo.")
+        return
+
+    size_str = format_size(group["size"]) if group["size"] is not None else "?"
+    print_field("Archivo fuente", rel(group["source"]), "📌")
+    print(f"   Tamaño: {size_str} | Inodo: {group['inode']}\n")
+
+    if group["already_linked"]:
+        print_skip(f"Ya enlazados ({len(group['already_linked'])}):")
+        for p in group["already_linked"]:
+            print(f"   • {rel(p)}")
+        print()
+
+    pending = group["candidates"] + [p for p, _ in group["rejected"]]
+    if not pending:
+        return
+
+    print(f"📋 Candidatos a enlazar ({len(pending)}):")
+    for i, p in enumerate(pending, 1):
+        print(f"   {i}. {rel(p)}")
+    print()
+
+    for p, reason in group["rejected"]:
+        if reason == "cross_device":
+            print_warning(f"'{rel(p)}' está en un sistema de archivos diferente. Omitido.")
+        else:
+            print_warning(f"Sin permisos de escritura en '{rel(p)}'. Omitido.")
+
+
+def render_event(event: dict, search_dir: str) -> None:
+    """Prints one linker.apply_plan() event the way the CLI always has."""
+    kind = event["type"]
+    group = event["group"]
+    if kind == "group":
+        print_group_plan(group, search_dir)
+    elif kind == "group_skipped":
+        if event["reason"] == "all_linked":
+            print_info("Todos los archivos de este grupo ya están enlazados.")
+        elif event["reason"] == "declined":
+            print_warning("Grupo omitido por el usuario.")
+    elif kind == "dry_run":
+        print_info(f"[SIMULACIÓN] Se crearían {event['count']} hard link(s).")
+    elif kind == "linked":
+        print_success(f"Hard link creado: {os.path.relpath(event['target'], search_dir)}")
+
+
 def confirm_group(group_number: int) -> bool:
     """
     Prompts the user interactively to confirm or skip a group.
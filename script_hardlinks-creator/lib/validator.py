@@ -3,13 +3,17 @@ lib/validator.py — Input and environment validation for hardlinks-creator.
 
 All checks that can abort the program early live here.
 Centralizing them prevents the business logic from being
-cluttered with guard clauses.
+cluttered with guard clauses. Failures raise lib.errors exceptions;
+only the CLI turns them into exit codes.
 """
 
 import os
-import sys
 import logging
 
+from .errors import (
+    InvalidFilenameError, DirectoryNotFoundError, DirectoryNotReadableError,
+)
+
 logger = logging.getLogger("hardlinks-creator")
 
 
@@ -27,16 +31,14 @@ def validate_directory(path: str) -> str:
         Absolute, validated path string.
 
     Raises:
-        SystemExit(3): Directory does not exist.
-        SystemExit(4): Directory exists but is not readable.
+        DirectoryNotFoundError:    Directory does not exist (exit 3).
+        DirectoryNotReadableError: Directory exists but is not readable (exit 4).
     """
     abs_path = os.path.abspath(path)
     if not os.path.isdir(abs_path):
-        logger.error(f"El directorio '{abs_path}' no existe.")
-        sys.exit(3)
+        raise DirectoryNotFoundError(f"El directorio '{abs_path}' no existe.")
     if not os.access(abs_path, os.R_OK):
-        logger.error(f"Sin permisos de lectura en '{abs_path}'.")
-        sys.exit(4)
+        raise DirectoryNotReadableError(f"Sin permisos de lectura en '{abs_path}'.")
     return abs_path
 
 
@@ -51,17 +53,16 @@ def validate_filename(filename: str) -> None:
         filename: The raw filename argument from the CLI.
 
     Raises:
-        SystemExit(2): Filename is invalid.
+        InvalidFilenameError: Filename is invalid (exit 2).
     """
     if not filename or os.sep in filename:
-        logger.error(
+        raise InvalidFilenameError(
             f"Nombre de archivo inválido: '{filename}'. "
             "Proporciona solo el nombre, sin rutas (ej. '_metadata.yml')."
         )
-        sys.exit(2)
 
 
-def validate_write_permission(path: str) -> bool:
+def validate_write_permission(path: str, fds=None) -> bool:
     """
     Checks whether the process can write to the given path.
     Used before attempting os.remove() + os.link() to give
@@ -69,14 +70,23 @@ def validate_write_permission(path: str) -> bool:
 
     Args:
         path: File path to check.
+        fds:  Optional lib.dirfd.DirFdCache; resolves only the last
+              path component relative to the cached parent directory.
 
     Returns:
         True if writable, False otherwise.
     """
-    return os.access(path, os.W_OK)
+    if fds is None:
+        return os.access(path, os.W_OK)
+    directory, name = os.path.split(path)
+    try:
+        with fds.opened(directory) as dfd:
+            return os.access(name, os.W_OK, dir_fd=dfd)
+    except OSError:
+        return False
 
 
-def same_filesystem(path_a: str, path_b: str) -> bool:
+def same_filesystem(path_a: str, path_b: str, fds=None) -> bool:
     """
     Verifies that two paths reside on the same filesystem.
 
@@ -87,11 +97,20 @@ def same_filesystem(path_a: str, path_b: str) -> bool:
     Args:
         path_a: First file path.
         path_b: Second file path.
+        fds:    Optional lib.dirfd.DirFdCache (see validate_write_permission).
 
     Returns:
         True if both paths are on the same device.
     """
     try:
-        return os.stat(path_a).st_dev == os.stat(path_b).st_dev
+        return _stat(path_a, fds).st_dev == _stat(path_b, fds).st_dev
     except OSError:
         return False
+
+
+def _stat(path: str, fds) -> os.stat_result:
+    if fds is None:
+        return os.stat(path)
+    directory, name = os.path.split(path)
+    with fds.opened(directory) as dfd:
+        return os.stat(name, dir_fd=dfd)
@@ -0,0 +1,305 @@
+"""
+lib/watcher.py — inotify watch mode (--watch) for hardlinks-creator.
+
+Quarto re-renders keep rewriting the same files, which drift back into
+separate copies between nightly runs. Watch mode keeps them linked
+continuously: after one startup pass it subscribes to inotify on every
+non-excluded directory and, when a matching file is written or moved in,
+compares it only against indexed files of the same size and links it
+through the regular plan/apply machinery. The cost per change is one
+stat plus, at most, hashing the files of that size bucket.
+
+inotify is reached through ctypes on the C library — no external
+packages or services. Linux only.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import logging
+import select
+import stat
+import struct
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Set
+
+from ..config import LINK_WORKERS, WATCH_DEBOUNCE
+from .linker import new_stats, plan_groups, apply_plan
+from .scanner import compute_sha256, walk_dirs
+
+logger = logging.getLogger("hardlinks-creator")
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+_WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE
+    | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")          # wd, mask, cookie, len
+
+
+class Inotify:
+    """Minimal ctypes binding: init, add/remove watches, read events."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm = libc.inotify_rm_watch
+        self._rm.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1: {os.strerror(err)}")
+
+    def add_watch(self, path: str, mask: int = _WATCH_MASK) -> int:
+        """Returns the watch descriptor; raises OSError (ENOSPC = limit reached)."""
+        wd = self._add(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        self._rm(self.fd, wd)
+
+    def read_events(self) -> List[tuple]:
+        """Returns pending (wd, mask, name) events; [] when none are queued."""
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events, offset = [], 0
+        while offset < len(buf):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(buf, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(buf[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            events.append((wd, mask, name))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class DigestIndex:
+    """
+    In-memory index of matching files, bucketed by size.
+
+    Records are [size, mtime_ns, inode, digest | None] — the same layout
+    as the scanner's cache. A digest is only computed when a second file
+    of the same size shows up; a stale digest (stat changed) is recomputed
+    on demand.
+    """
+
+    def __init__(self) -> None:
+        self.records: Dict[str, list] = {}
+        self.by_size: Dict[int, Set[str]] = defaultdict(set)
+
+    def update(self, path: str, st: os.stat_result) -> List[str]:
+        """Indexes path with its current stat; returns same-size peers."""
+        old = self.records.get(path)
+        signature = [st.st_size, st.st_mtime_ns, st.st_ino]
+        if old is not None and old[:3] != signature:
+            self.by_size[old[0]].discard(path)
+            old = None
+        if old is None:
+            self.records[path] = signature + [None]
+        self.by_size[st.st_size].add(path)
+        return sorted(self.by_size[st.st_size] - {path})
+
+    def remove(self, path: str) -> None:
+        record = self.records.pop(path, None)
+        if record is not None:
+            self.by_size[record[0]].discard(path)
+
+    def digest(self, path: str) -> str | None:
+        """Returns the SHA-256 of path, hashing only if unknown or stale."""
+        try:
+            st = os.stat(path, follow_symlinks=False)
+        except OSError:
+            self.remove(path)
+            return None
+        self.update(path, st)
+        record = self.records[path]
+        if record[3] is None:
+            record[3] = compute_sha256(path)
+        return record[3]
+
+
+def watch(
+    search_dir: str,
+    filename: str,
+    exclusion_set: Set[str],
+    dry_run: bool = False,
+    on_event: Callable[[dict], None] | None = None,
+    workers: int = LINK_WORKERS,
+    debounce: float = WATCH_DEBOUNCE,
+    stop: threading.Event | None = None,
+) -> dict:
+    """
+    Links duplicates of 'filename' as they appear, until stop is set.
+
+    Startup: walks the tree once, adds an inotify watch per directory,
+    indexes matching files by size and links the duplicates already
+    present. Then every write (IN_CLOSE_WRITE) or move-in (IN_MOVED_TO)
+    of a matching file is debounced — bursts of writes to the same path
+    collapse into one check 'debounce' seconds after the last event —
+    and compared against the index. New directories are watched and
+    indexed as they are created; on queue overflow the tree is rescanned.
+
+    Args:
+        search_dir:    Root directory to watch.
+        filename:      Exact filename to keep linked.
+        exclusion_set: Set of absolute paths to skip.
+        dry_run:       Report what would be linked without changing files.
+        on_event:      Receives linker.apply_plan() events.
+        workers:       Threads for each apply.
+        debounce:      Quiet period in seconds before a file is processed.
+        stop:          Event that ends the session; checked at least once a
+                       second and between files of the startup pass.
+
+    Returns:
+        Accumulated stats dict over the whole session.
+    """
+    stop = stop or threading.Event()
+    inotify = Inotify()
+    index = DigestIndex()
+    watched: Dict[int, str] = {}
+    pending: Dict[str, float] = {}
+    totals = new_stats()
+
+    def link_group(paths: List[str], digest: str) -> None:
+        stats = apply_plan(plan_groups({digest: sorted(paths)}), dry_run, None, on_event, workers)
+        for key, value in stats.items():
+            totals[key] = totals.get(key, 0) + value
+        for path in paths:                    # linking changes inodes, not content
+            try:
+                index.update(path, os.stat(path, follow_symlinks=False))
+                index.records[path][3] = digest
+            except OSError:
+                index.remove(path)
+
+    def add_tree(root: str) -> List[str]:
+        found = []
+        for current, _, _, files in walk_dirs([root], exclusion_set, filename):
+            if stop.is_set():
+                break
+            try:
+                watched[inotify.add_watch(current)] = current
+            except OSError as exc:
+                logger.error(f"No se pudo vigilar '{current}': {exc}")
+            found.extend(entry.path for entry in files)
+        return found
+
+    def process(path: str) -> None:
+        try:
+            st = os.stat(path, follow_symlinks=False)
+        except OSError:
+            index.remove(path)
+            return
+        if not stat.S_ISREG(st.st_mode):
+            return
+        peers = index.update(path, st)
+        if not peers:
+            return
+        digest = index.digest(path)
+        if digest is None:
+            return
+        same = [p for p in peers if index.digest(p) == digest]
+        if same:
+            link_group(same + [path], digest)
+
+    def initial_pass(paths: List[str]) -> None:
+        # Hashing the whole tree can take minutes: Ctrl+C must not wait for it
+        for path in paths:
+            try:
+                index.update(path, os.stat(path, follow_symlinks=False))
+            except OSError:
+                continue
+        groups: Dict[str, List[str]] = defaultdict(list)
+        for size, bucket in list(index.by_size.items()):
+            if len(bucket) < 2:
+                continue
+            for path in sorted(bucket):
+                if stop.is_set():
+                    return
+                digest = index.digest(path)
+                if digest is not None:
+                    groups[digest].append(path)
+        for digest, paths in sorted(groups.items(), key=lambda item: item[1][0]):
+            if stop.is_set():
+                return
+            if len(paths) >= 2:
+                link_group(paths, digest)
+
+    try:
+        initial_pass(add_tree(search_dir))
+        logger.info(
+            f"Vigilando {len(watched)} directorio(s), "
+            f"{len(index.records)} archivo(s) '{filename}' indexado(s)."
+        )
+
+        poller = select.poll()
+        poller.register(inotify.fd, select.POLLIN)
+
+        while not stop.is_set():
+            now = time.monotonic()
+            wait = min(pending.values()) - now if pending else 1.0
+            poller.poll(max(0, min(wait, 1.0)) * 1000)
+
+            for wd, mask, name in inotify.read_events():
+                if mask & IN_Q_OVERFLOW:
+                    logger.warning("Cola de inotify desbordada; reescaneando el árbol.")
+                    for path in add_tree(search_dir):
+                        pending[path] = time.monotonic() + debounce
+                    continue
+                directory = watched.get(wd)
+                if directory is None:
+                    continue
+                if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                    watched.pop(wd, None)
+                    if not mask & IN_IGNORED:
+                        inotify.rm_watch(wd)
+                    continue
+
+                path = os.path.join(directory, name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO) and path not in exclusion_set:
+                        for found in add_tree(path):
+                            pending[found] = time.monotonic() + debounce
+                elif name == filename:
+                    if mask & (IN_DELETE | IN_MOVED_FROM):
+                        # _atomic_link moves each target to .hltmp and links a
+                        # new one in its place (IN_CREATE, not watched): the
+                        # path only left the tree if it is still missing
+                        if not os.path.lexists(path):
+                            pending.pop(path, None)
+                            index.remove(path)
+                    elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                        pending[path] = time.monotonic() + debounce
+
+            now = time.monotonic()
+            due = sorted(p for p, deadline in pending.items() if deadline <= now)
+            for path in due:
+                del pending[path]
+                process(path)
+    finally:
+        inotify.close()
+
+    return totals
@@ -2,48 +2,220 @@
 """
 main.py — Entry point for hardlinks-creator.
 
-Orchestrates the four-phase pipeline:
+Thin CLI over the hardlinks library API (hardlinks.py):
   1. Parse CLI arguments.
   2. Validate inputs and resolve configuration.
-  3. Scan the directory tree and hash files.
-  4. Process groups (link or simulate).
+  3. Scan the directory tree and hash files   → hardlinks.scan()
+  4. Plan and process groups (link/simulate)  → hardlinks.plan() / apply()
+     (--stream overlaps 3 and 4 via hardlinks.stream())
 
-Each phase is handled by a dedicated module so this file
-reads like a high-level summary of the program's flow.
+The library raises HardlinksError subclasses and reports progress as
+events; this file turns events into terminal output and exceptions
+into exit codes, so it reads like a high-level summary of the flow.
 
 Author : Edison Achalma <achalmed.18@gmail.com>
 Version: 3.0.0
 """
 
 import os
+import signal
 import sys
+import threading
 
 # ---------------------------------------------------------------------------
-# Bootstrap: ensure lib/ is importable regardless of working directory
+# Bootstrap: hardlinks.py registers config.py and lib/ under its private
+# package (hardlinks_creator), regardless of working directory
 # ---------------------------------------------------------------------------
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from config import DEFAULT_DIRECTORY, DEFAULT_EXCLUDED_DIRS, LOG_FILE, EXIT_INTERRUPTED
-from lib.cli import build_parser
-from lib.logger import get_logger, disable_colors
-from lib import ui
-from lib.validator import validate_directory, validate_filename
-from lib.scanner import scan_files, build_exclusion_set
-from lib.linker import process_groups
-from lib.reporter import build_report, save_report
+import hardlinks
+from hardlinks_creator.config import (
+    DEFAULT_DIRECTORY, DEFAULT_EXCLUDED_DIRS, LOG_FILE, EXIT_INTERRUPTED,
+    INVENTORY_TOP_N,
+)
+from hardlinks_creator.lib.cli import build_parser
+from hardlinks_creator.lib.logger import get_logger, disable_colors
+from hardlinks_creator.lib import ui
+from hardlinks_creator.lib.errors import HardlinksError
+from hardlinks_creator.lib.validator import validate_directory, validate_filename
+from hardlinks_creator.lib.scanner import build_exclusion_set
+from hardlinks_creator.lib.checkpoint import ScanCheckpoint, checkpoint_key, checkpoint_path
+from hardlinks_creator.lib.inventory import summarize_inventory
+from hardlinks_creator.lib.linker import new_stats
+from hardlinks_creator.lib.reporter import build_report, build_inventory_report, save_report
 
 
-def main() -> None:
-    args = build_parser().parse_args()
+def run_inventory(args, search_dir: str, raw_exclusions: list, exclusion_set: set) -> int:
+    """
+    --inventory branch: audits existing hard links without hashing.
 
-    # Phase 0: Apply global settings before any output
-    if args.no_color:
-        disable_colors()
+    Shares validation and exclusion handling with the linking pipeline
+    but never touches the files, so it is safe on production trees.
+    """
+    ui.print_header("HARDLINKS CREATOR — INVENTARIO")
+    ui.print_field("Directorio", search_dir, "📁")
+    ui.print_field("Archivo buscado", args.filename or "(todos)", "🔎")
+    ui.print_field("Exclusiones", str(len(exclusion_set)) + " carpeta(s)", "🚫")
+    ui.print_separator()
 
-    logger = get_logger(verbose=args.verbose, log_file=LOG_FILE)
+    print(f"🔍 Indexando inodos con enlaces múltiples…\n")
+    groups = hardlinks.inventory(search_dir, args.filename, raw_exclusions, args.walk_threads)
+    summary = summarize_inventory(groups)
+
+    ui.print_inventory_summary(summary, groups[:INVENTORY_TOP_N], search_dir)
+
+    if args.report_json:
+        report = build_inventory_report(groups, summary, args.filename, search_dir)
+        save_report(report, args.report_json, args.report_format)
+
+    return 0
+
+
+def run_watch(args, search_dir: str, raw_exclusions: list, exclusion_set: set) -> int:
+    """
+    --watch branch: links existing duplicates, then follows inotify events.
+
+    Ctrl+C and SIGTERM (e.g. systemctl stop) are a normal shutdown: they
+    set the stop event, the current batch finishes and the session
+    summary is printed. The exit code reflects link errors only.
+    """
+    ui.print_header("HARDLINKS CREATOR — MODO VIGILANCIA")
+    ui.print_field("Directorio", search_dir, "📁")
+    ui.print_field("Archivo buscado", args.filename, "🔎")
+    ui.print_field("Exclusiones", str(len(exclusion_set)) + " carpeta(s)", "🚫")
+    if args.dry_run:
+        ui.print_warning("MODO SIMULACIÓN: no se realizarán cambios en disco.")
+    ui.print_separator()
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+    print(f"👀 Vigilando cambios… (Ctrl+C para salir)\n")
+    stats = hardlinks.watch(
+        search_dir,
+        args.filename,
+        raw_exclusions,
+        dry_run=args.dry_run,
+        on_event=lambda event: ui.render_event(event, search_dir),
+        workers=args.link_workers,
+        stop=stop,
+    )
+    print()
+    ui.print_summary(stats)
+    return 1 if stats["errors"] > 0 else 0
+
+
+def write_report(args, stats: dict, search_dir: str, hash_groups: dict) -> None:
+    """Saves the --report-json report, if requested."""
+    if args.report_json:
+        report = build_report(
+            stats=stats,
+            filename=args.filename,
+            search_dir=search_dir,
+            dry_run=args.dry_run,
+            hash_groups=hash_groups,
+        )
+        save_report(report, args.report_json, args.report_format)
+
+
+def run_stream(args, search_dir: str, raw_exclusions: list) -> int:
+    """
+    --stream branch: links each group as soon as the pipeline emits it.
+
+    Chunks from hardlinks.stream() are planned and applied one at a
+    time while the walk and the hash workers keep running in the
+    background, so the first links appear after seconds instead of
+    after the full scan. An eager group may arrive in several chunks:
+    the interactive answer is asked once per group and reused for its
+    later chunks, and the summary counts each group once. Chunks are
+    merged back into hash_groups only when a report is requested, and
+    sorted like scan_files() output before it is written.
+    """
+    print(f"🔍 Escaneando y enlazando en streaming ({args.stream})…\n")
+    answers: dict = {}                      # digest → confirmed?
+
+    def confirm(group: dict) -> bool:
+        if group["hash"] not in answers:
+            answers[group["hash"]] = ui.confirm_group(group["number"])
+        return answers[group["hash"]]
+
+    stats = new_stats()
+    hash_groups: dict = {}
+    found: set = set()
+    created: set = set()
+    skipped: set = set()
+    chunk_count = 0
+
+    try:
+        chunks = hardlinks.stream(
+            search_dir, args.filename, raw_exclusions, args.walk_threads,
+            conservative=args.stream == "conservative",
+        )
+        for digest, paths in chunks:
+            found.add(digest)
+            if args.report_json:
+                hash_groups.setdefault(digest, [paths[0]]).extend(paths[1:])
+            chunk_plan = hardlinks.plan({digest: paths}, start=chunk_count + 1)
+            chunk_count += len(chunk_plan)
+            chunk_stats = hardlinks.apply(
+                chunk_plan,
+                dry_run=args.dry_run,
+                confirm=None if args.auto else confirm,
+                on_event=lambda event: ui.render_event(event, search_dir),
+                workers=args.link_workers,
+            )
+            for key, value in chunk_stats.items():
+                stats[key] += value
+            if chunk_stats["groups_created"]:
+                created.add(digest)
+            if chunk_stats["groups_skipped"]:
+                skipped.add(digest)
+    except KeyboardInterrupt:
+        print(f"\n\n⚠️  Operación cancelada por el usuario.\n")
+        return EXIT_INTERRUPTED
+
+    # An eager group may arrive in several chunks; count each group once
+    stats["groups_found"] = len(found)
+    stats["groups_created"] = len(created)
+    stats["groups_skipped"] = len(skipped - created)
+    if not found:
+        ui.print_info("No se encontraron archivos con contenido idéntico.")
+
+    ui.print_summary(stats)
+    # Same layout as scan_files(): sorted members, groups by first path
+    for paths in hash_groups.values():
+        paths.sort()
+    write_report(args, stats, search_dir, dict(sorted(hash_groups.items(), key=lambda item: item[1][0])))
+    return 1 if stats["errors"] > 0 else 0
+
+
+def open_checkpoint(args, search_dir: str, exclusion_set: set) -> ScanCheckpoint | None:
+    """
+    Returns the scan checkpoint for this run, or None if disabled.
+
+    --resume loads the previous checkpoint for the same parameters;
+    --checkpoint (or --resume with nothing to load) starts a fresh one.
+    """
+    if not (args.checkpoint or args.resume):
+        return None
+
+    key = checkpoint_key(search_dir, args.filename, exclusion_set)
+    path = checkpoint_path(key)
+    if args.resume:
+        checkpoint = ScanCheckpoint.load(path, key)
+        if checkpoint is not None:
+            ui.print_info(f"Reanudando desde checkpoint: {path}")
+            return checkpoint
+        ui.print_warning("No hay checkpoint previo para estos parámetros; escaneo completo.")
+    return ScanCheckpoint(path, key)
 
+
+def run(args) -> int:
+    """Runs one CLI invocation and returns its exit code."""
     # Phase 1: Resolve configuration
-    validate_filename(args.filename)
+    if args.filename:
+        validate_filename(args.filename)
 
     search_dir_raw = (
         args.directory
@@ -59,6 +231,11 @@ def main() -> None:
 
     exclusion_set = build_exclusion_set(search_dir, raw_exclusions)
 
+    if args.inventory:
+        return run_inventory(args, search_dir, raw_exclusions, exclusion_set)
+    if args.watch:
+        return run_watch(args, search_dir, raw_exclusions, exclusion_set)
+
     # Phase 2: Display run parameters
     ui.print_header("HARDLINKS CREATOR — ANÁLISIS COMPLETO")
     ui.print_field("Directorio", search_dir, "📁")
@@ -69,45 +246,93 @@ def main() -> None:
 
     ui.print_separator()
 
+    if args.stream:
+        return run_stream(args, search_dir, raw_exclusions)
+
     # Phase 3: Scan
     print(f"🔍 Escaneando directorio…\n")
-    hash_groups = scan_files(search_dir, args.filename, exclusion_set)
+    checkpoint = open_checkpoint(args, search_dir, exclusion_set)
+    try:
+        hash_groups = hardlinks.scan(
+            search_dir, args.filename, raw_exclusions, args.walk_threads, checkpoint
+        )
+    except KeyboardInterrupt:
+        if checkpoint is not None:
+            checkpoint.save()
+            print(f"\n\n⚠️  Escaneo interrumpido. Progreso guardado; continúa con --resume.\n")
+        else:
+            print(f"\n\n⚠️  Operación cancelada por el usuario.\n")
+        return EXIT_INTERRUPTED
 
     total_files = sum(len(v) for v in hash_groups.values())
     if total_files == 0:
         ui.print_warning(f"No se encontraron archivos con el nombre '{args.filename}'.")
-        sys.exit(0)
+        if checkpoint is not None:
+            checkpoint.discard()
+        return 0
 
     ui.print_success(
         f"{total_files} archivo(s) encontrado(s) con el nombre '{args.filename}'."
     )
 
-    # Phase 4: Link
+    # Phase 4: Plan and link
+    link_plan = hardlinks.plan(hash_groups)
+    if link_plan:
+        ui.print_success(f"Se encontraron {len(link_plan)} grupo(s) con contenido idéntico.\n")
+    else:
+        ui.print_info("Todos los archivos tienen contenido único. No hay candidatos.")
+
+    confirm = None if args.auto else (lambda group: ui.confirm_group(group["number"]))
     try:
-        stats = process_groups(
-            hash_groups=hash_groups,
-            search_dir=search_dir,
-            auto_mode=args.auto,
+        stats = hardlinks.apply(
+            link_plan,
             dry_run=args.dry_run,
+            confirm=confirm,
+            on_event=lambda event: ui.render_event(event, search_dir),
+            workers=args.link_workers,
         )
     except KeyboardInterrupt:
         print(f"\n\n⚠️  Operación cancelada por el usuario.\n")
-        sys.exit(EXIT_INTERRUPTED)
+        return EXIT_INTERRUPTED
 
     ui.print_summary(stats)
 
     # Phase 5: Optional JSON report
-    if args.report_json:
-        report = build_report(
-            stats=stats,
-            filename=args.filename,
-            search_dir=search_dir,
-            dry_run=args.dry_run,
-            hash_groups=hash_groups,
-        )
-        save_report(report, args.report_json)
+    write_report(args, stats, search_dir, hash_groups)
+
+    if checkpoint is not None and stats["errors"] == 0:
+        checkpoint.discard()
+
+    return 1 if stats["errors"] > 0 else 0
 
-    sys.exit(1 if stats["errors"] > 0 else 0)
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+    if not args.filename and not args.inventory:
+        parser.error("se requiere FILENAME (u opción --inventory)")
+    if args.walk_threads < 1:
+        parser.error("--walk-threads debe ser >= 1")
+    if args.link_workers < 1:
+        parser.error("--link-workers debe ser >= 1")
+    if args.inventory and (args.checkpoint or args.resume):
+        parser.error("--checkpoint/--resume no aplican a --inventory (no hay hashing)")
+    if args.watch and (args.inventory or not args.filename):
+        parser.error("--watch requiere FILENAME y no se combina con --inventory")
+    if args.stream and (args.inventory or args.watch or args.checkpoint or args.resume):
+        parser.error("--stream no se combina con --inventory, --watch ni --checkpoint/--resume")
+
+    # Phase 0: Apply global settings before any output
+    if args.no_color:
+        disable_colors()
+
+    logger = get_logger(verbose=args.verbose, log_file=LOG_FILE)
+
+    try:
+        sys.exit(run(args))
+    except HardlinksError as exc:
+        logger.error(str(exc))
+        sys.exit(exc.exit_code)
 
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+# Benchmark of pdf_page_counter.py: run `python3 -m benchmark` from script_pdf_page_counter/.
@@ -0,0 +1,97 @@
+"""
+Benchmark de PDF Page Counter.
+
+Genera (o reutiliza) un corpus sintético, mide descubrimiento, conteo por
+motor, caché y escritura de reportes, y guarda el resultado en JSON para
+seguir la evolución del rendimiento entre versiones.
+
+Uso (desde script_pdf_page_counter/):
+    python3 -m benchmark
+    python3 -m benchmark --escala 4 --jobs 8 -o bench.json
+    python3 -m benchmark --corpus /tmp/corpus_pdf      # se conserva y se reutiliza
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+
+# Permite importar pdf_page_counter y lib/ aunque se ejecute desde otro directorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark.corpus import generar_corpus, cargar_manifiesto
+from benchmark.medicion import ejecutar
+from lib.escritores import FORMATOS
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python3 -m benchmark",
+        description="Benchmark de pdf_page_counter.py sobre un corpus sintético",
+    )
+    parser.add_argument("--corpus", help="Directorio del corpus (se genera si no tiene corpus.json); "
+                                         "por defecto, uno temporal que se borra al terminar")
+    parser.add_argument("--escala", type=int, default=1,
+                        help="Tamaño del corpus: posts por blog, páginas del PDF enorme… (por defecto: 1)")
+    parser.add_argument("--blogs", type=int, default=4, help="Blogs del corpus (por defecto: 4)")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del corpus (por defecto: 0)")
+    parser.add_argument("--motores", nargs="+", choices=["fast", "auto", "pypdf2"],
+                        default=["fast", "auto", "pypdf2"], help="Motores de conteo a medir")
+    parser.add_argument("--formatos", nargs="+", choices=FORMATOS, default=list(FORMATOS),
+                        help="Formatos de reporte a medir")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Procesos de conteo (por defecto: 1)")
+    parser.add_argument("-r", "--repeticiones", type=int, default=3,
+                        help="Repeticiones por fase; se guarda la mejor (por defecto: 3)")
+    parser.add_argument("-o", "--output", help="Archivo JSON de salida (por defecto: salida estándar)")
+    args = parser.parse_args()
+    if args.escala < 1 or args.repeticiones < 1 or args.jobs < 1:
+        parser.error("--escala, --repeticiones y --jobs deben ser >= 1")
+
+    # Sin la biblioteca no hay nada que medir: se omite y se informa
+    omitidos = []
+    if importlib.util.find_spec("PyPDF2") is None:
+        omitidos += [m for m in args.motores if m == "pypdf2"]
+        args.motores = [m for m in args.motores if m != "pypdf2"]
+    if importlib.util.find_spec("openpyxl") is None and "xlsx" in args.formatos:
+        omitidos.append("xlsx")
+        args.formatos = [f for f in args.formatos if f != "xlsx"]
+    if not args.motores:
+        parser.error("ningún motor disponible (PyPDF2 no está instalado; usa --motores fast)")
+
+    # Los PDF corruptos del corpus llenarían la salida de avisos de reparación
+    logging.getLogger("PyPDF2").setLevel(logging.CRITICAL)
+
+    raiz = args.corpus or tempfile.mkdtemp(prefix="corpus_pdf_")
+    try:
+        manifiesto = cargar_manifiesto(raiz)
+        if manifiesto is None:
+            print(f"🏗️  Generando corpus en {raiz} (escala {args.escala})...", file=sys.stderr)
+            manifiesto = generar_corpus(raiz, args.escala, args.blogs, args.semilla)
+        else:
+            print(f"♻️  Reutilizando corpus de {raiz} (escala {manifiesto['escala']})", file=sys.stderr)
+        print(f"📄 {len(manifiesto['archivos'])} PDFs en {len(manifiesto['sitios'])} sitios", file=sys.stderr)
+        if omitidos:
+            print(f"⚠️  Omitidos (dependencia no instalada): {', '.join(omitidos)}", file=sys.stderr)
+
+        resultado = ejecutar(raiz, manifiesto, args.motores, args.formatos, args.jobs,
+                             args.repeticiones, progreso=lambda linea: print(linea, file=sys.stderr))
+        resultado["omitidos"] = omitidos
+    finally:
+        if not args.corpus:
+            shutil.rmtree(raiz, ignore_errors=True)
+
+    texto = json.dumps(resultado, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+        print(f"✅ Resultados: {args.output}", file=sys.stderr)
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""
+Generador del corpus sintético del benchmark.
+
+Crea, sin dependencias externas, una estructura de blogs Quarto falsa
+(<destino>/<blog>/_site/...) con PDFs de todos los tipos que el contador
+encuentra en la práctica:
+
+  diminuto      1 página, tabla xref clásica
+  enorme        miles de páginas con un stream de contenido propio cada una
+  xref_stream   objetos en object streams + xref stream con predictor PNG
+  incremental   una actualización incremental que añade páginas (/Prev)
+  linealizado   diccionario /Linearized válido en el primer objeto
+  cifrado       RC4 de 40 bits (R2) con contraseña de usuario vacía
+  corrupto_*    offsets desplazados, archivo truncado, basura y vacío
+
+Junto a los PDF se generan los archivos que rodean a un sitio real —
+site_libs/, figuras en *_files/, index.html, search.json y sitemap.xml —
+para que el recorrido del descubrimiento tenga algo que podar.
+
+El manifiesto corpus.json enumera cada PDF con su tipo y el número de
+páginas esperado (None si no hay un valor correcto: archivos ilegibles).
+"""
+
+import hashlib
+import json
+import os
+import random
+import struct
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+ARCHIVO_MANIFIESTO = "corpus.json"
+
+# Tipo de cada post, en ciclo; 'enorme' se añade una vez por blog
+CICLO_TIPOS = [
+    "diminuto", "diminuto", "diminuto", "xref_stream", "incremental",
+    "diminuto", "linealizado", "cifrado", "xref_stream", "diminuto",
+    "corrupto_xref", "diminuto", "incremental", "corrupto_truncado",
+    "linealizado", "corrupto_basura", "diminuto", "corrupto_vacio",
+]
+
+_RELLENO = bytes.fromhex("28BF4E5E4E758A4164004E56FFFA01082E2E00B6D0683E802F0CA9FE6453697A")
+
+
+# ========================================================================
+# CONSTRUCCIÓN DE PDFs
+# ========================================================================
+
+def _refs(nums: List[int]) -> bytes:
+    return b" ".join(b"%d 0 R" % n for n in nums)
+
+
+def _stream(diccionario: bytes, datos: bytes, comprimir: bool = True) -> bytes:
+    if comprimir:
+        datos = zlib.compress(datos)
+        diccionario += b" /Filter /FlateDecode"
+    return b"<< %s /Length %d >>\nstream\n%s\nendstream" % (diccionario, len(datos), datos)
+
+
+class ConstructorPDF:
+    """Objetos numerados y su serialización con xref clásica o xref stream."""
+
+    def __init__(self, version: str = "1.4"):
+        self.version = version.encode()
+        self.objetos: Dict[int, bytes] = {}
+        self._siguiente = 1
+
+    def reservar(self) -> int:
+        num = self._siguiente
+        self._siguiente += 1
+        return num
+
+    def agregar(self, contenido: bytes) -> int:
+        num = self.reservar()
+        self.objetos[num] = contenido
+        return num
+
+    def definir(self, num: int, contenido: bytes):
+        self.objetos[num] = contenido
+
+    def arbol_paginas(self, paginas: int, rnd: random.Random = None,
+                      contenido_propio: bool = False, con_contenido: bool = True,
+                      por_nodo: int = 50) -> Tuple[int, List[int]]:
+        """
+        Crea un árbol /Pages de dos niveles y devuelve (raíz, nodos intermedios).
+
+        Con contenido_propio cada página lleva su stream (texto pseudoaleatorio);
+        si no, todas comparten uno.
+        """
+        raiz = self.reservar()
+        compartido = None
+        if con_contenido and not contenido_propio:
+            compartido = self.agregar(_stream(b"", b"BT /F1 12 Tf 72 720 Td (Hola) Tj ET"))
+        nodos = []
+        for inicio in range(0, paginas, por_nodo):
+            nodo = self.reservar()
+            hojas = []
+            for _ in range(inicio, min(inicio + por_nodo, paginas)):
+                contenido = compartido
+                if con_contenido and contenido_propio:
+                    texto = " ".join(f"({rnd.getrandbits(64):x}) Tj" for _ in range(120))
+                    contenido = self.agregar(_stream(b"", f"BT /F1 9 Tf 36 760 Td {texto} ET".encode()))
+                extra = b" /Contents %d 0 R" % contenido if contenido else b""
+                hojas.append(self.agregar(
+                    b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792]%s >>" % (nodo, extra)))
+            self.definir(nodo, b"<< /Type /Pages /Parent %d 0 R /Kids [%s] /Count %d >>"
+                         % (raiz, _refs(hojas), len(hojas)))
+            nodos.append(nodo)
+        self.definir(raiz, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (_refs(nodos), paginas))
+        return raiz, nodos
+
+    def _cabecera(self) -> bytearray:
+        return bytearray(b"%PDF-" + self.version + b"\n%\xe2\xe3\xcf\xd3\n")
+
+    def clasico(self, trailer: bytes, desplazar: int = 0) -> Tuple[bytes, int]:
+        """
+        Serializa con tabla xref clásica.
+
+        Args:
+            trailer: Entradas del trailer sin /Size (p. ej. b"/Root 1 0 R")
+            desplazar: Bytes sumados a cada offset (corrupción deliberada)
+
+        Returns:
+            (bytes del archivo, offset de la tabla xref)
+        """
+        salida = self._cabecera()
+        offsets = {}
+        for num in sorted(self.objetos):
+            offsets[num] = len(salida)
+            salida += b"%d 0 obj\n%s\nendobj\n" % (num, self.objetos[num])
+        tamano = max(self.objetos) + 1
+        xref = len(salida)
+        salida += b"xref\n0 %d\n0000000000 65535 f \n" % tamano
+        for num in range(1, tamano):
+            if num in offsets:
+                salida += b"%010d 00000 n \n" % (offsets[num] + desplazar)
+            else:
+                salida += b"0000000000 65535 f \n"
+        salida += b"trailer\n<< /Size %d %s >>\nstartxref\n%d\n%%%%EOF\n" % (tamano, trailer, xref)
+        return bytes(salida), xref
+
+    def con_xref_stream(self, raiz_catalogo: int, por_objstm: int = 100) -> bytes:
+        """Serializa con object streams (objetos sin stream) y un xref stream."""
+        salida = self._cabecera()
+        sueltos = sorted(n for n, c in self.objetos.items() if b"stream\n" in c)
+        comprimibles = sorted(n for n, c in self.objetos.items() if b"stream\n" not in c)
+        entradas = {}                                   # num → (tipo, c2, c3)
+
+        for num in sueltos:
+            entradas[num] = (1, len(salida), 0)
+            salida += b"%d 0 obj\n%s\nendobj\n" % (num, self.objetos[num])
+
+        siguiente = max(self.objetos) + 1
+        for inicio in range(0, len(comprimibles), por_objstm):
+            grupo = comprimibles[inicio:inicio + por_objstm]
+            num_stm = siguiente
+            siguiente += 1
+            cuerpos, cabecera, pos = [], [], 0
+            for indice, num in enumerate(grupo):
+                cabecera.append(b"%d %d" % (num, pos))
+                cuerpos.append(self.objetos[num])
+                pos += len(self.objetos[num]) + 1
+                entradas[num] = (2, num_stm, indice)
+            cab = b" ".join(cabecera) + b" "
+            entradas[num_stm] = (1, len(salida), 0)
+            salida += b"%d 0 obj\n%s\nendobj\n" % (num_stm, _stream(
+                b"/Type /ObjStm /N %d /First %d" % (len(grupo), len(cab)),
+                cab + b" ".join(cuerpos)))
+
+        num_xref = siguiente
+        entradas[num_xref] = (1, len(salida), 0)
+        tamano = num_xref + 1
+        filas = bytearray()
+        anterior = bytes(7)
+        for num in range(tamano):
+            tipo, c2, c3 = entradas.get(num, (0, 0, 65535 if num == 0 else 0))
+            fila = struct.pack(">BIH", tipo, c2, c3)
+            filas += b"\x02" + bytes((a - b) & 0xFF for a, b in zip(fila, anterior))
+            anterior = fila
+        salida += b"%d 0 obj\n%s\nendobj\n" % (num_xref, _stream(
+            b"/Type /XRef /Size %d /W [1 4 2] /Root %d 0 R "
+            b"/DecodeParms << /Predictor 12 /Columns 7 >>" % (tamano, raiz_catalogo), bytes(filas)))
+        salida += b"startxref\n%d\n%%%%EOF\n" % entradas[num_xref][1]
+        return bytes(salida)
+
+
+def _rc4(clave: bytes, datos: bytes) -> bytes:
+    s = list(range(256))
+    j = 0
+    for i in range(256):
+        j = (j + s[i] + clave[i % len(clave)]) & 0xFF
+        s[i], s[j] = s[j], s[i]
+    salida = bytearray()
+    i = j = 0
+    for byte in datos:
+        i = (i + 1) & 0xFF
+        j = (j + s[i]) & 0xFF
+        s[i], s[j] = s[j], s[i]
+        salida.append(byte ^ s[(s[i] + s[j]) & 0xFF])
+    return bytes(salida)
+
+
+def _diccionario_cifrado(id0: bytes, propietario: bytes = b"benchmark") -> bytes:
+    """/Encrypt estándar R2 (RC4 40 bits) con contraseña de usuario vacía."""
+    permisos = -4
+    o = _rc4(hashlib.md5((propietario + _RELLENO)[:32]).digest()[:5], _RELLENO)
+    clave = hashlib.md5(_RELLENO + o + struct.pack("<i", permisos) + id0).digest()[:5]
+    u = _rc4(clave, _RELLENO)
+    return b"<< /Filter /Standard /V 1 /R 2 /O <%s> /U <%s> /P %d >>" % (
+        o.hex().encode(), u.hex().encode(), permisos)
+
+
+# ========================================================================
+# TIPOS DE PDF
+# ========================================================================
+
+def _catalogo(c: ConstructorPDF, paginas_raiz: int) -> int:
+    return c.agregar(b"<< /Type /Catalog /Pages %d 0 R >>" % paginas_raiz)
+
+
+def _info(c: ConstructorPDF, titulo: str) -> int:
+    titulo_utf16 = b"\xfe\xff" + titulo.encode("utf-16-be")
+    return c.agregar(b"<< /Title <%s> /Author (Benchmark) /Producer (corpus.py) "
+                     b"/CreationDate (D:20240101120000Z) >>" % titulo_utf16.hex().encode())
+
+
+def generar_pdf(tipo: str, rnd: random.Random, escala: int = 1) -> Tuple[bytes, Optional[int]]:
+    """
+    Devuelve (bytes, páginas esperadas) de un PDF del tipo pedido.
+
+    Las páginas esperadas son None cuando el archivo no tiene un conteo
+    recuperable (truncado, basura, vacío).
+    """
+    if tipo == "corrupto_vacio":
+        return b"", None
+    if tipo == "corrupto_basura":
+        return rnd.randbytes(rnd.randint(200, 4000)), None
+
+    paginas = {"diminuto": 1, "enorme": 1500 * escala}.get(tipo, rnd.randint(2, 40))
+    c = ConstructorPDF("1.5" if tipo == "xref_stream" else "1.4")
+
+    if tipo == "cifrado":
+        raiz_paginas, _ = c.arbol_paginas(paginas, con_contenido=False)
+        catalogo = _catalogo(c, raiz_paginas)
+        id0 = rnd.randbytes(16)
+        cifrado = c.agregar(_diccionario_cifrado(id0))
+        datos, _ = c.clasico(b"/Root %d 0 R /Encrypt %d 0 R /ID [<%s> <%s>]"
+                             % (catalogo, cifrado, id0.hex().encode(), id0.hex().encode()))
+        return datos, paginas
+
+    if tipo == "linealizado":
+        lineal = c.reservar()                       # primer objeto del archivo
+    raiz_paginas, nodos = c.arbol_paginas(paginas, rnd, contenido_propio=(tipo == "enorme"))
+    catalogo = _catalogo(c, raiz_paginas)
+    info = _info(c, f"Documento {tipo} ({paginas} páginas)")
+
+    if tipo == "xref_stream":
+        return c.con_xref_stream(catalogo), paginas
+
+    if tipo == "linealizado":
+        # /L con ancho fijo: el tamaño final se escribe sin mover ningún offset
+        c.definir(lineal, b"<< /Linearized 1 /L 0000000000 /H [0 0] /O 0 /E 0 /N %d /T 0 >>" % paginas)
+        datos, _ = c.clasico(b"/Root %d 0 R /Info %d 0 R" % (catalogo, info))
+        return datos.replace(b"/L 0000000000", b"/L %010d" % len(datos), 1), paginas
+
+    desplazar = 7 if tipo == "corrupto_xref" else 0
+    datos, xref = c.clasico(b"/Root %d 0 R /Info %d 0 R" % (catalogo, info), desplazar)
+
+    if tipo == "corrupto_truncado":
+        return datos[:len(datos) * 3 // 5], None
+
+    if tipo == "incremental":
+        # Nuevo nodo intermedio con páginas extra y nueva versión de la raíz
+        extra = rnd.randint(1, 5)
+        nodo = max(c.objetos) + 1
+        nuevas = {nodo + 1 + i: b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] >>" % nodo
+                  for i in range(extra)}
+        nuevas[nodo] = b"<< /Type /Pages /Parent %d 0 R /Kids [%s] /Count %d >>" % (
+            raiz_paginas, _refs(sorted(n for n in nuevas if n != nodo)), extra)
+        nuevas[raiz_paginas] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            _refs(nodos + [nodo]), paginas + extra)
+        salida = bytearray(datos)
+        offsets = {}
+        for num in sorted(nuevas):
+            offsets[num] = len(salida)
+            salida += b"%d 0 obj\n%s\nendobj\n" % (num, nuevas[num])
+        nueva_xref = len(salida)
+        salida += b"xref\n"
+        for num in sorted(offsets):
+            salida += b"%d 1\n%010d 00000 n \n" % (num, offsets[num])
+        salida += b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R /Prev %d >>\nstartxref\n%d\n%%%%EOF\n" % (
+            max(nuevas) + 1, catalogo, info, xref, nueva_xref)
+        return bytes(salida), paginas + extra
+
+    return datos, paginas
+
+
+# ========================================================================
+# ESTRUCTURA DE SITIOS
+# ========================================================================
+
+def _escribir(ruta: str, datos: bytes):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, "wb") as f:
+        f.write(datos)
+
+
+def generar_corpus(destino: str, escala: int = 1, blogs: int = 4, semilla: int = 0) -> dict:
+    """
+    Genera el corpus en destino y devuelve su manifiesto (también en corpus.json).
+
+    Args:
+        destino: Directorio raíz (se crea si no existe)
+        escala: Multiplica posts por blog, páginas del PDF enorme y archivos de site_libs
+        blogs: Número de blogs falsos
+        semilla: Semilla del generador pseudoaleatorio (corpus reproducible)
+    """
+    rnd = random.Random(semilla)
+    archivos, sitios = [], []
+    posts_por_blog = 25 * escala
+
+    for b in range(blogs):
+        blog = f"blog-{b:02d}"
+        sitio = os.path.join(destino, blog, "_site")
+        sitios.append(os.path.relpath(sitio, destino))
+        hrefs = []
+
+        tipos = ["enorme"] + [CICLO_TIPOS[(b + i) % len(CICLO_TIPOS)] for i in range(posts_por_blog - 1)]
+        for i, tipo in enumerate(tipos):
+            slug = f"posts/{2015 + i % 10}-{1 + i % 12:02d}-post-{i:03d}"
+            datos, paginas = generar_pdf(tipo, rnd, escala)
+            ruta = os.path.join(sitio, slug, "index.pdf")
+            _escribir(ruta, datos)
+            archivos.append({"ruta": os.path.relpath(ruta, destino), "tipo": tipo,
+                             "paginas": paginas, "index": True, "bytes": len(datos)})
+            _escribir(os.path.join(sitio, slug, "index.html"), b"<html></html>")
+            hrefs.append(f"{slug}/index.html")
+
+            # Figuras de Quarto: el descubrimiento poda *_files sin recorrerlo
+            for f in range(3):
+                _escribir(os.path.join(sitio, slug, "index_files", "figure-html", f"fig-{f}.png"),
+                          rnd.randbytes(256))
+            _escribir(os.path.join(sitio, slug, "index_files", "figure-pdf", "fig-0.pdf"),
+                      generar_pdf("diminuto", rnd)[0])
+
+            if i % 5 == 0:                              # adjuntos (solo con --todos)
+                datos, paginas = generar_pdf("diminuto" if i % 10 else "xref_stream", rnd)
+                ruta = os.path.join(sitio, slug, "adjuntos", f"anexo-{i}.pdf")
+                _escribir(ruta, datos)
+                archivos.append({"ruta": os.path.relpath(ruta, destino), "tipo": "adjunto",
+                                 "paginas": paginas, "index": False, "bytes": len(datos)})
+
+        for f in range(200 * escala):
+            _escribir(os.path.join(sitio, "site_libs", f"lib-{f % 20}", f"archivo-{f}.js"), b"//")
+        _escribir(os.path.join(sitio, "search.json"),
+                  json.dumps([{"href": h, "title": h} for h in hrefs]).encode())
+        _escribir(os.path.join(sitio, "sitemap.xml"), (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+            + "".join(f"  <url><loc>https://example.org/{h}</loc></url>\n" for h in hrefs)
+            + "</urlset>\n").encode())
+
+    manifiesto = {"escala": escala, "blogs": blogs, "semilla": semilla,
+                  "sitios": sitios, "archivos": archivos}
+    with open(os.path.join(destino, ARCHIVO_MANIFIESTO), "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=1)
+    return manifiesto
+
+
+def cargar_manifiesto(destino: str) -> Optional[dict]:
+    """Lee corpus.json de un corpus ya generado, o None si no existe."""
+    try:
+        with open(os.path.join(destino, ARCHIVO_MANIFIESTO), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,245 @@
+"""
+Medición de pdf_page_counter.py sobre el corpus sintético.
+
+Cada fase se ejecuta en un proceso hijo propio (fork), de modo que su pico
+de memoria (ru_maxrss) no arrastra el de las fases anteriores:
+
+  descubrimiento_index / descubrimiento_todos   iterar_pdfs sobre cada _site
+  descubrimiento_manifiesto                     index.pdf de search.json/sitemap.xml
+  conteo_<motor>                                contar_paginas_lote, sin caché
+  conteo_auto_aislado                           igual, con los límites por PDF
+  cache_fria / cache_caliente                   descubrimiento + contar_con_cache
+  reporte_<formato>                             crear_escritor con todas las filas
+
+De cada fase se guarda el mejor tiempo de las repeticiones, los archivos/s
+y páginas/s derivados y el mayor pico de RSS (del hijo y de sus procesos).
+Los conteos se comparan con el manifiesto del corpus ('discrepancias').
+"""
+
+import gc
+import importlib.util
+import multiprocessing
+import os
+import platform
+import resource
+import tempfile
+import time
+from datetime import datetime
+
+import pdf_page_counter as contador
+from lib.cache_paginas import CachePaginas
+from lib.descubrimiento import iterar_pdfs
+from lib.escritores import crear_escritor
+from lib.manifiestos import candidatos_manifiesto, iterar_candidatos
+
+
+def _rss_pico_kb() -> int:
+    """Mayor RSS del proceso y de sus hijos ya terminados, en KB (Linux)."""
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+
+def _medir(conexion, funcion, argumentos):
+    """Cuerpo del proceso hijo: ejecuta la fase y envía su resultado."""
+    try:
+        gc.collect()
+        inicio = time.perf_counter()
+        resultado = funcion(*argumentos)
+        resultado["segundos"] = time.perf_counter() - inicio
+        resultado["rss_pico_kb"] = _rss_pico_kb()
+    except Exception as e:                        # la fase falla, el benchmark sigue
+        resultado = {"error": f"{type(e).__name__}: {e}"}
+    conexion.send(resultado)
+    conexion.close()
+
+
+def en_proceso(funcion, *argumentos) -> dict:
+    """Ejecuta una fase en un proceso hijo y devuelve su resultado."""
+    contexto = multiprocessing.get_context("fork")
+    receptor, emisor = contexto.Pipe(duplex=False)
+    proceso = contexto.Process(target=_medir, args=(emisor, funcion, argumentos))
+    proceso.start()
+    emisor.close()
+    try:
+        resultado = receptor.recv()
+    except EOFError:
+        resultado = {"error": f"el proceso terminó con código {proceso.exitcode}"}
+    proceso.join()
+    return resultado
+
+
+# ========================================================================
+# FASES
+# ========================================================================
+
+def fase_descubrimiento(sitios: list, solo_index: bool) -> dict:
+    archivos = 0
+    for sitio in sitios:
+        archivos += sum(1 for _ in iterar_pdfs(sitio, solo_index, contador.DIRECTORIOS_EXCLUIDOS))
+    return {"archivos": archivos}
+
+
+def fase_descubrimiento_manifiesto(sitios: list) -> dict:
+    archivos = 0
+    for sitio in sitios:
+        candidatos = candidatos_manifiesto(sitio, contador.DIRECTORIOS_EXCLUIDOS) or []
+        archivos += sum(1 for _ in iterar_candidatos(sitio, candidatos))
+    return {"archivos": archivos}
+
+
+def _resumir_conteos(rutas: list, conteos: list, esperado: dict) -> dict:
+    paginas = sum(c for c in conteos if c > 0)
+    discrepancias = sum(1 for ruta, c in zip(rutas, conteos)
+                        if esperado.get(ruta) is not None and c != esperado[ruta])
+    return {"archivos": len(rutas), "paginas": paginas, "discrepancias": discrepancias,
+            "errores": sum(1 for c in conteos if c < 0)}
+
+
+def fase_conteo(rutas: list, motor: str, jobs: int, timeout: float, memoria_mb: int,
+                esperado: dict) -> dict:
+    conteos = list(contador.contar_paginas_lote(rutas, motor, jobs, timeout, memoria_mb))
+    return _resumir_conteos(rutas, conteos, esperado)
+
+
+def fase_cache(sitios: list, motor: str, jobs: int, ruta_db: str, esperado: dict) -> dict:
+    cache = CachePaginas(ruta_db)
+    entradas = [e for sitio in sitios
+                for e in iterar_pdfs(sitio, False, contador.DIRECTORIOS_EXCLUIDOS)]
+    conteos = list(contador.contar_con_cache(iter(entradas), motor, jobs, cache))
+    cache.cerrar()
+    resultado = _resumir_conteos([e.path for e in entradas], conteos, esperado)
+    resultado.update(aciertos=cache.aciertos, fallos=cache.fallos)
+    return resultado
+
+
+def fase_reporte(formato: str, filas: list, directorio: str) -> dict:
+    archivo = os.path.join(directorio, f"reporte.{formato}")
+    escritor = crear_escritor(formato, archivo, solo_index=False)
+    blog = None
+    for nombre, ruta, paginas in filas:
+        if nombre != blog:
+            if blog is not None:
+                escritor.cerrar_blog()
+            escritor.iniciar_blog(nombre)
+            blog = nombre
+        estado = "OK" if paginas > 0 else ("VACÍO" if paginas == 0 else "ERROR")
+        escritor.agregar_fila(ruta, paginas, estado)
+    if blog is not None:
+        escritor.cerrar_blog()
+    escritor.guardar()
+    return {"archivos": len(filas), "bytes_salida": os.path.getsize(archivo)}
+
+
+# ========================================================================
+# EJECUCIÓN
+# ========================================================================
+
+def _tasas(resultado: dict) -> dict:
+    """Añade archivos/s y páginas/s a un resultado (los errores pasan tal cual)."""
+    if "error" in resultado:
+        return resultado
+    segundos = max(resultado["segundos"], 1e-9)
+    resultado["segundos"] = round(segundos, 6)
+    resultado["archivos_s"] = round(resultado["archivos"] / segundos, 1)
+    if "paginas" in resultado:
+        resultado["paginas_s"] = round(resultado["paginas"] / segundos, 1)
+    return resultado
+
+
+def _mejor(repeticiones: int, funcion, *argumentos) -> dict:
+    """Repite una fase y se queda con el menor tiempo y el mayor pico de RSS."""
+    mejor = None
+    for _ in range(repeticiones):
+        resultado = en_proceso(funcion, *argumentos)
+        if "error" in resultado:
+            return resultado
+        if mejor is not None:
+            resultado["rss_pico_kb"] = max(resultado["rss_pico_kb"], mejor["rss_pico_kb"])
+            if resultado["segundos"] >= mejor["segundos"]:
+                mejor["rss_pico_kb"] = resultado["rss_pico_kb"]
+                continue
+        mejor = resultado
+    return _tasas(mejor)
+
+
+def ejecutar(raiz: str, manifiesto: dict, motores: list, formatos: list,
+             jobs: int = 1, repeticiones: int = 3, progreso=print) -> dict:
+    """
+    Mide todas las fases sobre un corpus ya generado.
+
+    Args:
+        raiz: Directorio del corpus
+        manifiesto: Manifiesto devuelto por generar_corpus / cargar_manifiesto
+        motores: Motores de conteo a medir
+        formatos: Formatos de reporte a medir
+        jobs: Procesos de conteo
+        repeticiones: Veces que se repite cada fase (se guarda la mejor)
+        progreso: Función que recibe una línea por fase terminada
+
+    Returns:
+        Diccionario listo para json.dump
+    """
+    sitios = [os.path.join(raiz, s) for s in manifiesto["sitios"]]
+    esperado = {os.path.join(raiz, a["ruta"]): a["paginas"] for a in manifiesto["archivos"]}
+    rutas = [e.path for s in sitios for e in iterar_pdfs(s, False, contador.DIRECTORIOS_EXCLUIDOS)]
+    fases = {}
+
+    def registrar(nombre, resultado):
+        fases[nombre] = resultado
+        if "error" in resultado:
+            progreso(f"   ✗ {nombre:<26} {resultado['error']}")
+        else:
+            progreso(f"   ✓ {nombre:<26} {resultado['segundos']:>9.4f} s "
+                     f"{resultado['archivos_s']:>10.1f} archivos/s "
+                     f"{resultado['rss_pico_kb'] / 1024:>7.1f} MB")
+
+    registrar("descubrimiento_index", _mejor(repeticiones, fase_descubrimiento, sitios, True))
+    registrar("descubrimiento_todos", _mejor(repeticiones, fase_descubrimiento, sitios, False))
+    registrar("descubrimiento_manifiesto", _mejor(repeticiones, fase_descubrimiento_manifiesto, sitios))
+
+    for motor in motores:
+        registrar(f"conteo_{motor}", _mejor(repeticiones, fase_conteo, rutas, motor, jobs, 0, 0, esperado))
+    if "auto" in motores:
+        registrar("conteo_auto_aislado", _mejor(
+            repeticiones, fase_conteo, rutas, "auto", jobs,
+            contador.TIMEOUT_POR_ARCHIVO, contador.LIMITE_MEMORIA_MB, esperado))
+
+    motor_cache = "auto" if "auto" in motores else motores[0]
+    with tempfile.TemporaryDirectory() as temporal:
+        ruta_db = os.path.join(temporal, "cache.sqlite3")
+        # La caché fría solo se puede medir una vez: la llena la propia fase
+        registrar("cache_fria", _tasas(en_proceso(fase_cache, sitios, motor_cache, jobs,
+                                                  ruta_db, esperado)))
+        registrar("cache_caliente", _mejor(repeticiones, fase_cache, sitios, motor_cache, jobs,
+                                           ruta_db, esperado))
+
+        # Filas del reporte a partir de un conteo rápido (fuera de la medición)
+        filas = []
+        for sitio, nombre in zip(sitios, manifiesto["sitios"]):
+            entradas = list(iterar_pdfs(sitio, False, contador.DIRECTORIOS_EXCLUIDOS))
+            conteos = contador.contar_paginas_lote((e.path for e in entradas), "fast")
+            filas += [(nombre, os.path.relpath(e.path, sitio), c) for e, c in zip(entradas, conteos)]
+        for formato in formatos:
+            registrar(f"reporte_{formato}", _mejor(repeticiones, fase_reporte, formato, filas, temporal))
+
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "entorno": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+            "pypdf2": importlib.util.find_spec("PyPDF2") is not None,
+            "openpyxl": importlib.util.find_spec("openpyxl") is not None,
+        },
+        "parametros": {"jobs": jobs, "repeticiones": repeticiones,
+                       "motores": motores, "formatos": formatos},
+        "corpus": {
+            "escala": manifiesto["escala"],
+            "blogs": manifiesto["blogs"],
+            "archivos": len(manifiesto["archivos"]),
+            "index_pdf": sum(1 for a in manifiesto["archivos"] if a["index"]),
+            "bytes": sum(a["bytes"] for a in manifiesto["archivos"]),
+            "paginas_esperadas": sum(a["paginas"] or 0 for a in manifiesto["archivos"]),
+        },
+        "fases": fases,
+    }
@@ -0,0 +1 @@
+# Marks lib/ as a Python package.
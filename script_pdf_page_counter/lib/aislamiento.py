@@ -0,0 +1,221 @@
+"""
+Conteo aislado en procesos con límite de tiempo y de memoria.
+
+Algunos PDF malformados o enormes hacen que PdfReader gire durante
+minutos o consuma gigabytes; un try/except no sirve contra un bloqueo.
+Aquí cada archivo se cuenta en un proceso trabajador propio del pool:
+  - el trabajador fija RLIMIT_AS al arrancar, así una asignación
+    desmedida falla con MemoryError (estado OOM) en lugar de arrastrar
+    a la máquina;
+  - el proceso principal vigila un plazo por archivo; si vence, mata al
+    trabajador (estado TIMEOUT) y arranca otro en su lugar;
+  - un trabajador que muere sin responder (p. ej. por una señal) deja su
+    archivo en ERROR y también se reemplaza.
+
+Las entradas se envían en lotes (un mensaje por lote, no uno por archivo)
+y el trabajador devuelve cada resultado en cuanto lo tiene. El plazo se
+renueva con cada resultado recibido, así que sigue midiendo el análisis
+de un solo archivo; si vence, ese archivo queda en TIMEOUT y el resto de
+su lote vuelve a la cola para el trabajador de reemplazo. Los resultados
+se devuelven en el orden de las entradas.
+"""
+
+import multiprocessing
+import signal
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Callable, Iterable, Iterator
+
+# Códigos de error en lugar de un número de páginas
+PAGINAS_ERROR = -1
+PAGINAS_TIMEOUT = -2
+PAGINAS_OOM = -3
+
+# Resultados que pueden acumularse por delante del más antiguo pendiente
+ADELANTO_POR_PROCESO = 64
+
+_FIN = object()
+
+
+def _trabajador(conexion, funcion: Callable, limite_bytes: int):
+    """Bucle de un trabajador: recibe una entrada, devuelve su resultado."""
+    # Ctrl+C lo atiende el proceso principal, que cierra el pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if limite_bytes:
+        import resource
+        _, duro = resource.getrlimit(resource.RLIMIT_AS)
+        if duro != resource.RLIM_INFINITY:
+            limite_bytes = min(limite_bytes, duro)
+        resource.setrlimit(resource.RLIMIT_AS, (limite_bytes, duro))
+    while True:
+        try:
+            lote = conexion.recv()
+        except EOFError:
+            return
+        if lote is None:
+            return
+        for entrada in lote:
+            try:
+                resultado = funcion(entrada)
+            except MemoryError:
+                resultado = PAGINAS_OOM
+            except Exception:                     # un fallo del análisis no debe matar al trabajador
+                resultado = PAGINAS_ERROR
+            conexion.send(resultado)
+
+
+class _Trabajador:
+    """Un proceso del pool con su extremo de la tubería y su lote en vuelo."""
+
+    def __init__(self, contexto, funcion: Callable, limite_bytes: int):
+        self.conexion, extremo = contexto.Pipe()
+        self.proceso = contexto.Process(target=_trabajador,
+                                        args=(extremo, funcion, limite_bytes),
+                                        daemon=True)
+        self.proceso.start()
+        extremo.close()
+        self.pendientes = deque()  # (índice, entrada) enviados y aún sin resultado
+        self.plazo = None
+
+    def enviar(self, lote: list, timeout: float):
+        self.conexion.send([entrada for _, entrada in lote])
+        self.pendientes.extend(lote)
+        self.renovar_plazo(timeout)
+
+    def renovar_plazo(self, timeout: float):
+        """El plazo corre para el primer pendiente desde el último resultado."""
+        self.plazo = time.monotonic() + timeout if timeout and self.pendientes else None
+
+    def matar(self):
+        self.proceso.kill()
+        self.proceso.join()
+        self.conexion.close()
+
+    def cerrar(self):
+        try:
+            self.conexion.send(None)
+        except OSError:
+            pass
+        self.proceso.join(1)
+        if self.proceso.is_alive():
+            self.proceso.kill()
+            self.proceso.join()
+        self.conexion.close()
+
+
+class PoolAislado:
+    """
+    Pool de procesos que reemplaza a los trabajadores que se exceden.
+
+    Uso:
+        pool = PoolAislado(funcion, procesos=4, timeout=60, memoria_mb=2048, lote=16)
+        for resultado in pool.mapear(entradas):
+            ...
+
+    funcion debe ser importable desde el proceso hijo (función de módulo o
+    functools.partial de una) y devolver un entero.
+    """
+
+    def __init__(self, funcion: Callable, procesos: int = 1,
+                 timeout: float = 0, memoria_mb: int = 0, lote: int = 1):
+        """
+        Args:
+            funcion: Función aplicada a cada entrada
+            procesos: Número de trabajadores
+            timeout: Segundos por entrada (0 = sin límite)
+            memoria_mb: Límite de espacio de direcciones por trabajador (0 = sin límite)
+            lote: Entradas enviadas a un trabajador en cada mensaje
+        """
+        self.funcion = funcion
+        self.procesos = max(procesos, 1)
+        self.timeout = timeout
+        self.limite_bytes = memoria_mb * 1024 * 1024
+        self.lote = max(lote, 1)
+        self.reemplazados = 0
+        self._contexto = multiprocessing.get_context()
+        self._trabajadores = []
+
+    def _nuevo(self) -> _Trabajador:
+        return _Trabajador(self._contexto, self.funcion, self.limite_bytes)
+
+    def _reemplazar(self, trabajador: _Trabajador, resultado: int):
+        """Mata al trabajador: su archivo en curso recibe 'resultado' y el
+        resto de su lote vuelve a la cola."""
+        indice, _ = trabajador.pendientes.popleft()
+        self._listos[indice] = resultado
+        self._reintentos.extendleft(reversed(trabajador.pendientes))
+        trabajador.matar()
+        self._trabajadores[self._trabajadores.index(trabajador)] = self._nuevo()
+        self.reemplazados += 1
+
+    def _esperar(self):
+        """Espera respuestas o plazos vencidos y anota los resultados."""
+        ocupados = [t for t in self._trabajadores if t.pendientes]
+        plazos = [t.plazo for t in ocupados if t.plazo is not None]
+        espera = max(min(plazos) - time.monotonic(), 0) if plazos else None
+
+        for conexion in wait([t.conexion for t in ocupados], espera):
+            trabajador = next(t for t in ocupados if t.conexion is conexion)
+            try:
+                resultado = conexion.recv()
+            except (EOFError, OSError):
+                self._reemplazar(trabajador, PAGINAS_ERROR)
+                continue
+            indice, _ = trabajador.pendientes.popleft()
+            self._listos[indice] = resultado
+            trabajador.renovar_plazo(self.timeout)
+
+        ahora = time.monotonic()
+        for trabajador in ocupados:
+            if trabajador in self._trabajadores and trabajador.pendientes \
+                    and trabajador.plazo is not None and ahora >= trabajador.plazo:
+                self._reemplazar(trabajador, PAGINAS_TIMEOUT)
+
+    def mapear(self, entradas: Iterable) -> Iterator[int]:
+        """
+        Aplica la función a cada entrada y produce los resultados en orden.
+
+        Las entradas se consumen de forma perezosa: como mucho
+        procesos * ADELANTO_POR_PROCESO resultados (y al menos un lote por
+        trabajador) esperan al más antiguo.
+        """
+        entradas = iter(entradas)
+        adelanto = self.procesos * max(ADELANTO_POR_PROCESO, self.lote)
+        self._trabajadores = [self._nuevo() for _ in range(self.procesos)]
+        self._listos = {}
+        self._reintentos = deque()    # (índice, entrada) de lotes de trabajadores reemplazados
+        leidos = entregados = 0
+        agotado = False
+        try:
+            while True:
+                for trabajador in self._trabajadores:
+                    if trabajador.pendientes:
+                        continue
+                    lote = []
+                    while self._reintentos and len(lote) < self.lote:
+                        lote.append(self._reintentos.popleft())
+                    while not agotado and len(lote) < self.lote and leidos - entregados < adelanto:
+                        entrada = next(entradas, _FIN)
+                        if entrada is _FIN:
+                            agotado = True
+                            break
+                        lote.append((leidos, entrada))
+                        leidos += 1
+                    if not lote:
+                        break
+                    trabajador.enviar(lote, self.timeout)
+
+                while entregados in self._listos:
+                    yield self._listos.pop(entregados)
+                    entregados += 1
+                if agotado and entregados == leidos:
+                    return
+                self._esperar()
+        finally:
+            for trabajador in self._trabajadores:
+                if trabajador.pendientes:
+                    trabajador.matar()
+                else:
+                    trabajador.cerrar()
+            self._trabajadores = []
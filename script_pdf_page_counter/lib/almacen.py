@@ -0,0 +1,197 @@
+"""
+Almacén columnar de resultados y resúmenes agregados.
+
+Guardar cada resultado como una tupla (ruta, páginas, estado) y recalcular
+los subtotales con sum() sobre listas cuesta un objeto por PDF y una
+pasada por cada cifra. Aquí cada campo numérico es una columna array.array
+(tipos C contiguos, 33 bytes por PDF más la cadena de su ruta) y los
+textos repetidos se internan en tablas de identificadores:
+
+  blog_id, seccion_id  índice en self.blogs / self.secciones
+  ruta_id              índice de la fila (self.rutas[i])
+  anio                 año del post sacado de la ruta (0 = sin año)
+  paginas, estado      páginas (0 si no es OK) e índice en ESTADOS
+  tamano, mtime        del stat() que el descubrimiento ya hizo
+
+Las filas de un blog son consecutivas (como las produce el recorrido; agregar()
+lo exige), así que sus totales salen de cortes de las columnas, con sum()
+y bytes.count() en C. Los resúmenes por blog, sección (primer directorio:
+posts, teaching…), año e histograma de estados no se vectorizan: son un
+bucle de Python por fila que acumula cada combinación (blog, sección, año)
+y luego pliega esas pocas celdas.
+"""
+
+import re
+from array import array
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from lib.escritores import escribir_tabla
+
+ESTADOS = ("OK", "VACÍO", "ERROR", "TIMEOUT", "OOM")
+NIVELES = ("total", "blog", "seccion", "anio")
+SECCION_RAIZ = "(raíz)"
+SIN_ANIO = "Sin año"
+
+# Columnas de los resúmenes (archivo _resumen y tabla 'resumenes'); una por estado
+COLUMNAS_RESUMEN = ("nivel", "blog", "seccion", "anio", "archivos", "paginas", "bytes",
+                    "ultima_modificacion") + tuple(e.lower().replace("í", "i") for e in ESTADOS)
+
+# Quarto nombra los posts 2023-05-10-titulo/ o los agrupa en 2023/
+_RE_ANIO = re.compile(r"(?:^|[/_-])((?:19|20)\d\d)(?=$|[/_.-])")
+
+
+def anio_de_ruta(ruta: str) -> int:
+    """Primer año (19xx/20xx) de los directorios de la ruta, o 0."""
+    directorio = ruta.replace("\\", "/").rpartition("/")[0]
+    coincidencia = _RE_ANIO.search(directorio)
+    return int(coincidencia.group(1)) if coincidencia else 0
+
+
+class AlmacenResultados:
+    """
+    Resultados de una ejecución en columnas.
+
+    Uso:
+        almacen = AlmacenResultados()
+        almacen.agregar("axiomata", "posts/2023-05-10-a/index.pdf", 12, "OK", entrada.stat())
+        almacen.totales("axiomata")     # (archivos, páginas, {estado: archivos})
+        almacen.resumenes()             # {nivel: [fila de COLUMNAS_RESUMEN, …]}
+    """
+
+    def __init__(self):
+        self.blogs: List[str] = []
+        self.secciones: List[str] = []
+        self.rutas: List[str] = []
+        self._id_blog: Dict[str, int] = {}
+        self._id_seccion: Dict[str, int] = {}
+        self._filas_blog: Dict[int, Tuple[int, int]] = {}      # blog_id → (primera fila, fin)
+
+        self.blog_id = array("H")
+        self.seccion_id = array("I")
+        self.anio = array("H")
+        self.paginas = array("l")
+        self.estado = array("B")
+        self.tamano = array("q")
+        self.mtime = array("d")
+
+    def __len__(self) -> int:
+        return len(self.rutas)
+
+    @staticmethod
+    def _internar(valor: str, tabla: List[str], ids: Dict[str, int]) -> int:
+        identificador = ids.get(valor)
+        if identificador is None:
+            identificador = ids[valor] = len(tabla)
+            tabla.append(valor)
+        return identificador
+
+    def agregar(self, blog: str, ruta: str, paginas: int, estado: str, st=None):
+        """
+        Añade el resultado de un PDF.
+
+        Args:
+            ruta: Ruta relativa al _site del blog
+            st: os.stat_result del PDF (tamaño y mtime), o None si no se pudo leer
+
+        Raises:
+            ValueError: el blog ya tenía filas y otro blog se agregó después
+        """
+        b = self._internar(blog, self.blogs, self._id_blog)
+        partes = ruta.replace("\\", "/").split("/")
+        seccion = partes[0] if len(partes) > 1 else SECCION_RAIZ
+        fila = len(self.rutas)
+        inicio, fin = self._filas_blog.get(b, (fila, fila))
+        if fin != fila:
+            raise ValueError(f"Las filas del blog {blog} deben agregarse seguidas")
+        self._filas_blog[b] = (inicio, fila + 1)
+
+        self.rutas.append(ruta)
+        self.blog_id.append(b)
+        self.seccion_id.append(self._internar(seccion, self.secciones, self._id_seccion))
+        self.anio.append(anio_de_ruta(ruta))
+        self.paginas.append(paginas if estado == "OK" else 0)
+        self.estado.append(ESTADOS.index(estado))
+        self.tamano.append(st.st_size if st is not None else 0)
+        self.mtime.append(st.st_mtime if st is not None else 0.0)
+
+    def totales(self, blog: str = None) -> Tuple[int, int, Dict[str, int]]:
+        """
+        Archivos, páginas e histograma de estados de un blog (o de todos).
+
+        Cortes de las columnas: sum() y bytes.count() recorren memoria
+        contigua sin crear una tupla por PDF.
+        """
+        if blog is None:
+            inicio, fin = 0, len(self)
+        elif blog in self._id_blog:
+            inicio, fin = self._filas_blog[self._id_blog[blog]]
+        else:
+            return 0, 0, dict.fromkeys(ESTADOS, 0)
+        estados = self.estado[inicio:fin].tobytes()
+        return (fin - inicio, sum(self.paginas[inicio:fin]),
+                {estado: estados.count(i) for i, estado in enumerate(ESTADOS)})
+
+    def resumenes(self) -> Dict[str, List[dict]]:
+        """
+        Resúmenes por blog, sección, año y total, con el histograma de estados.
+
+        Returns:
+            {nivel: filas} para cada nivel de NIVELES; cada fila es un dict
+            con las claves de COLUMNAS_RESUMEN
+        """
+        # Un bucle de Python por fila: cada una suma en la celda (blog, sección, año)
+        celdas: Dict[Tuple[int, int, int], list] = {}
+        for clave, paginas, estado, tamano, mtime in zip(
+                zip(self.blog_id, self.seccion_id, self.anio),
+                self.paginas, self.estado, self.tamano, self.mtime):
+            celda = celdas.get(clave)
+            if celda is None:
+                celda = celdas[clave] = [0, 0, 0, 0.0] + [0] * len(ESTADOS)
+            celda[0] += 1
+            celda[1] += paginas
+            celda[2] += tamano
+            if mtime > celda[3]:
+                celda[3] = mtime
+            celda[4 + estado] += 1
+
+        # Las celdas son pocas: se pliegan en cada nivel
+        niveles: Dict[str, Dict[tuple, list]] = {nivel: {} for nivel in NIVELES}
+        for (b, s, a), celda in celdas.items():
+            for nivel, clave in (("total", ()), ("blog", (b,)), ("seccion", (b, s)), ("anio", (a,))):
+                acumulado = niveles[nivel].get(clave)
+                if acumulado is None:
+                    niveles[nivel][clave] = list(celda)
+                    continue
+                for i, valor in enumerate(celda):
+                    acumulado[i] = max(acumulado[i], valor) if i == 3 else acumulado[i] + valor
+
+        resultado = {}
+        for nivel, grupos in niveles.items():
+            filas = []
+            for clave, acumulado in grupos.items():
+                blog = self.blogs[clave[0]] if nivel in ("blog", "seccion") else None
+                seccion = self.secciones[clave[1]] if nivel == "seccion" else None
+                anio = (clave[0] or SIN_ANIO) if nivel == "anio" else None
+                fecha = (datetime.fromtimestamp(acumulado[3]).strftime("%Y-%m-%d %H:%M")
+                         if acumulado[3] else None)
+                filas.append(dict(zip(COLUMNAS_RESUMEN,
+                                      (nivel, blog, seccion, anio, *acumulado[:3], fecha,
+                                       *acumulado[4:]))))
+            # Por blog y sección en orden alfabético; los años del más reciente al más antiguo
+            if nivel == "anio":
+                filas.sort(key=lambda f: f["anio"] if f["anio"] != SIN_ANIO else 0, reverse=True)
+            else:
+                filas.sort(key=lambda f: (f["blog"] or "", f["seccion"] or ""))
+            resultado[nivel] = filas
+        return resultado
+
+
+def escribir_resumenes(resumenes: Dict[str, List[dict]], archivo: str, formato: str):
+    """
+    Guarda los resúmenes en un archivo propio (csv / jsonl) o, para sqlite,
+    en la tabla 'resumenes' del mismo archivo del reporte. Para xlsx se usa
+    la hoja 'Resumen' del escritor Excel.
+    """
+    filas = [fila for nivel in NIVELES for fila in resumenes.get(nivel, [])]
+    escribir_tabla(filas, COLUMNAS_RESUMEN, archivo, formato, "resumenes")
@@ -0,0 +1,135 @@
+"""
+Caché persistente de conteos de páginas (SQLite).
+
+Entre dos renders de Quarto la mayoría de los PDF no cambia. La caché
+guarda, por ruta absoluta, la firma del archivo (tamaño, mtime_ns, inodo)
+junto con el conteo y el motor que lo produjo; si la firma actual
+coincide, el PDF no se vuelve a abrir y la repetición de un análisis
+queda dominada por os.stat().
+
+Con --metadata también se guardan los metadatos (JSON); una entrada sin
+ellos cuenta como fallo cuando se piden. Un conteo guardado sin --metadata
+conserva los metadatos que ya tenía el mismo archivo (misma firma).
+"""
+
+import json
+import os
+import sqlite3
+from typing import Optional, Tuple, Union
+
+# Escrituras acumuladas antes de cada COMMIT
+LOTE_COMMIT = 500
+
+Firma = Tuple[int, int, int]
+
+
+def firma_archivo(ruta: str) -> Optional[Firma]:
+    """Devuelve (tamaño, mtime_ns, inodo) de un archivo, o None si no existe."""
+    try:
+        st = os.stat(ruta)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+def firma_entrada(entrada: os.DirEntry) -> Optional[Firma]:
+    """Como firma_archivo, pero reutilizando el stat() en caché del DirEntry."""
+    try:
+        st = entrada.stat(follow_symlinks=False)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+class CachePaginas:
+    """Tabla ruta → firma + conteo, con contadores de aciertos y fallos."""
+
+    def __init__(self, ruta_db: str, reconstruir: bool = False):
+        """
+        Args:
+            ruta_db: Archivo SQLite (se crea si no existe)
+            reconstruir: Vaciar la caché antes de usarla (--rebuild-cache)
+        """
+        self.conexion = sqlite3.connect(ruta_db)
+        self.conexion.execute(
+            """CREATE TABLE IF NOT EXISTS conteos (
+                   ruta     TEXT PRIMARY KEY,
+                   tamano   INTEGER NOT NULL,
+                   mtime_ns INTEGER NOT NULL,
+                   inodo    INTEGER NOT NULL,
+                   paginas  INTEGER NOT NULL,
+                   motor    TEXT NOT NULL,
+                   metadatos TEXT
+               )"""
+        )
+        # Cachés creadas antes de --metadata
+        columnas = [fila[1] for fila in self.conexion.execute("PRAGMA table_info(conteos)")]
+        if "metadatos" not in columnas:
+            self.conexion.execute("ALTER TABLE conteos ADD COLUMN metadatos TEXT")
+        if reconstruir:
+            self.conexion.execute("DELETE FROM conteos")
+        self.conexion.commit()
+        self.aciertos = 0
+        self.fallos = 0
+        self._pendientes = 0
+
+    def buscar(self, ruta: str, firma: Optional[Firma], motor: str,
+               con_metadatos: bool = False) -> Optional[Union[int, Tuple[int, dict]]]:
+        """
+        Devuelve el conteo guardado si la firma no cambió, o None (fallo).
+
+        Un error (-1) guardado por otro motor no cuenta como acierto:
+        cambiar de --engine debe darle otra oportunidad al archivo.
+        Con con_metadatos devuelve (páginas, metadatos).
+        """
+        fila = None
+        if firma is not None:
+            fila = self.conexion.execute(
+                "SELECT tamano, mtime_ns, inodo, paginas, motor, metadatos FROM conteos WHERE ruta = ?",
+                (ruta,),
+            ).fetchone()
+        if (fila is None or tuple(fila[:3]) != firma or (fila[3] < 0 and fila[4] != motor)
+                or (con_metadatos and fila[5] is None)):
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        return (fila[3], json.loads(fila[5])) if con_metadatos else fila[3]
+
+    def guardar(self, ruta: str, firma: Optional[Firma], conteo: Union[int, Tuple[int, dict]],
+                motor: str):
+        """
+        Registra un conteo (o conteo y metadatos) recién calculado; ignorado si no hay firma.
+
+        Sin metadatos se mantienen los guardados si la firma no cambió, para que
+        alternar ejecuciones con y sin --metadata no obligue a reanalizar.
+        """
+        if firma is None:
+            return
+        paginas, metadatos = conteo if isinstance(conteo, tuple) else (conteo, None)
+        self.conexion.execute(
+            """INSERT INTO conteos VALUES (?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(ruta) DO UPDATE SET
+                   paginas = excluded.paginas, motor = excluded.motor,
+                   metadatos = CASE
+                       WHEN excluded.metadatos IS NOT NULL THEN excluded.metadatos
+                       WHEN (tamano, mtime_ns, inodo) = (excluded.tamano, excluded.mtime_ns,
+                                                         excluded.inodo) THEN metadatos
+                   END,
+                   tamano = excluded.tamano, mtime_ns = excluded.mtime_ns, inodo = excluded.inodo""",
+            (ruta, *firma, paginas, motor,
+             json.dumps(metadatos, ensure_ascii=False) if metadatos is not None else None),
+        )
+        self._pendientes += 1
+        if self._pendientes >= LOTE_COMMIT:
+            self.conexion.commit()
+            self._pendientes = 0
+
+    def confirmar(self):
+        """Confirma las escrituras pendientes sin cerrar (volcados de --watch)."""
+        self.conexion.commit()
+        self._pendientes = 0
+
+    def cerrar(self):
+        """Confirma las escrituras pendientes y cierra la base de datos."""
+        self.conexion.commit()
+        self.conexion.close()
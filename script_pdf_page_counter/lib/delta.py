@@ -0,0 +1,126 @@
+"""
+Reporte de cambios respecto a la ejecución anterior (--delta).
+
+Cada ejecución completa guarda sus resultados en un archivo compacto junto
+a los reportes (excel_databases/.ultima_ejecucion_<tipo>.json), uno por
+tipo de búsqueda (index / todos). Con --delta se compara contra él:
+
+  nuevo        — PDF que no existía en la ejecución anterior
+  eliminado    — PDF que ya no está (solo en los blogs procesados ahora)
+  modificado   — sigue OK pero cambió su número de páginas
+  roto         — antes OK/VACÍO, ahora con error
+  reparado     — antes con error, ahora OK/VACÍO
+
+Los PDF sin cambios no se vuelven a analizar gracias a la caché de
+conteos, así que una ejecución con --delta cuesta en proporción a los
+cambios. Al procesar solo algunos blogs (-b) el resto del archivo de
+la ejecución anterior se conserva intacto.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from lib.escritores import escribir_tabla
+
+Clave = Tuple[str, str]                  # (blog, ruta relativa)
+Resultado = Tuple[int, str]              # (páginas, estado)
+
+ESTADOS_SANOS = ("OK", "VACÍO")
+COLUMNAS_CAMBIOS = ("cambio", "blog", "ruta", "paginas_antes", "paginas_ahora",
+                    "estado_antes", "estado_ahora")
+
+
+class RegistroEjecucion:
+    """Resultados de la última ejecución de un tipo de búsqueda."""
+
+    def __init__(self, directorio: str, solo_index: bool):
+        tipo = "index" if solo_index else "todos"
+        self.ruta = os.path.join(directorio, f".ultima_ejecucion_{tipo}.json")
+        self.fecha = None
+        self.resultados: Dict[Clave, Resultado] = {}
+
+    def cargar(self) -> bool:
+        """Lee el registro; False si no existe o está dañado."""
+        try:
+            with open(self.ruta, encoding="utf-8") as f:
+                datos = json.load(f)
+        except (OSError, ValueError):
+            return False
+        self.fecha = datos.get("fecha")
+        self.resultados = {
+            (blog, ruta): (paginas, estado)
+            for blog, filas in datos.get("blogs", {}).items()
+            for ruta, paginas, estado in filas
+        }
+        return True
+
+    def guardar(self, actuales: Dict[Clave, Resultado], blogs: Iterable[str]):
+        """
+        Reemplaza los blogs procesados por sus resultados actuales.
+
+        La escritura es atómica (archivo temporal + os.replace) para que
+        una ejecución interrumpida no deje un registro a medias.
+        """
+        blogs = set(blogs)
+        combinados = {k: v for k, v in self.resultados.items() if k[0] not in blogs}
+        combinados.update(actuales)
+
+        por_blog: Dict[str, list] = {}
+        for (blog, ruta), (paginas, estado) in sorted(combinados.items()):
+            por_blog.setdefault(blog, []).append([ruta, paginas, estado])
+
+        temporal = self.ruta + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump({"fecha": datetime.now().isoformat(timespec="seconds"), "blogs": por_blog},
+                      f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temporal, self.ruta)
+
+
+def calcular_cambios(anteriores: Dict[Clave, Resultado], actuales: Dict[Clave, Resultado],
+                     blogs: Iterable[str]) -> List[dict]:
+    """
+    Compara dos ejecuciones y devuelve los cambios ordenados por blog y ruta.
+
+    Args:
+        anteriores: Resultados de la ejecución anterior
+        actuales: Resultados de esta ejecución
+        blogs: Blogs procesados ahora (los eliminados solo se buscan en ellos)
+    """
+    blogs = set(blogs)
+    cambios = []
+
+    def agregar(tipo, clave, antes, ahora):
+        cambios.append(dict(zip(COLUMNAS_CAMBIOS, (
+            tipo, clave[0], clave[1],
+            antes[0] if antes else None, ahora[0] if ahora else None,
+            antes[1] if antes else None, ahora[1] if ahora else None,
+        ))))
+
+    for clave, ahora in actuales.items():
+        antes = anteriores.get(clave)
+        if antes is None:
+            agregar("nuevo", clave, None, ahora)
+        elif antes[1] in ESTADOS_SANOS and ahora[1] not in ESTADOS_SANOS:
+            agregar("roto", clave, antes, ahora)
+        elif antes[1] not in ESTADOS_SANOS and ahora[1] in ESTADOS_SANOS:
+            agregar("reparado", clave, antes, ahora)
+        elif antes[1] == ahora[1] == "OK" and antes[0] != ahora[0]:
+            agregar("modificado", clave, antes, ahora)
+
+    for clave, antes in anteriores.items():
+        if clave[0] in blogs and clave not in actuales:
+            agregar("eliminado", clave, antes, None)
+
+    cambios.sort(key=lambda c: (c["blog"], c["ruta"]))
+    return cambios
+
+
+def escribir_cambios(cambios: List[dict], archivo: str, formato: str):
+    """
+    Guarda los cambios en un archivo propio (csv / jsonl) o, para sqlite,
+    en la tabla 'cambios' del mismo archivo del reporte. Para xlsx se usa
+    la hoja 'Cambios' del escritor Excel.
+    """
+    escribir_tabla(cambios, COLUMNAS_CAMBIOS, archivo, formato, "cambios")
@@ -0,0 +1,91 @@
+"""
+Descubrimiento de PDFs con os.scandir.
+
+Path.glob('**/*.pdf') recorría todo _site — site_libs, imágenes, índices
+de búsqueda —, materializaba la lista completa y luego volvía a llamar a
+is_file() por cada coincidencia. Aquí el recorrido:
+  - poda los directorios irrelevantes antes de entrar en ellos
+    (patrones fnmatch sobre el nombre: site_libs, *_files, .quarto…);
+  - usa el tipo que ya trae cada DirEntry (sin stat adicional) y entrega
+    el propio DirEntry, cuyo stat() queda en caché para quien lo pida;
+  - produce las coincidencias de forma perezosa, así el conteo empieza
+    antes de que termine el recorrido;
+  - en modo solo index compara el nombre exacto 'index.pdf'.
+
+El orden es el mismo que sorted() sobre las rutas: entradas de cada
+directorio por nombre, en profundidad.
+"""
+
+import logging
+import os
+from fnmatch import fnmatch
+from typing import Iterable, Iterator
+
+NOMBRE_INDEX = "index.pdf"
+
+# Avisos no fatales de lib/ (directorios ilegibles, manifiestos dañados…): se
+# registran con logging y el CLI decide cómo mostrarlos (--quiet, --progress)
+avisos = logging.getLogger(__name__)
+
+
+class EntradaRuta:
+    """
+    Lo que el resto del programa usa de un os.DirEntry para una ruta suelta
+    (manifiestos, --watch): path, name y stat() en caché, sin seguir enlaces.
+    """
+
+    __slots__ = ("path", "name", "_stat")
+
+    def __init__(self, path: str, st: os.stat_result = None):
+        self.path = path
+        self.name = os.path.basename(path)
+        self._stat = st
+
+    def stat(self, follow_symlinks: bool = True) -> os.stat_result:
+        if self._stat is None:
+            self._stat = os.stat(self.path, follow_symlinks=False)
+        return self._stat
+
+
+def _excluido(nombre: str, patrones: Iterable[str]) -> bool:
+    return any(fnmatch(nombre, patron) for patron in patrones)
+
+
+def iterar_pdfs(directorio: str, solo_index: bool = True,
+                excluidos: Iterable[str] = ()) -> Iterator[os.DirEntry]:
+    """
+    Recorre un directorio y produce los PDFs encontrados.
+
+    Args:
+        directorio: Directorio raíz donde buscar
+        solo_index: Si es True, solo archivos llamados exactamente 'index.pdf'
+        excluidos: Patrones de nombres de directorio que no se recorren
+
+    Yields:
+        os.DirEntry de cada PDF (archivo regular, sin seguir enlaces simbólicos)
+    """
+    excluidos = tuple(excluidos)
+    pila = []
+    try:
+        with os.scandir(directorio) as it:
+            pila.append(iter(sorted(it, key=lambda e: e.name)))
+    except OSError:
+        return
+
+    while pila:
+        entrada = next(pila[-1], None)
+        if entrada is None:
+            pila.pop()
+            continue
+        try:
+            if entrada.is_dir(follow_symlinks=False):
+                if not _excluido(entrada.name, excluidos):
+                    with os.scandir(entrada.path) as it:
+                        pila.append(iter(sorted(it, key=lambda e: e.name)))
+            elif solo_index:
+                if entrada.name == NOMBRE_INDEX and entrada.is_file(follow_symlinks=False):
+                    yield entrada
+            elif entrada.name.endswith(".pdf") and entrada.is_file(follow_symlinks=False):
+                yield entrada
+        except OSError as e:
+            avisos.warning("   ⚠️  No se pudo leer: %s (%s)", entrada.path, e.strerror)
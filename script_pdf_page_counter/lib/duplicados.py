@@ -0,0 +1,139 @@
+"""
+Un solo análisis por archivo físico.
+
+Muchos index.pdf aparecen en varios blogs (y en website-achalma/_site/blog)
+como enlaces duros o copias idénticas del mismo documento, y cada ruta se
+analizaba por separado. El Deduplicador se interpone entre el
+descubrimiento y el conteo:
+
+  - por inodo (siempre): (st_dev, st_ino) sale del stat() que el DirEntry
+    ya tiene en caché, así que no cuesta E/S. Los enlaces duros comparten
+    inodo y se cuentan una vez;
+  - por contenido (--dedup-content): copias sin enlazar. Solo se calcula
+    el resumen BLAKE2 de los archivos cuyo tamaño ya apareció antes (y,
+    de forma perezosa, el del primero de ese tamaño): un archivo de
+    tamaño único nunca se lee entero.
+
+Cada ruta repetida recibe el conteo de la primera, sin pasar por la caché
+ni por el pool, y se marca con la ruta del original para que el reporte
+pueda dar los totales con y sin duplicados.
+"""
+
+import hashlib
+import os
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+BLOQUE_LECTURA = 1024 * 1024
+_FIN = object()
+
+
+def resumen_contenido(ruta: str) -> Optional[bytes]:
+    """BLAKE2b de 128 bits del archivo, o None si no se puede leer."""
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        with open(ruta, "rb") as f:
+            while bloque := f.read(BLOQUE_LECTURA):
+                h.update(bloque)
+    except OSError:
+        return None
+    return h.digest()
+
+
+class Deduplicador:
+    """
+    Reparte el conteo de cada archivo físico entre todas sus rutas.
+
+    Uso:
+        dedup = Deduplicador(por_contenido=False)
+        for conteo, original in dedup.mapear(entradas, contar):
+            ...     # original: ruta de la que se copió el conteo, o None
+    """
+
+    def __init__(self, por_contenido: bool = False):
+        self.por_contenido = por_contenido
+        self._inodos: Dict[Tuple[int, int], str] = {}         # (st_dev, st_ino) → ruta original
+        # tamaño → [ruta, resumen o None si aún no se calculó] de los originales
+        self._por_tamano: Dict[int, List[list]] = {}
+        self._resumenes: Dict[Tuple[int, bytes], str] = {}    # (tamaño, resumen) → ruta original
+        self.duplicados = 0
+        self.resumenes_calculados = 0
+
+    def _resumen(self, ruta: str) -> Optional[bytes]:
+        self.resumenes_calculados += 1
+        return resumen_contenido(ruta)
+
+    def original_de(self, entrada: os.DirEntry) -> Optional[str]:
+        """Registra la entrada y devuelve la ruta del original si es un duplicado."""
+        try:
+            st = entrada.stat(follow_symlinks=False)
+        except OSError:
+            return None                           # el conteo informará del error
+        inodo = (st.st_dev, st.st_ino)
+        original = self._inodos.get(inodo)
+        if original is not None:
+            return original
+        self._inodos[inodo] = entrada.path
+        if not self.por_contenido:
+            return None
+
+        previos = self._por_tamano.get(st.st_size)
+        if previos is None:
+            self._por_tamano[st.st_size] = [[entrada.path, None]]
+            return None
+        for previo in previos:                    # el primero de cada tamaño, al aparecer otro
+            if previo[1] is None:
+                previo[1] = self._resumen(previo[0])
+                if previo[1] is not None:
+                    self._resumenes.setdefault((st.st_size, previo[1]), previo[0])
+        resumen = self._resumen(entrada.path)
+        if resumen is None:
+            return None
+        original = self._resumenes.get((st.st_size, resumen))
+        if original is not None:
+            self._inodos[inodo] = original
+            return original
+        self._resumenes[(st.st_size, resumen)] = entrada.path
+        previos.append([entrada.path, resumen])
+        return None
+
+    def mapear(self, entradas: Iterable[os.DirEntry],
+               contar: Callable[[Iterable[os.DirEntry]], Iterator]) -> Iterator[tuple]:
+        """
+        Cuenta solo los originales y reparte sus conteos.
+
+        Args:
+            entradas: DirEntry de los PDFs (iterable perezoso)
+            contar: Función que recibe un iterable de entradas y produce sus
+                conteos en el mismo orden (p. ej. contar_con_cache)
+
+        Yields:
+            (conteo, ruta original o None) por cada entrada, en orden
+        """
+        orden = deque()                           # (ruta original o None) por entrada
+        conteos: Dict[str, object] = {}           # ruta original → conteo (para los duplicados)
+
+        def originales() -> Iterator[os.DirEntry]:
+            for entrada in entradas:
+                original = self.original_de(entrada)
+                orden.append((entrada.path, original))
+                if original is None:
+                    yield entrada
+
+        resultados = contar(originales())
+        listos = deque()
+        while True:
+            if not orden:
+                conteo = next(resultados, _FIN)   # hace avanzar el descubrimiento
+                if conteo is _FIN and not orden:
+                    return
+                if conteo is not _FIN:
+                    listos.append(conteo)
+            ruta, original = orden.popleft()
+            if original is None:
+                conteo = listos.popleft() if listos else next(resultados)
+                conteos[ruta] = conteo
+                yield conteo, None
+            else:
+                self.duplicados += 1
+                yield conteos[original], original
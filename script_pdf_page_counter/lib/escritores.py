@@ -0,0 +1,204 @@
+"""
+Escritores de resultados (--format).
+
+Todos comparten la interfaz de EscritorExcel — iniciar_blog(),
+agregar_fila(), cerrar_blog(), guardar() — y escriben cada fila en cuanto
+llega. CSV, JSON Lines y SQLite generan una fila plana por PDF
+(blog, ruta, páginas, estado, duplicado_de), pensada para pipelines y
+dashboards; los subtotales se calculan con una simple agregación, y
+filtrando duplicado_de vacío se obtienen los totales sin duplicados. Con --metadata cada
+fila lleva además las columnas de CAMPOS_METADATOS, y con --stats las
+de CAMPOS_RENDIMIENTO (vacías en los aciertos de caché).
+
+openpyxl solo se importa cuando se pide xlsx.
+"""
+
+import abc
+import csv
+import json
+import sqlite3
+from datetime import datetime
+from typing import List, Tuple
+
+from lib.pdf_rapido import CAMPOS_METADATOS
+from lib.rendimiento import CAMPOS_RENDIMIENTO
+
+FORMATOS = ("xlsx", "csv", "jsonl", "sqlite")   # cada formato es también la extensión
+COLUMNAS = ("blog", "ruta", "paginas", "estado", "duplicado_de")
+
+
+class Escritor(abc.ABC):
+    """Base: lleva los totales y el blog actual; las subclases escriben."""
+
+    def __init__(self, archivo_salida: str, solo_index: bool, metadatos: bool = False,
+                 rendimiento: bool = False):
+        self.archivo_salida = archivo_salida
+        self.solo_index = solo_index
+        self.metadatos = metadatos
+        self.rendimiento = rendimiento
+        self._extra = (CAMPOS_METADATOS if metadatos else ()) + (CAMPOS_RENDIMIENTO if rendimiento else ())
+        self.columnas = COLUMNAS + self._extra
+        self.total_blogs = 0
+        self.total_archivos = 0
+        self.total_paginas = 0
+        self.archivos_duplicados = 0
+        self.paginas_duplicadas = 0
+        self._blog = None
+
+    def iniciar_blog(self, blog: str):
+        self._blog = blog
+        self.total_blogs += 1
+
+    def agregar_fila(self, ruta: str, paginas: int, estado: str, detalles: dict = None,
+                     duplicado_de: str = None):
+        paginas = paginas if estado == "OK" else 0
+        self.total_archivos += 1
+        self.total_paginas += paginas
+        if duplicado_de:
+            self.archivos_duplicados += 1
+            self.paginas_duplicadas += paginas
+        fila = (self._blog, ruta, paginas, estado, duplicado_de)
+        if self._extra:
+            fila += tuple((detalles or {}).get(campo) for campo in self._extra)
+        self._escribir(fila)
+
+    @abc.abstractmethod
+    def _escribir(self, fila: tuple):
+        """Escribe una fila ya completa (blog, ruta, páginas, estado, duplicado_de, extras…)"""
+
+    def cerrar_blog(self):
+        self._blog = None
+
+    @abc.abstractmethod
+    def guardar(self):
+        """Confirma y cierra el archivo del reporte"""
+
+
+class EscritorCSV(Escritor):
+    """CSV con encabezado, una fila por PDF."""
+
+    def __init__(self, archivo_salida: str, solo_index: bool, metadatos: bool = False,
+                 rendimiento: bool = False):
+        super().__init__(archivo_salida, solo_index, metadatos, rendimiento)
+        self._archivo = open(archivo_salida, "w", newline="", encoding="utf-8")
+        self._csv = csv.writer(self._archivo)
+        self._csv.writerow(self.columnas)
+
+    def _escribir(self, fila):
+        self._csv.writerow(fila)
+
+    def guardar(self):
+        self._archivo.close()
+
+
+class EscritorJSONL(Escritor):
+    """JSON Lines: un objeto {blog, ruta, paginas, estado, …} por línea."""
+
+    def __init__(self, archivo_salida: str, solo_index: bool, metadatos: bool = False,
+                 rendimiento: bool = False):
+        super().__init__(archivo_salida, solo_index, metadatos, rendimiento)
+        self._archivo = open(archivo_salida, "w", encoding="utf-8")
+
+    def _escribir(self, fila):
+        self._archivo.write(json.dumps(dict(zip(self.columnas, fila)), ensure_ascii=False) + "\n")
+
+    def guardar(self):
+        self._archivo.close()
+
+
+class EscritorSQLite(Escritor):
+    """Tablas 'resultados' (una fila por PDF) e 'informacion' (clave, valor)."""
+
+    LOTE_COMMIT = 1000
+
+    TIPOS_METADATOS = ("tamano INTEGER", "version TEXT", "cifrado INTEGER", "linealizado INTEGER",
+                       "titulo TEXT", "autor TEXT", "fecha_creacion TEXT")
+    TIPOS_RENDIMIENTO = ("segundos REAL", "bytes_leidos INTEGER")
+
+    def __init__(self, archivo_salida: str, solo_index: bool, metadatos: bool = False,
+                 rendimiento: bool = False):
+        super().__init__(archivo_salida, solo_index, metadatos, rendimiento)
+        tipos = (self.TIPOS_METADATOS if metadatos else ()) + (self.TIPOS_RENDIMIENTO if rendimiento else ())
+        extra = "".join(", " + tipo for tipo in tipos)
+        self._conexion = sqlite3.connect(archivo_salida)
+        self._conexion.executescript(
+            f"""DROP TABLE IF EXISTS resultados;
+                DROP TABLE IF EXISTS informacion;
+                CREATE TABLE resultados (blog TEXT, ruta TEXT, paginas INTEGER, estado TEXT,
+                                         duplicado_de TEXT{extra});
+                CREATE TABLE informacion (clave TEXT PRIMARY KEY, valor TEXT);"""
+        )
+        self._insertar = f"INSERT INTO resultados VALUES ({', '.join('?' * len(self.columnas))})"
+        self._pendientes = 0
+
+    def _escribir(self, fila):
+        self._conexion.execute(self._insertar, fila)
+        self._pendientes += 1
+        if self._pendientes >= self.LOTE_COMMIT:
+            self._conexion.commit()
+            self._pendientes = 0
+
+    def guardar(self):
+        self._conexion.executemany("INSERT INTO informacion VALUES (?, ?)", [
+            ("fecha_generacion", datetime.now().isoformat(timespec="seconds")),
+            ("tipo_busqueda", "index" if self.solo_index else "todos"),
+            ("total_blogs", self.total_blogs),
+            ("total_archivos", self.total_archivos),
+            ("total_paginas", self.total_paginas),
+            ("archivos_duplicados", self.archivos_duplicados),
+            ("total_paginas_sin_duplicados", self.total_paginas - self.paginas_duplicadas),
+        ])
+        self._conexion.commit()
+        self._conexion.close()
+
+
+def escribir_tabla(filas: List[dict], columnas: Tuple[str, ...], archivo: str,
+                   formato: str, tabla: str):
+    """
+    Guarda filas auxiliares del reporte (cambios, resúmenes) en un archivo
+    propio (csv / jsonl) o, para sqlite, en la tabla 'tabla' del mismo
+    archivo del reporte. Para xlsx cada una tiene su hoja en EscritorExcel.
+
+    Raises:
+        ValueError: formato sin archivo propio (xlsx)
+    """
+    if formato == "csv":
+        with open(archivo, "w", newline="", encoding="utf-8") as f:
+            escritor = csv.DictWriter(f, fieldnames=columnas)
+            escritor.writeheader()
+            escritor.writerows(filas)
+    elif formato == "jsonl":
+        with open(archivo, "w", encoding="utf-8") as f:
+            for fila in filas:
+                f.write(json.dumps(fila, ensure_ascii=False) + "\n")
+    elif formato == "sqlite":
+        conexion = sqlite3.connect(archivo)
+        conexion.execute(f"DROP TABLE IF EXISTS {tabla}")
+        conexion.execute(f"CREATE TABLE {tabla} ({', '.join(columnas)})")
+        conexion.executemany(
+            f"INSERT INTO {tabla} VALUES ({', '.join('?' * len(columnas))})",
+            [tuple(fila[k] for k in columnas) for fila in filas],
+        )
+        conexion.commit()
+        conexion.close()
+    else:
+        raise ValueError(f"Formato sin archivo de {tabla} propio: {formato}")
+
+
+def crear_escritor(formato: str, archivo_salida: str, solo_index: bool,
+                   metadatos: bool = False, rendimiento: bool = False):
+    """
+    Devuelve el escritor para el formato pedido.
+
+    Args:
+        metadatos: Añadir las columnas de CAMPOS_METADATOS (--metadata)
+        rendimiento: Añadir las columnas de CAMPOS_RENDIMIENTO (--stats)
+
+    Raises:
+        ImportError: formato xlsx sin openpyxl instalado
+    """
+    if formato == "xlsx":
+        from lib.excel_streaming import EscritorExcel
+        return EscritorExcel(archivo_salida, solo_index, metadatos, rendimiento)
+    clases = {"csv": EscritorCSV, "jsonl": EscritorJSONL, "sqlite": EscritorSQLite}
+    return clases[formato](archivo_salida, solo_index, metadatos, rendimiento)
@@ -0,0 +1,274 @@
+"""
+Escritor Excel en streaming (openpyxl write_only).
+
+Un Workbook normal guarda todas las celdas en memoria y crea objetos
+Font/Alignment por celda; con --todos sobre decenas de miles de PDFs
+generar el Excel tardaba más que contar las páginas. Aquí las filas se
+escriben a medida que llegan los resultados, con estilos con nombre
+(NamedStyle) registrados una sola vez y compartidos por todas las celdas,
+de modo que la memoria se mantiene plana y el tiempo crece linealmente.
+
+El modo write_only no admite celdas combinadas: la fila de cada blog
+aplica el mismo estilo a todas las columnas, con idéntico resultado visual.
+"""
+
+from datetime import datetime
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
+
+from lib.almacen import ESTADOS, COLUMNAS_RESUMEN
+from lib.pdf_rapido import CAMPOS_METADATOS
+from lib.rendimiento import CAMPOS_RENDIMIENTO
+
+_BORDE_FINO = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
+_GRIS = PatternFill(start_color="E7E6E6", end_color="E7E6E6", fill_type="solid")
+_CENTRO = Alignment(horizontal="center")
+
+ESTILOS = [
+    NamedStyle(
+        name="pc_encabezado",
+        font=Font(bold=True, size=12, color="FFFFFF"),
+        fill=PatternFill(start_color="2E5090", end_color="2E5090", fill_type="solid"),
+        alignment=Alignment(horizontal="center", vertical="center"),
+        border=_BORDE_FINO,
+    ),
+    NamedStyle(
+        name="pc_blog",
+        font=Font(bold=True, size=11, color="FFFFFF"),
+        fill=PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid"),
+        alignment=Alignment(horizontal="left", vertical="center"),
+    ),
+    NamedStyle(name="pc_centrado", alignment=_CENTRO),
+    NamedStyle(name="pc_subtotal", font=Font(bold=True, italic=True)),
+    NamedStyle(name="pc_subtotal_valor", font=Font(bold=True, italic=True),
+               fill=_GRIS, alignment=_CENTRO),
+    NamedStyle(name="pc_subtotal_nota", font=Font(italic=True), alignment=_CENTRO),
+    NamedStyle(name="pc_total", font=Font(bold=True, size=11)),
+    NamedStyle(name="pc_total_valor", font=Font(bold=True, size=11),
+               fill=_GRIS, alignment=_CENTRO),
+    NamedStyle(name="pc_total_nota", font=Font(bold=True, size=11), alignment=_CENTRO),
+    NamedStyle(name="pc_titulo", font=Font(bold=True, size=14)),
+]
+
+# Columnas de --metadata: (encabezado, ancho), en el orden de CAMPOS_METADATOS
+COLUMNAS_METADATOS = [
+    ("Tamaño (bytes)", 15),
+    ("Versión PDF", 12),
+    ("Cifrado", 10),
+    ("Linealizado", 12),
+    ("Título", 50),
+    ("Autor", 30),
+    ("Fecha de Creación", 20),
+]
+
+# Columnas de --stats, en el orden de CAMPOS_RENDIMIENTO
+COLUMNAS_RENDIMIENTO = [
+    ("Tiempo (s)", 12),
+    ("Bytes Leídos", 14),
+]
+
+
+class EscritorExcel:
+    """
+    Reporte Excel escrito fila a fila.
+
+    Uso:
+        escritor = EscritorExcel(archivo, solo_index)
+        escritor.iniciar_blog("axiomata")
+        escritor.agregar_fila("posts/a/index.pdf", 12, "OK")
+        escritor.cerrar_blog()
+        escritor.guardar()
+    """
+
+    def __init__(self, archivo_salida: str, solo_index: bool, metadatos: bool = False,
+                 rendimiento: bool = False):
+        self.archivo_salida = archivo_salida
+        self.solo_index = solo_index
+        self.metadatos = metadatos
+        self.rendimiento = rendimiento
+        self.wb = Workbook(write_only=True)
+        for estilo in ESTILOS:
+            self.wb.add_named_style(estilo)
+
+        encabezados = [("Blog", 25), ("Ruta del Archivo", 70),
+                       ("Número de Páginas", 18), ("Estado", 15), ("Duplicado de", 45)]
+        if metadatos:
+            encabezados += COLUMNAS_METADATOS
+        if rendimiento:
+            encabezados += COLUMNAS_RENDIMIENTO
+        self._num_columnas = len(encabezados)
+
+        self.ws = self.wb.create_sheet("Conteo de Páginas")
+        for i, (_, ancho) in enumerate(encabezados, 1):
+            self.ws.column_dimensions[get_column_letter(i)].width = ancho
+
+        self.total_blogs = 0
+        self.total_archivos = 0
+        self.total_paginas = 0
+        self.archivos_duplicados = 0
+        self.paginas_duplicadas = 0
+        self._blog = None
+        self._archivos_blog = 0
+        self._paginas_blog = 0
+
+        self.ws.append([self._celda(texto, "pc_encabezado") for texto, _ in encabezados])
+
+    def _celda(self, valor, estilo: str):
+        celda = WriteOnlyCell(self.ws, value=valor)
+        celda.style = estilo
+        return celda
+
+    def iniciar_blog(self, blog: str):
+        """Escribe la fila de encabezado de un blog."""
+        self._blog = blog
+        self._archivos_blog = 0
+        self._paginas_blog = 0
+        self.total_blogs += 1
+        self.ws.append([self._celda(blog.upper(), "pc_blog")] +
+                       [self._celda(None, "pc_blog") for _ in range(self._num_columnas - 1)])
+
+    def agregar_fila(self, ruta: str, paginas: int, estado: str, detalles: dict = None,
+                     duplicado_de: str = None):
+        """Escribe el resultado de un PDF del blog actual."""
+        paginas = paginas if estado == "OK" else 0
+        fila = [
+            "",
+            ruta,
+            self._celda(paginas, "pc_centrado"),
+            self._celda(estado, "pc_centrado"),
+            duplicado_de,
+        ]
+        if duplicado_de:
+            self.archivos_duplicados += 1
+            self.paginas_duplicadas += paginas
+        if self.metadatos:
+            for campo in CAMPOS_METADATOS:
+                valor = (detalles or {}).get(campo)
+                if isinstance(valor, bool):
+                    valor = "Sí" if valor else "No"
+                fila.append(self._celda(valor, "pc_centrado") if campo not in ("titulo", "autor")
+                            else valor)
+        if self.rendimiento:
+            fila += [self._celda((detalles or {}).get(campo), "pc_centrado")
+                     for campo in CAMPOS_RENDIMIENTO]
+        self.ws.append(fila)
+        self._archivos_blog += 1
+        self._paginas_blog += paginas
+
+    def cerrar_blog(self):
+        """Escribe el subtotal del blog actual y una fila de separación."""
+        self.ws.append([
+            "",
+            self._celda(f"SUBTOTAL {self._blog}", "pc_subtotal"),
+            self._celda(self._paginas_blog, "pc_subtotal_valor"),
+            self._celda(f"{self._archivos_blog} archivos", "pc_subtotal_nota"),
+        ])
+        self.ws.append([])
+        self.total_archivos += self._archivos_blog
+        self.total_paginas += self._paginas_blog
+        self._blog = None
+
+    def agregar_hoja_cambios(self, cambios: list):
+        """Escribe la hoja 'Cambios' (--delta); llamar antes de guardar()."""
+        hoja = self.wb.create_sheet("Cambios")
+        for columna, ancho in zip("ABCDEFG", (14, 25, 70, 16, 16, 14, 14)):
+            hoja.column_dimensions[columna].width = ancho
+        hoja.append([self._celda(texto, "pc_encabezado") for texto in
+                     ("Cambio", "Blog", "Ruta del Archivo", "Páginas Antes",
+                      "Páginas Ahora", "Estado Antes", "Estado Ahora")])
+        for cambio in cambios:
+            hoja.append(list(cambio.values()))
+
+    def agregar_hoja_rendimiento(self, fases: dict, por_blog: list, lentos: list):
+        """Escribe la hoja 'Rendimiento' (--stats); llamar antes de guardar()."""
+        hoja = self.wb.create_sheet("Rendimiento")
+        for columna, ancho in zip("ABCDEFGH", (25, 70, 14, 14, 16, 16, 14, 14)):
+            hoja.column_dimensions[columna].width = ancho
+
+        hoja.append([self._celda("Fases", "pc_titulo")])
+        hoja.append([self._celda(texto, "pc_encabezado") for texto in ("Fase", "Segundos")])
+        for fase, segundos in fases.items():
+            hoja.append([fase, round(segundos, 3)])
+        hoja.append([])
+
+        hoja.append([self._celda("Rendimiento por Blog", "pc_titulo")])
+        hoja.append([self._celda(texto, "pc_encabezado") for texto in
+                     ("Blog", "Archivos", "Analizados", "Páginas", "Análisis (s)",
+                      "Reloj (s)", "Archivos/s", "MB Leídos")])
+        for fila in por_blog:
+            hoja.append([fila["blog"], fila["archivos"], fila["analizados"], fila["paginas"],
+                         round(fila["segundos_analisis"], 3), round(fila["segundos_reloj"], 3),
+                         round(fila["archivos_s"], 1) if fila["archivos_s"] else None,
+                         round(fila["bytes_leidos"] / 1e6, 2)])
+        hoja.append([])
+
+        hoja.append([self._celda("PDFs Más Lentos", "pc_titulo")])
+        hoja.append([self._celda(texto, "pc_encabezado") for texto in
+                     ("Blog", "Ruta del Archivo", "Tiempo (s)", "Bytes Leídos", "Páginas", "Estado")])
+        for medicion in lentos:
+            hoja.append([medicion.blog, medicion.ruta, round(medicion.segundos, 4),
+                         medicion.bytes_leidos, medicion.paginas, medicion.estado])
+
+    def agregar_hoja_resumen(self, resumenes: dict):
+        """Escribe la hoja 'Resumen' (ver AlmacenResultados.resumenes); llamar antes de guardar()."""
+        hoja = self.wb.create_sheet("Resumen")
+        for columna, ancho in zip("ABCDEFGHIJK", (25, 20, 12, 12, 12, 18, 10, 10, 10, 10, 10)):
+            hoja.column_dimensions[columna].width = ancho
+        metricas = ("Archivos", "Páginas", "MB", "Última Modificación") + ESTADOS
+
+        def valores(fila: dict) -> list:
+            return [fila["archivos"], fila["paginas"], round(fila["bytes"] / 1e6, 2),
+                    fila["ultima_modificacion"]] + [fila[c] for c in COLUMNAS_RESUMEN[-len(ESTADOS):]]
+
+        for titulo, nivel, claves in (("Por Blog", "blog", ("Blog",)),
+                                      ("Por Sección", "seccion", ("Blog", "Sección")),
+                                      ("Por Año", "anio", ("Año",))):
+            hoja.append([self._celda(titulo, "pc_titulo")])
+            hoja.append([self._celda(texto, "pc_encabezado") for texto in claves + metricas])
+            for fila in resumenes[nivel]:
+                clave = {"blog": [fila["blog"]], "seccion": [fila["blog"], fila["seccion"]],
+                         "anio": [fila["anio"]]}[nivel]
+                hoja.append(clave + valores(fila))
+            for total in resumenes["total"]:
+                hoja.append([self._celda("TOTAL", "pc_total")] + [None] * (len(claves) - 1)
+                            + [self._celda(v, "pc_total_valor") for v in valores(total)])
+            hoja.append([])
+
+    def guardar(self):
+        """Escribe el total general y la hoja de información, y guarda el archivo."""
+        self.ws.append([
+            "",
+            self._celda("TOTAL GENERAL", "pc_total"),
+            self._celda(self.total_paginas, "pc_total_valor"),
+            self._celda(f"{self.total_archivos} archivos", "pc_total_nota"),
+        ])
+        if self.archivos_duplicados:
+            self.ws.append([
+                "",
+                self._celda("TOTAL SIN DUPLICADOS", "pc_total"),
+                self._celda(self.total_paginas - self.paginas_duplicadas, "pc_total_valor"),
+                self._celda(f"{self.total_archivos - self.archivos_duplicados} archivos",
+                            "pc_total_nota"),
+            ])
+
+        info = self.wb.create_sheet("Información")
+        info.append([self._celda("Información del Reporte", "pc_titulo")])
+        info.append([])
+        info.append(["Fecha de generación:", datetime.now().strftime("%d/%m/%Y %H:%M:%S")])
+        info.append(["Tipo de búsqueda:", "Solo index.pdf" if self.solo_index else "Todos los PDFs"])
+        info.append(["Total de blogs procesados:", self.total_blogs])
+        info.append(["Total de archivos:", self.total_archivos])
+        info.append(["Total de páginas:", self.total_paginas])
+        info.append(["Archivos duplicados:", self.archivos_duplicados])
+        info.append(["Páginas sin duplicados:", self.total_paginas - self.paginas_duplicadas])
+        info.append(["Generado por:", "Edison Achalma - PDF Page Counter"])
+
+        self.wb.save(self.archivo_salida)
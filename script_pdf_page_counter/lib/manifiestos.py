@@ -0,0 +1,180 @@
+"""
+Descubrimiento guiado por los manifiestos de Quarto (--discovery manifest).
+
+Recorrer _site entero para encontrar los index.pdf visita cada figura,
+cada archivo de site_libs y cada índice de búsqueda, cuando Quarto ya deja
+escrito qué páginas generó:
+
+  search.json     lista de secciones con su 'href' (posts/a/index.html#intro)
+  listings.json   páginas de cada listado ('items': /posts/a/index.html)
+  sitemap.xml     URL absolutas (<loc>https://sitio/posts/a/index.html</loc>)
+
+Cada página es un candidato: el index.pdf de su directorio (o el PDF
+enlazado directamente). Solo se hace stat() de esos candidatos, así que el
+coste crece con el número de posts y no con el de archivos del sitio.
+
+Los blogs de website-achalma son subdirectorios de un único sitio: si el
+_site del blog no tiene manifiestos se buscan en sus ancestros hasta el
+directorio _site, y se conservan solo las páginas bajo el blog.
+
+Un sitio sin manifiestos devuelve None y el llamador recorre el disco. Los
+borradores y las páginas excluidas de la búsqueda no aparecen en los
+manifiestos: --discovery audit recorre el disco y los informa.
+"""
+
+import json
+import logging
+import os
+import posixpath
+import re
+import stat
+from typing import Iterable, Iterator, List, Optional, Set
+from urllib.parse import unquote, urlsplit
+
+from lib.descubrimiento import NOMBRE_INDEX, EntradaRuta, _excluido
+
+avisos = logging.getLogger(__name__)
+
+ARCHIVOS_MANIFIESTO = ("search.json", "listings.json", "sitemap.xml")
+_RE_LOC = re.compile(r"<loc>\s*([^<\s]+)\s*</loc>")
+
+
+def _normalizar(href: str) -> Optional[str]:
+    """Ruta relativa al sitio, sin ancla ni consulta; None si sale del sitio."""
+    ruta = posixpath.normpath(unquote(urlsplit(href).path).lstrip("/") or ".")
+    if ruta == ".." or ruta.startswith("../"):
+        return None
+    return ruta + "/" if href.split("#")[0].split("?")[0].endswith("/") else ruta
+
+
+def _rutas_search(ruta: str) -> Iterator[str]:
+    with open(ruta, encoding="utf-8") as f:
+        for entrada in json.load(f):
+            if isinstance(entrada, dict) and isinstance(entrada.get("href"), str):
+                yield entrada["href"]
+
+
+def _rutas_listings(ruta: str) -> Iterator[str]:
+    with open(ruta, encoding="utf-8") as f:
+        for listado in json.load(f):
+            if isinstance(listado, dict):
+                yield from (item for item in listado.get("items", ()) if isinstance(item, str))
+
+
+def _rutas_sitemap(ruta: str, directorio: str) -> Iterator[str]:
+    """
+    Rutas de las <loc> relativas al sitio.
+
+    El sitemap lleva la URL pública (site-url puede incluir un prefijo,
+    https://x.org/blog/…): el prefijo se deduce de la primera URL cuyo
+    sufijo existe en disco y se quita de todas.
+    """
+    with open(ruta, encoding="utf-8") as f:
+        rutas = [unquote(urlsplit(loc).path) for loc in _RE_LOC.findall(f.read())]
+    prefijo = None
+    for url in rutas:
+        partes = url.strip("/").split("/")
+        for i in range(len(partes)):
+            if os.path.exists(os.path.join(directorio, *partes[i:])):
+                prefijo = "/".join(partes[:i])
+                break
+        if prefijo is not None:
+            break
+    if prefijo is None:
+        return
+    for url in rutas:
+        url = url.lstrip("/")
+        # Solo en el límite de un segmento: el prefijo 'blog' no toma 'blog-old/…'
+        if not prefijo or url == prefijo or url.startswith(prefijo + "/"):
+            yield url[len(prefijo):]
+
+
+def paginas_manifiesto(sitio: str) -> Optional[Set[str]]:
+    """
+    Páginas y PDFs que listan los manifiestos del sitio.
+
+    Returns:
+        Rutas relativas a 'sitio' (con '/' final en las URL de directorio),
+        o None si ni el sitio ni sus ancestros hasta _site tienen manifiestos
+    """
+    directorio = os.path.abspath(sitio)
+    while True:
+        presentes = [nombre for nombre in ARCHIVOS_MANIFIESTO
+                     if os.path.isfile(os.path.join(directorio, nombre))]
+        if presentes or os.path.basename(directorio) == "_site" \
+                or os.path.dirname(directorio) == directorio:
+            break
+        directorio = os.path.dirname(directorio)
+    if not presentes:
+        return None
+
+    hrefs = []
+    for nombre in presentes:
+        ruta = os.path.join(directorio, nombre)
+        try:
+            if nombre == "search.json":
+                hrefs += _rutas_search(ruta)
+            elif nombre == "listings.json":
+                hrefs += _rutas_listings(ruta)
+            else:
+                hrefs += _rutas_sitemap(ruta, directorio)
+        except (OSError, ValueError) as e:       # manifiesto dañado: se usan los demás
+            avisos.warning("   ⚠️  Manifiesto ilegible: %s (%s)", ruta, e)
+
+    # Solo las páginas bajo el blog (website-achalma/_site/blog), relativas a él
+    base = os.path.relpath(os.path.abspath(sitio), directorio).replace(os.sep, "/")
+    base = "" if base == "." else base + "/"
+    paginas = set()
+    for href in hrefs:
+        ruta = _normalizar(href)
+        if ruta is not None and (ruta + "/").startswith(base):
+            paginas.add(ruta[len(base):])
+    return paginas
+
+
+def candidatos_index(paginas: Iterable[str], excluidos: Iterable[str] = ()) -> List[str]:
+    """
+    index.pdf que corresponderían a cada página, en el orden de iterar_pdfs.
+
+    Args:
+        paginas: Rutas devueltas por paginas_manifiesto
+        excluidos: Patrones de directorio que el recorrido poda
+
+    Returns:
+        Rutas relativas (con el separador del sistema), sin repetir
+    """
+    excluidos = tuple(excluidos)
+    candidatos = set()
+    for pagina in paginas:
+        if pagina.endswith("/") or pagina in ("", "."):
+            directorio = pagina.rstrip("/")
+        elif posixpath.basename(pagina) == NOMBRE_INDEX:
+            directorio = posixpath.dirname(pagina)
+        elif pagina.endswith(".html"):
+            directorio = posixpath.dirname(pagina)
+        else:
+            continue
+        partes = [p for p in directorio.split("/") if p and p != "."]
+        if any(_excluido(parte, excluidos) for parte in partes):
+            continue
+        candidatos.add(tuple(partes) + (NOMBRE_INDEX,))
+    # Por componentes: el mismo orden que el recorrido en profundidad por nombre
+    return [os.path.join(*partes) for partes in sorted(candidatos)]
+
+
+def iterar_candidatos(sitio: str, candidatos: Iterable[str]) -> Iterator[EntradaRuta]:
+    """Produce los candidatos que existen como archivo regular (un stat() por candidato)."""
+    for relativa in candidatos:
+        ruta = os.path.join(sitio, relativa)
+        try:
+            st = os.stat(ruta, follow_symlinks=False)
+        except OSError:
+            continue                              # la página no tiene PDF
+        if stat.S_ISREG(st.st_mode):
+            yield EntradaRuta(ruta, st)
+
+
+def candidatos_manifiesto(sitio: str, excluidos: Iterable[str] = ()) -> Optional[List[str]]:
+    """index.pdf candidatos del sitio según sus manifiestos, o None si no tiene."""
+    paginas = paginas_manifiesto(sitio)
+    return None if paginas is None else candidatos_index(paginas, excluidos)
@@ -0,0 +1,707 @@
+"""
+Motor rápido de conteo de páginas (--engine fast).
+
+PdfReader construye el documento completo y recorre todo el árbol de
+páginas solo para devolver len(reader.pages). La respuesta ya está escrita
+en el propio PDF: el diccionario /Pages al que apunta /Root guarda el total
+en /Count, y los PDF linealizados lo repiten como /N en el primer objeto.
+
+Este módulo mapea el archivo con mmap y lee únicamente lo necesario:
+  1. Diccionario de linealización (primer KB): /N si /L coincide con el
+     tamaño del archivo (sin actualizaciones incrementales posteriores).
+  2. startxref al final del archivo → tabla xref clásica o xref stream,
+     siguiendo la cadena /Prev de las actualizaciones incrementales.
+  3. /Root → /Pages → /Count, resolviendo referencias indirectas incluso
+     dentro de object streams (FlateDecode).
+
+Si el mmap no cabe en el espacio de direcciones (un PDF de varios GB
+bajo el RLIMIT_AS de --max-memory), el archivo se lee por bloques con
+os.pread: la E/S es la misma, solo cambia cómo se accede a ella.
+
+Son unos pocos KB de E/S por archivo. Si la estructura está rota (offsets
+desplazados, filtros no soportados, object streams cifrados) se lanza
+PDFEstructuraError y el llamador decide si recurrir a PyPDF2, que sabe
+reconstruir la tabla xref.
+
+analizar_pdf_rapido() devuelve además los bytes examinados (--stats) y
+los metadatos (--metadata) que salen de esa misma lectura: tamaño,
+versión de la cabecera o del catálogo, /Encrypt del trailer,
+diccionario de linealización y /Title, /Author y /CreationDate del
+diccionario /Info.
+"""
+
+import mmap
+import os
+import re
+import zlib
+from typing import Dict, NamedTuple, Optional, Tuple
+
+# Bytes leídos al inicio (linealización) y al final (startxref)
+VENTANA_INICIO = 1024
+VENTANA_FINAL = 2048
+# Lectura sin mmap: tamaño de bloque leído y ventana para las expresiones regulares
+TAMANO_BLOQUE = 64 * 1024
+VENTANA_PATRON = 512
+# Anidamiento máximo de arrays/diccionarios (los PDF reales no pasan de unos pocos)
+PROFUNDIDAD_MAXIMA = 64
+
+_ESPACIOS = b" \t\r\n\f\x00"
+_DELIMITADORES = b"()<>[]{}/%"
+_RE_STARTXREF = re.compile(rb"startxref\s+(\d+)")
+_RE_OBJ = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj")
+_RE_ENTRADA_XREF = re.compile(rb"(\d{10})\s(\d{5})\s([nf])")
+_RE_SUBSECCION = re.compile(rb"\s*(\d+)\s+(\d+)")
+_RE_VERSION = re.compile(rb"%PDF-(\d\.\d)")
+_RE_FECHA = re.compile(r"D?:?(\d{4})(\d{2})?(\d{2})?(\d{2})?(\d{2})?(\d{2})?")
+_RE_NO_HEX = re.compile(rb"[^0-9A-Fa-f]")
+_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f",
+            b"(": b"(", b")": b")", b"\\": b"\\"}
+
+# Campos de analizar_pdf_rapido(), en el orden de las columnas del reporte
+CAMPOS_METADATOS = ("tamano", "version", "cifrado", "linealizado",
+                    "titulo", "autor", "fecha_creacion")
+
+
+class PDFEstructuraError(Exception):
+    """La estructura del PDF no permite resolver /Count sin reparar el archivo."""
+
+
+class Ref(NamedTuple):
+    """Referencia indirecta 'num gen R'."""
+    num: int
+    gen: int
+
+
+class _Desplazada:
+    """Coincidencia sobre una ventana, con posiciones relativas al archivo."""
+
+    def __init__(self, coincidencia: re.Match, base: int) -> None:
+        self._m = coincidencia
+        self._base = base
+
+    def group(self, *grupos):
+        return self._m.group(*grupos)
+
+    def end(self, grupo: int = 0) -> int:
+        return self._m.end(grupo) + self._base
+
+
+class _ArchivoPorBloques:
+    """
+    Lo que el analizador usa de un mmap (len, cortes, find y coincidencias
+    de patrones) sobre os.pread, para archivos que no caben en el
+    espacio de direcciones. Guarda el último bloque leído porque el
+    analizador léxico avanza byte a byte.
+    """
+
+    def __init__(self, archivo) -> None:
+        self._fd = os.dup(archivo.fileno())
+        self._tamano = os.fstat(self._fd).st_size
+        self._inicio_bloque = -1
+        self._bloque = b""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        os.close(self._fd)
+
+    def __len__(self) -> int:
+        return self._tamano
+
+    def __getitem__(self, corte: slice) -> bytes:
+        inicio, fin, _ = corte.indices(self._tamano)
+        if fin <= inicio:
+            return b""
+        base = inicio - inicio % TAMANO_BLOQUE
+        if fin - base <= TAMANO_BLOQUE:           # dentro de un solo bloque
+            if base != self._inicio_bloque:
+                self._bloque = os.pread(self._fd, TAMANO_BLOQUE, base)
+                self._inicio_bloque = base
+            return self._bloque[inicio - base:fin - base]
+        return os.pread(self._fd, fin - inicio, inicio)
+
+    def find(self, buscado: bytes, inicio: int = 0) -> int:
+        solape = len(buscado) - 1
+        while inicio < self._tamano:
+            trozo = os.pread(self._fd, TAMANO_BLOQUE, inicio)
+            encontrado = trozo.find(buscado)
+            if encontrado >= 0:
+                return inicio + encontrado
+            if len(trozo) < TAMANO_BLOQUE:
+                break
+            inicio += TAMANO_BLOQUE - solape
+        return -1
+
+    def coincidir(self, patron: re.Pattern, pos: int) -> Optional[_Desplazada]:
+        m = patron.match(self[pos:pos + VENTANA_PATRON])
+        return _Desplazada(m, pos) if m else None
+
+
+def _coincidir(patron: re.Pattern, buf, pos: int):
+    """patron.match(buf, pos) también para _ArchivoPorBloques."""
+    if isinstance(buf, _ArchivoPorBloques):
+        return buf.coincidir(patron, pos)
+    return patron.match(buf, pos)
+
+
+# ========================================================================
+# ANALIZADOR LÉXICO MÍNIMO
+# ========================================================================
+
+def _saltar_espacios(buf, pos: int) -> int:
+    """Avanza sobre espacios en blanco y comentarios."""
+    n = len(buf)
+    while pos < n:
+        c = buf[pos:pos + 1]
+        if c in (b" ", b"\t", b"\r", b"\n", b"\f", b"\x00"):
+            pos += 1
+        elif c == b"%":
+            while pos < n and buf[pos:pos + 1] not in (b"\r", b"\n"):
+                pos += 1
+        else:
+            break
+    return pos
+
+
+def _leer_palabra(buf, pos: int) -> Tuple[bytes, int]:
+    """Lee un token regular (número, palabra clave) hasta un delimitador."""
+    inicio = pos
+    n = len(buf)
+    while pos < n:
+        c = buf[pos:pos + 1]
+        if c in _ESPACIOS or c in _DELIMITADORES:
+            break
+        pos += 1
+    return bytes(buf[inicio:pos]), pos
+
+
+def _decodificar_literal(crudo: bytes) -> bytes:
+    """Resuelve las secuencias de escape de una cadena literal (...)."""
+    if b"\\" not in crudo:
+        return crudo
+    salida = bytearray()
+    i, n = 0, len(crudo)
+    while i < n:
+        c = crudo[i:i + 1]
+        i += 1
+        if c != b"\\" or i >= n:
+            salida += c
+            continue
+        c = crudo[i:i + 1]
+        if c in _ESCAPES:
+            salida += _ESCAPES[c]
+            i += 1
+        elif c in b"01234567":
+            fin = i
+            while fin < min(i + 3, n) and crudo[fin:fin + 1] in b"01234567":
+                fin += 1
+            salida.append(int(crudo[i:fin], 8) & 0xFF)
+            i = fin
+        elif c in (b"\r", b"\n"):               # continuación de línea
+            i += 2 if crudo[i:i + 2] == b"\r\n" else 1
+        else:
+            salida += c
+            i += 1
+    return bytes(salida)
+
+
+def _leer_objeto(buf, pos: int, nivel: int = 0):
+    """
+    Lee un objeto PDF directo a partir de pos.
+
+    Devuelve (valor, nueva_pos). Los diccionarios son dict con claves
+    "/Nombre", los nombres son str "/Nombre", las cadenas bytes y las
+    referencias indirectas Ref. Más de PROFUNDIDAD_MAXIMA arrays o
+    diccionarios anidados se consideran un archivo dañado.
+    """
+    if nivel > PROFUNDIDAD_MAXIMA:
+        raise PDFEstructuraError("Objetos anidados en exceso")
+    pos = _saltar_espacios(buf, pos)
+    c = buf[pos:pos + 1]
+
+    if c == b"<":
+        if buf[pos + 1:pos + 2] == b"<":
+            resultado = {}
+            pos += 2
+            while True:
+                pos = _saltar_espacios(buf, pos)
+                if buf[pos:pos + 2] == b">>":
+                    return resultado, pos + 2
+                clave, pos = _leer_objeto(buf, pos, nivel + 1)
+                if not isinstance(clave, str):
+                    raise PDFEstructuraError("Clave de diccionario no válida")
+                valor, pos = _leer_objeto(buf, pos, nivel + 1)
+                resultado[clave] = valor
+        fin = buf.find(b">", pos)
+        if fin < 0:
+            raise PDFEstructuraError("Cadena hexadecimal sin cerrar")
+        digitos = _RE_NO_HEX.sub(b"", bytes(buf[pos + 1:fin]))
+        if len(digitos) % 2:
+            digitos += b"0"
+        return bytes.fromhex(digitos.decode("ascii")), fin + 1
+
+    if c == b"[":
+        resultado = []
+        pos += 1
+        while True:
+            pos = _saltar_espacios(buf, pos)
+            if buf[pos:pos + 1] == b"]":
+                return resultado, pos + 1
+            valor, pos = _leer_objeto(buf, pos, nivel + 1)
+            resultado.append(valor)
+
+    if c == b"(":
+        nivel, pos, inicio = 1, pos + 1, pos + 1
+        while nivel:
+            if pos >= len(buf):
+                raise PDFEstructuraError("Cadena literal sin cerrar")
+            ch = buf[pos:pos + 1]
+            if ch == b"\\":
+                pos += 1
+            elif ch == b"(":
+                nivel += 1
+            elif ch == b")":
+                nivel -= 1
+            pos += 1
+        return _decodificar_literal(bytes(buf[inicio:pos - 1])), pos
+
+    if c == b"/":
+        palabra, pos = _leer_palabra(buf, pos + 1)
+        return "/" + palabra.decode("latin-1"), pos
+
+    palabra, pos = _leer_palabra(buf, pos)
+    if not palabra:
+        raise PDFEstructuraError(f"Token inesperado en el byte {pos}")
+    if palabra == b"true":
+        return True, pos
+    if palabra == b"false":
+        return False, pos
+    if palabra == b"null":
+        return None, pos
+    try:
+        numero = int(palabra)
+    except ValueError:
+        try:
+            return float(palabra), pos
+        except ValueError:
+            return palabra, pos                   # palabra clave (obj, stream, R…)
+
+    # ¿Es el inicio de una referencia "num gen R"?
+    p = _saltar_espacios(buf, pos)
+    gen, p2 = _leer_palabra(buf, p)
+    if gen.isdigit():
+        p3 = _saltar_espacios(buf, p2)
+        if buf[p3:p3 + 1] == b"R":
+            return Ref(numero, int(gen)), p3 + 1
+    return numero, pos
+
+
+# ========================================================================
+# STREAMS
+# ========================================================================
+
+def _deshacer_predictor(datos: bytes, columnas: int) -> bytes:
+    """Invierte los predictores PNG (/Predictor >= 10) fila por fila."""
+    ancho = columnas + 1
+    if len(datos) % ancho:
+        raise PDFEstructuraError("Datos con predictor PNG de longitud inválida")
+    salida = bytearray()
+    anterior = bytearray(columnas)
+    for inicio in range(0, len(datos), ancho):
+        tipo = datos[inicio]
+        fila = bytearray(datos[inicio + 1:inicio + ancho])
+        for i in range(columnas):
+            izq = fila[i - 1] if i else 0
+            arriba = anterior[i]
+            if tipo == 1:
+                fila[i] = (fila[i] + izq) & 0xFF
+            elif tipo == 2:
+                fila[i] = (fila[i] + arriba) & 0xFF
+            elif tipo == 3:
+                fila[i] = (fila[i] + (izq + arriba) // 2) & 0xFF
+            elif tipo == 4:
+                esquina = anterior[i - 1] if i else 0
+                p = izq + arriba - esquina
+                pa, pb, pc = abs(p - izq), abs(p - arriba), abs(p - esquina)
+                pred = izq if pa <= pb and pa <= pc else (arriba if pb <= pc else esquina)
+                fila[i] = (fila[i] + pred) & 0xFF
+            elif tipo != 0:
+                raise PDFEstructuraError(f"Predictor PNG desconocido: {tipo}")
+        salida += fila
+        anterior = fila
+    return bytes(salida)
+
+
+def _leer_stream(buf, dic: dict, pos: int) -> Tuple[bytes, int]:
+    """Devuelve los datos decodificados del stream que empieza tras 'dic' y dónde acaba."""
+    pos = _saltar_espacios(buf, pos)
+    if buf[pos:pos + 6] != b"stream":
+        raise PDFEstructuraError("Se esperaba 'stream'")
+    pos += 6
+    if buf[pos:pos + 2] == b"\r\n":
+        pos += 2
+    elif buf[pos:pos + 1] in (b"\n", b"\r"):
+        pos += 1
+
+    longitud = dic.get("/Length")
+    if not isinstance(longitud, int):           # indirecta o ausente
+        fin = buf.find(b"endstream", pos)
+        if fin < 0:
+            raise PDFEstructuraError("Stream sin 'endstream'")
+        longitud = fin - pos
+    datos = bytes(buf[pos:pos + longitud])
+    fin = pos + longitud
+
+    filtro = dic.get("/Filter")
+    if isinstance(filtro, list):
+        if len(filtro) > 1:
+            raise PDFEstructuraError("Cadenas de filtros no soportadas")
+        filtro = filtro[0] if filtro else None
+    if filtro is None:
+        return datos, fin
+    if filtro != "/FlateDecode":
+        raise PDFEstructuraError(f"Filtro no soportado: {filtro}")
+    try:
+        datos = zlib.decompressobj().decompress(datos)
+    except zlib.error as exc:
+        raise PDFEstructuraError(f"FlateDecode falló: {exc}") from exc
+
+    parametros = dic.get("/DecodeParms") or {}
+    if isinstance(parametros, list):
+        parametros = parametros[0] or {}
+    if parametros.get("/Predictor", 1) >= 10:
+        datos = _deshacer_predictor(datos, parametros.get("/Columns", 1))
+    return datos, fin
+
+
+# ========================================================================
+# DOCUMENTO
+# ========================================================================
+
+class _Documento:
+    """Vista perezosa de un PDF: xref, trailer y resolución de objetos."""
+
+    def __init__(self, buf) -> None:
+        self.buf = buf
+        # num → ("n", offset, generación) | ("c", num_objstm, índice) | ("f",)
+        self.xref: Dict[int, tuple] = {}
+        self.trailer: dict = {}
+        self._objstm: Dict[int, Tuple[bytes, list]] = {}
+        self.leidos = 0                           # bytes del archivo examinados (aprox.)
+        self._cargar_xref()
+
+    def _cargar_xref(self) -> None:
+        final = self.buf[max(0, len(self.buf) - VENTANA_FINAL):]
+        self.leidos += len(final)
+        coincidencias = list(_RE_STARTXREF.finditer(final))
+        if not coincidencias:
+            raise PDFEstructuraError("No se encontró 'startxref'")
+        offset = int(coincidencias[-1].group(1))
+
+        visitados = set()
+        while offset is not None:
+            if offset in visitados or offset >= len(self.buf):
+                raise PDFEstructuraError("Cadena /Prev inválida")
+            visitados.add(offset)
+            trailer, entradas = self._leer_seccion(offset)
+            if isinstance(trailer.get("/XRefStm"), int):
+                # Archivo híbrido: la tabla clásica marca como libres ("f") los
+                # objetos que solo describe el xref stream; ahí manda el stream
+                _, ocultas = self._leer_seccion(trailer["/XRefStm"])
+                for num, entrada in ocultas.items():
+                    if entradas.get(num, ("f",))[0] == "f":
+                        entradas[num] = entrada
+            for clave, valor in trailer.items():   # la sección más nueva gana
+                self.trailer.setdefault(clave, valor)
+            for num, entrada in entradas.items():
+                self.xref.setdefault(num, entrada)
+            offset = trailer.get("/Prev")
+
+        if not isinstance(self.trailer.get("/Root"), Ref):
+            raise PDFEstructuraError("Trailer sin /Root")
+
+    def _leer_seccion(self, offset: int) -> Tuple[dict, Dict[int, tuple]]:
+        """Lee una sección xref (tabla o stream) y devuelve (trailer, entradas)."""
+        pos = _saltar_espacios(self.buf, offset)
+        if self.buf[pos:pos + 4] == b"xref":
+            return self._leer_tabla(pos + 4)
+        return self._leer_xref_stream(offset)
+
+    def _leer_tabla(self, pos: int) -> Tuple[dict, Dict[int, tuple]]:
+        buf = self.buf
+        inicio_tabla = pos
+        entradas: Dict[int, tuple] = {}
+        while True:
+            pos = _saltar_espacios(buf, pos)
+            if buf[pos:pos + 7] == b"trailer":
+                trailer, fin = _leer_objeto(buf, pos + 7)
+                self.leidos += fin - inicio_tabla
+                return trailer, entradas
+            m = _coincidir(_RE_SUBSECCION, buf, pos)
+            if not m:
+                raise PDFEstructuraError("Tabla xref malformada")
+            inicio, cantidad = int(m.group(1)), int(m.group(2))
+            pos = m.end()
+            for num in range(inicio, inicio + cantidad):
+                e = _coincidir(_RE_ENTRADA_XREF, buf, _saltar_espacios(buf, pos))
+                if not e:
+                    raise PDFEstructuraError("Entrada xref malformada")
+                pos = e.end()
+                if e.group(3) == b"n":
+                    entradas.setdefault(num, ("n", int(e.group(1)), int(e.group(2))))
+                else:
+                    entradas.setdefault(num, ("f",))
+
+    def _leer_xref_stream(self, offset: int) -> Tuple[dict, Dict[int, tuple]]:
+        m = _coincidir(_RE_OBJ, self.buf, offset)
+        if not m:
+            raise PDFEstructuraError("startxref no apunta a una sección xref")
+        dic, pos = _leer_objeto(self.buf, m.end())
+        if not isinstance(dic, dict) or dic.get("/Type") != "/XRef":
+            raise PDFEstructuraError("startxref no apunta a una sección xref")
+        datos, fin = _leer_stream(self.buf, dic, pos)
+        self.leidos += fin - offset
+
+        anchos = dic.get("/W")
+        if not isinstance(anchos, list) or len(anchos) != 3:
+            raise PDFEstructuraError("xref stream sin /W válido")
+        indices = dic.get("/Index", [0, dic.get("/Size", 0)])
+        tam_fila = sum(anchos)
+        entradas: Dict[int, tuple] = {}
+        p = 0
+
+        def campo(ancho: int, defecto: int) -> int:
+            nonlocal p
+            if ancho == 0:
+                return defecto
+            valor = int.from_bytes(datos[p:p + ancho], "big")
+            p += ancho
+            return valor
+
+        for inicio, cantidad in zip(indices[0::2], indices[1::2]):
+            for num in range(inicio, inicio + cantidad):
+                if p + tam_fila > len(datos):
+                    raise PDFEstructuraError("xref stream truncado")
+                tipo = campo(anchos[0], 1)
+                c2 = campo(anchos[1], 0)
+                c3 = campo(anchos[2], 0)
+                if tipo == 1:
+                    entradas.setdefault(num, ("n", c2, c3))
+                elif tipo == 2:
+                    entradas.setdefault(num, ("c", c2, c3))
+                else:
+                    entradas.setdefault(num, ("f",))
+        return dic, entradas
+
+    def resolver(self, valor, profundidad: int = 0):
+        """Sigue referencias indirectas hasta obtener un objeto directo."""
+        while isinstance(valor, Ref):
+            if profundidad > 32:
+                raise PDFEstructuraError("Referencias circulares")
+            valor = self._objeto(valor)
+            profundidad += 1
+        return valor
+
+    def _objeto(self, ref: Ref):
+        num = ref.num
+        entrada = self.xref.get(num)
+        if entrada is None or entrada[0] == "f":
+            raise PDFEstructuraError(f"Objeto {num} ausente en xref")
+        if entrada[0] == "n":
+            # La generación de la referencia, la de xref y la de la cabecera
+            # 'num gen obj' deben coincidir: si no, el objeto fue reutilizado
+            m = _coincidir(_RE_OBJ, self.buf, entrada[1])
+            if not m or int(m.group(1)) != num or int(m.group(2)) != entrada[2]:
+                raise PDFEstructuraError(f"Offset incorrecto para el objeto {num}")
+            if ref.gen != entrada[2]:
+                raise PDFEstructuraError(f"Generación {ref.gen} del objeto {num} no vigente")
+            valor, fin = _leer_objeto(self.buf, m.end())
+            self.leidos += fin - entrada[1]
+            return valor
+        if ref.gen != 0:                          # los objetos comprimidos tienen generación 0
+            raise PDFEstructuraError(f"Generación {ref.gen} del objeto {num} no vigente")
+        return self._objeto_comprimido(entrada[1], entrada[2])
+
+    def _objeto_comprimido(self, num_stm: int, indice: int):
+        if "/Encrypt" in self.trailer:
+            raise PDFEstructuraError("Object streams cifrados")
+        if num_stm not in self._objstm:
+            entrada = self.xref.get(num_stm)
+            if entrada is None or entrada[0] != "n":
+                raise PDFEstructuraError(f"Object stream {num_stm} ausente")
+            m = _coincidir(_RE_OBJ, self.buf, entrada[1])
+            if not m or int(m.group(1)) != num_stm or int(m.group(2)) != entrada[2]:
+                raise PDFEstructuraError(f"Offset incorrecto para el objeto {num_stm}")
+            dic, pos = _leer_objeto(self.buf, m.end())
+            datos, fin = _leer_stream(self.buf, dic, pos)
+            self.leidos += fin - entrada[1]
+            primero = dic["/First"]
+            cabecera = datos[:primero].split()
+            offsets = [int(x) + primero for x in cabecera[1::2]]
+            self._objstm[num_stm] = (datos, offsets)
+        datos, offsets = self._objstm[num_stm]
+        valor, _ = _leer_objeto(datos, offsets[indice])
+        return valor
+
+
+def _diccionario_linealizado(buf) -> Optional[dict]:
+    """Devuelve el diccionario de linealización del primer objeto, si lo hay."""
+    inicio = buf[:VENTANA_INICIO]
+    if b"/Linearized" not in inicio:
+        return None
+    m = _RE_OBJ.search(inicio)
+    if not m:
+        return None
+    dic, _ = _leer_objeto(buf, m.end())
+    if not isinstance(dic, dict) or "/Linearized" not in dic:
+        return None
+    return dic
+
+
+def _paginas_linealizado(buf, dic: Optional[dict]) -> Optional[int]:
+    """Devuelve /N del diccionario de linealización si sigue siendo válido."""
+    # /L distinto del tamaño real = hubo actualizaciones incrementales
+    if dic is None or dic.get("/L") != len(buf) or not isinstance(dic.get("/N"), int):
+        return None
+    return dic["/N"]
+
+
+def texto_pdf(valor) -> Optional[str]:
+    """Decodifica una cadena de texto PDF (UTF-16BE con BOM, UTF-8 o PDFDocEncoding)."""
+    if not isinstance(valor, bytes):
+        return None
+    if valor.startswith(b"\xfe\xff"):
+        texto = valor[2:].decode("utf-16-be", errors="replace")
+    elif valor.startswith(b"\xef\xbb\xbf"):
+        texto = valor[3:].decode("utf-8", errors="replace")
+    else:
+        texto = valor.decode("latin-1")
+    return texto.replace("\x00", "").strip() or None
+
+
+def fecha_pdf(valor) -> Optional[str]:
+    """Convierte una fecha PDF (D:AAAAMMDDHHmmSS…) a 'AAAA-MM-DD HH:MM:SS'."""
+    texto = texto_pdf(valor) if isinstance(valor, bytes) else valor
+    m = _RE_FECHA.match(texto or "")
+    if not m:
+        return None
+    a, mes, d, h, mi, se = (g or defecto for g, defecto in
+                            zip(m.groups(), ("", "01", "01", "00", "00", "00")))
+    return f"{a}-{mes}-{d} {h}:{mi}:{se}"
+
+
+def _metadatos(buf, doc: Optional[_Documento], raiz: Optional[dict], lineal: Optional[dict]) -> dict:
+    """
+    Metadatos de la cabecera, el trailer y /Info ya cargados.
+
+    Un /Info o /Version ilegible deja el campo vacío sin invalidar el conteo;
+    con doc None (xref ilegible) solo se informa lo que está en la cabecera.
+    """
+    def resolver(dic, clave):
+        if doc is None:
+            return None
+        try:
+            return doc.resolver(dic.get(clave)) if isinstance(dic, dict) else None
+        except (PDFEstructuraError, LookupError, TypeError, ValueError, zlib.error):
+            return None
+
+    m = _coincidir(_RE_VERSION, buf, 0)
+    version = m.group(1).decode() if m else None
+    # /Version del catálogo prevalece si es posterior a la de la cabecera
+    version_raiz = resolver(raiz, "/Version")
+    if isinstance(version_raiz, str) and version_raiz[1:] > (version or ""):
+        version = version_raiz[1:]
+
+    cifrado = "/Encrypt" in doc.trailer if doc is not None else None
+    titulo = autor = creado = None
+    if doc is not None and not cifrado:       # las cadenas de /Info van cifradas
+        info = resolver(doc.trailer, "/Info")
+        titulo = texto_pdf(resolver(info, "/Title"))
+        autor = texto_pdf(resolver(info, "/Author"))
+        creado = fecha_pdf(resolver(info, "/CreationDate"))
+
+    return dict(zip(CAMPOS_METADATOS, (len(buf), version, cifrado, lineal is not None,
+                                       titulo, autor, creado)))
+
+
+def contar_paginas_rapido(ruta_pdf: str) -> int:
+    """
+    Devuelve el número de páginas leyendo solo la estructura del PDF.
+
+    Args:
+        ruta_pdf: Ruta al archivo PDF
+
+    Returns:
+        Número de páginas (/N de linealización o /Count del árbol)
+
+    Raises:
+        PDFEstructuraError: La estructura está dañada o no es soportada
+        OSError: El archivo no se puede abrir
+    """
+    return _analizar(ruta_pdf, False)[0]
+
+
+def analizar_pdf_rapido(ruta_pdf: str, con_metadatos: bool = True) -> Tuple[int, dict]:
+    """
+    Como contar_paginas_rapido, pero devuelve también los detalles de la lectura.
+
+    Args:
+        ruta_pdf: Ruta al archivo PDF
+        con_metadatos: Incluir los campos de CAMPOS_METADATOS (--metadata)
+
+    Returns:
+        (páginas, {"bytes_leidos": n, campo: valor...}); bytes_leidos es una
+        aproximación de lo examinado: ventanas, secciones xref y objetos resueltos
+
+    Raises:
+        PDFEstructuraError, OSError: como contar_paginas_rapido
+    """
+    return _analizar(ruta_pdf, con_metadatos)
+
+
+def _analizar(ruta_pdf: str, con_metadatos: bool) -> Tuple[int, dict]:
+    with open(ruta_pdf, "rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:                 # archivo vacío
+            raise PDFEstructuraError("Archivo vacío") from exc
+        except OSError:                           # ENOMEM: no cabe bajo RLIMIT_AS
+            buf = _ArchivoPorBloques(f)
+    with buf:
+        if buf[:5] != b"%PDF-":
+            raise PDFEstructuraError("Falta la cabecera %PDF-")
+        inicial = min(VENTANA_INICIO, len(buf))
+        try:
+            lineal = _diccionario_linealizado(buf)
+            total = _paginas_linealizado(buf, lineal)
+            if total is not None and not con_metadatos:
+                return total, {"bytes_leidos": inicial}
+
+            try:
+                doc = _Documento(buf)
+                raiz = doc.resolver(doc.trailer["/Root"])
+            except (PDFEstructuraError, KeyError):
+                if total is None:
+                    raise
+                # /N ya dio el conteo: los metadatos se limitan a la cabecera
+                detalles = _metadatos(buf, None, None, lineal)
+                detalles["bytes_leidos"] = inicial
+                return total, detalles
+            if total is None:
+                arbol = doc.resolver(raiz.get("/Pages")) if isinstance(raiz, dict) else None
+                if not isinstance(arbol, dict):
+                    raise PDFEstructuraError("/Root sin árbol /Pages")
+                total = doc.resolver(arbol.get("/Count"))
+            detalles = _metadatos(buf, doc, raiz, lineal) if con_metadatos else {}
+            detalles["bytes_leidos"] = min(inicial + doc.leidos, len(buf))
+        except (PDFEstructuraError, MemoryError):
+            raise                                 # MemoryError: el llamador lo cuenta como OOM
+        except Exception as exc:                  # RecursionError, OverflowError, zlib.error…
+            # Cualquier otro fallo del análisis es un archivo que este motor no
+            # entiende: con --engine auto se recurre a PyPDF2 en lugar de abortar
+            raise PDFEstructuraError(f"Estructura inesperada: {exc!r}") from exc
+
+    if not isinstance(total, int) or total < 0:
+        raise PDFEstructuraError("/Count ausente o no válido")
+    return total, detalles
@@ -0,0 +1,128 @@
+"""
+Línea de progreso por blog (--progress).
+
+Imprimir una línea formateada por PDF hace que, con --todos sobre sitios
+grandes (y más aún por SSH), la terminal se lleve una parte apreciable del
+tiempo. Aquí cada blog tiene una sola línea de estado — archivos, páginas,
+errores, archivos/s y ETA — que se reescribe en el sitio ('\\r') como mucho
+unas pocas veces por segundo; el detalle por PDF queda solo en el reporte.
+
+Si la salida no es una terminal (redirigida a un log o a cron), '\\r' solo
+ensuciaría el archivo: se escribe una línea normal cada INTERVALO_LOG
+segundos y la final de cada blog.
+
+El total de cada blog no se conoce hasta terminar de recorrerlo; la ETA usa
+el número de archivos esperado que le pase el llamador (p. ej. los de la
+ejecución anterior) y se omite si no lo hay.
+
+Los avisos de lib/ (logging) pasan por ManejadorAvisos, que los imprime
+encima de la línea de estado y la redibuja en lugar de partirla.
+"""
+
+import logging
+import sys
+import time
+from typing import TextIO
+
+INTERVALO_REFRESCO = 0.25     # segundos entre redibujados en una terminal
+INTERVALO_LOG = 10.0          # segundos entre líneas si la salida no es una terminal
+
+
+def _duracion(segundos: float) -> str:
+    minutos, segundos = divmod(int(segundos + 0.5), 60)
+    horas, minutos = divmod(minutos, 60)
+    return f"{horas}:{minutos:02d}:{segundos:02d}" if horas else f"{minutos}:{segundos:02d}"
+
+
+class LineaProgreso:
+    """
+    Línea de estado de un blog, limitada en frecuencia.
+
+    Uso:
+        progreso = LineaProgreso()
+        progreso.iniciar(esperados=120)
+        for ...:
+            progreso.avanzar(paginas, estado)
+        progreso.cerrar()
+    """
+
+    def __init__(self, salida: TextIO = None, intervalo: float = INTERVALO_REFRESCO):
+        self.salida = salida or sys.stdout
+        self.terminal = self.salida.isatty()
+        self.intervalo = intervalo if self.terminal else INTERVALO_LOG
+        self.esperados = None
+        self.archivos = self.paginas = self.errores = 0
+        self._inicio = self._ultimo = 0.0
+        self._activa = False                  # hay una línea '\r' a medio escribir
+
+    def iniciar(self, esperados: int = None):
+        """Empieza la línea de un blog; 'esperados' (si se conoce) permite la ETA."""
+        self.esperados = esperados
+        self.archivos = self.paginas = self.errores = 0
+        self._inicio = self._ultimo = time.monotonic()
+
+    def avanzar(self, paginas: int, estado: str):
+        """Anota un PDF contado y redibuja si pasó el intervalo."""
+        self.archivos += 1
+        if estado == "OK":
+            self.paginas += paginas
+        elif estado != "VACÍO":
+            self.errores += 1
+        ahora = time.monotonic()
+        if ahora - self._ultimo >= self.intervalo:
+            self._ultimo = ahora
+            self._escribir(self._texto(ahora, final=False), final=False)
+
+    def cerrar(self):
+        """Deja la línea final del blog (con el tiempo total en lugar de la ETA)."""
+        if self.archivos:
+            self._escribir(self._texto(time.monotonic(), final=True), final=True)
+
+    def _texto(self, ahora: float, final: bool) -> str:
+        transcurrido = ahora - self._inicio
+        tasa = self.archivos / transcurrido if transcurrido > 0 else 0.0
+        hechos = f"{self.archivos}/{self.esperados}" if self.esperados else str(self.archivos)
+        if final:
+            tiempo = f"⏱ {_duracion(transcurrido)}"
+        elif self.esperados and tasa and self.archivos < self.esperados:
+            tiempo = f"ETA {_duracion((self.esperados - self.archivos) / tasa)}"
+        else:
+            tiempo = "ETA —"
+        return (f"   {'✔' if final else '⏳'} {hechos} archivos | {self.paginas:,} páginas | "
+                f"{self.errores} errores | {tasa:,.1f} archivos/s | {tiempo}")
+
+    def avisar(self, texto: str):
+        """Imprime un aviso sin romper la línea de estado: la borra, escribe el aviso y la redibuja."""
+        if self._activa:
+            self.salida.write(f"\r{texto}\033[K\n")
+            self._escribir(self._texto(time.monotonic(), final=False), final=False)
+        else:
+            self.salida.write(texto + "\n")
+            self.salida.flush()
+
+    def _escribir(self, texto: str, final: bool):
+        if self.terminal:
+            self._activa = not final
+            # \033[K borra lo que quedara de una línea anterior más larga
+            self.salida.write(f"\r{texto}\033[K" + ("\n" if final else ""))
+        else:
+            self.salida.write(texto + "\n")
+        self.salida.flush()
+
+
+class ManejadorAvisos(logging.Handler):
+    """
+    Muestra los avisos de lib/ en la salida estándar, a través de la línea de
+    progreso si hay una (así no se mezclan con ella).
+    """
+
+    def __init__(self, progreso: LineaProgreso = None):
+        super().__init__()
+        self.progreso = progreso
+
+    def emit(self, registro: logging.LogRecord):
+        texto = self.format(registro)
+        if self.progreso is not None:
+            self.progreso.avisar(texto)
+        else:
+            print(texto)
@@ -0,0 +1,147 @@
+"""
+Mediciones de rendimiento de una ejecución (--stats).
+
+Dos niveles:
+
+  Fases     — segundos de reloj de descubrimiento, conteo, construcción
+              del reporte y guardado. El flujo es perezoso (el conteo tira
+              del descubrimiento), así que el Cronometro mide tiempo
+              exclusivo: al entrar en una fase anidada pausa la exterior y
+              las fases nunca se solapan; el resto es 'otros' (consola).
+  Archivos  — segundos de análisis y bytes leídos de cada PDF, medidos en
+              el proceso que lo abre (ver contar_paginas_pdf). Los aciertos
+              de caché no se analizan y quedan sin medición.
+
+Con esto se listan los PDF más lentos y el rendimiento de cada blog.
+"""
+
+import heapq
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+# Campos por PDF que añade --stats al reporte, tras los de --metadata
+CAMPOS_RENDIMIENTO = ("segundos", "bytes_leidos")
+FASES = ("descubrimiento", "conteo", "reporte", "guardado")
+
+
+class Cronometro:
+    """Segundos exclusivos por fase; las fases pueden anidarse."""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.segundos: Dict[str, float] = defaultdict(float)
+        self._pila: List[str] = []
+        self._marca = self.inicio
+
+    def _anotar(self) -> float:
+        ahora = time.perf_counter()
+        if self._pila:
+            self.segundos[self._pila[-1]] += ahora - self._marca
+        self._marca = ahora
+        return ahora
+
+    @contextmanager
+    def fase(self, nombre: str):
+        """El bloque cuenta para 'nombre' (y deja de contar para la fase exterior)."""
+        self._anotar()
+        self._pila.append(nombre)
+        try:
+            yield
+        finally:
+            self._anotar()
+            self._pila.pop()
+
+    def medir(self, nombre: str, iterable: Iterable) -> Iterator:
+        """Envuelve un iterador: cada next() cuenta para 'nombre'."""
+        iterador = iter(iterable)
+        while True:
+            with self.fase(nombre):
+                try:
+                    elemento = next(iterador)
+                except StopIteration:
+                    return
+            yield elemento
+
+    def resumen(self) -> Dict[str, float]:
+        """Segundos de cada fase de FASES, más 'otros' y 'total'."""
+        total = time.perf_counter() - self.inicio
+        fases = {fase: self.segundos.get(fase, 0.0) for fase in FASES}
+        fases["otros"] = max(0.0, total - sum(self.segundos.values()))
+        fases["total"] = total
+        return fases
+
+
+class MedicionArchivo(NamedTuple):
+    blog: str
+    ruta: str
+    paginas: int
+    estado: str
+    segundos: Optional[float]    # None: acierto de caché (no se analizó)
+    bytes_leidos: Optional[int]
+
+
+class EstadisticasRendimiento:
+    """
+    Fases de la ejecución y mediciones por PDF y por blog.
+
+    Uso:
+        estadisticas = EstadisticasRendimiento()
+        with estadisticas.cronometro.fase("reporte"): ...
+        estadisticas.iniciar_blog("axiomata")
+        estadisticas.registrar("axiomata", "posts/a/index.pdf", 12, "OK", detalles)
+        estadisticas.cerrar_blog()
+        estadisticas.mas_lentos(10), estadisticas.por_blog()
+    """
+
+    def __init__(self, timeout: float = 0):
+        self.cronometro = Cronometro()
+        self.timeout = timeout
+        self.archivos: List[MedicionArchivo] = []
+        self._reloj_blog: Dict[str, float] = {}
+        self._blog = None
+        self._inicio_blog = 0.0
+
+    def iniciar_blog(self, blog: str):
+        self._blog = blog
+        self._inicio_blog = time.perf_counter()
+
+    def cerrar_blog(self):
+        self._reloj_blog[self._blog] = time.perf_counter() - self._inicio_blog
+        self._blog = None
+
+    def registrar(self, blog: str, ruta: str, paginas: int, estado: str, detalles: Optional[dict]):
+        """Anota un PDF; 'detalles' es lo que devolvió contar_paginas_pdf con medir=True."""
+        detalles = detalles or {}
+        segundos = detalles.get("segundos")
+        if segundos is None and estado == "TIMEOUT" and self.timeout:
+            segundos = self.timeout               # el proceso murió al vencer el plazo
+        self.archivos.append(MedicionArchivo(blog, ruta, paginas, estado, segundos,
+                                             detalles.get("bytes_leidos")))
+
+    def mas_lentos(self, n: int) -> List[MedicionArchivo]:
+        """Los n PDF con mayor tiempo de análisis."""
+        return heapq.nlargest(n, (a for a in self.archivos if a.segundos is not None),
+                              key=lambda a: a.segundos)
+
+    def por_blog(self) -> List[dict]:
+        """Una fila por blog: archivos, páginas, tiempos, bytes leídos y archivos/s."""
+        filas: Dict[str, dict] = {}
+        for a in self.archivos:
+            fila = filas.setdefault(a.blog, {
+                "blog": a.blog, "archivos": 0, "analizados": 0, "paginas": 0, "errores": 0,
+                "segundos_analisis": 0.0, "bytes_leidos": 0})
+            fila["archivos"] += 1
+            fila["paginas"] += a.paginas if a.estado == "OK" else 0
+            fila["errores"] += a.estado not in ("OK", "VACÍO")
+            if a.segundos is not None:
+                fila["analizados"] += 1
+                fila["segundos_analisis"] += a.segundos
+                fila["bytes_leidos"] += a.bytes_leidos or 0
+        for fila in filas.values():
+            reloj = self._reloj_blog.get(fila["blog"], 0.0)
+            fila["segundos_reloj"] = reloj
+            fila["archivos_s"] = fila["archivos"] / reloj if reloj > 0 else None
+            fila["paginas_s"] = fila["paginas"] / reloj if reloj > 0 else None
+        return list(filas.values())
@@ -0,0 +1,214 @@
+"""
+Raíces configurables y descubrimiento de los _site de cada blog.
+
+Las rutas de los blogs estaban fijas en el script: añadir un blog exigía
+editar el código, y --listar comprobaba cada candidato en cada ejecución.
+Ahora:
+
+  Configuración  pdf_page_counter.toml (o .yaml/.yml, con PyYAML) junto al
+                 script, otra con --config, o raíces con --root:
+
+                     raices = ["/home/usuario/Documents/publicaciones"]
+                     profundidad = 3
+
+                     [subsitios]            # un _site repartido en varios blogs
+                     website-achalma = ["blog", "teching"]
+
+  Descubrimiento Recorrido con os.scandir desde cada raíz, hasta
+                 'profundidad' niveles, sin entrar en los propios _site ni en
+                 directorios que no contienen sitios (.git, node_modules,
+                 _freeze…). Cada '<raíz>/<nombre>/_site' es el blog <nombre>.
+
+  Índice         El resultado se guarda con el mtime de cada directorio
+                 recorrido. Crear o borrar una entrada cambia el mtime de su
+                 directorio padre, así que si ninguno cambió el resultado
+                 sigue valiendo: las siguientes ejecuciones hacen un stat()
+                 por directorio en lugar de listar el árbol.
+"""
+
+import json
+import logging
+import os
+from fnmatch import fnmatch
+from typing import Dict, Iterable, List, Optional, Tuple
+
+NOMBRE_SITE = "_site"
+PROFUNDIDAD = 3
+# Directorios donde nunca hay un _site de Quarto (patrones sobre el nombre)
+DIRECTORIOS_PODADOS = (".*", "node_modules", "_freeze", "renv", "venv", "__pycache__",
+                       "site_libs", "*_files")
+CLAVES_CONFIGURACION = ("raices", "profundidad", "subsitios")
+_VERSION_INDICE = 1
+
+avisos = logging.getLogger(__name__)
+
+
+def cargar_configuracion(ruta: str) -> dict:
+    """
+    Lee un archivo de configuración TOML o YAML (según su extensión).
+
+    Returns:
+        Las claves de CLAVES_CONFIGURACION presentes en el archivo, validadas
+
+    Raises:
+        OSError: el archivo no se puede leer
+        ImportError: YAML sin PyYAML, o TOML en Python < 3.11 sin tomli
+            (el 'name' de la excepción dice cuál falta)
+        ValueError: sintaxis o tipos inválidos
+    """
+    if ruta.endswith((".yaml", ".yml")):
+        import yaml                                # PyYAML, solo para configuraciones YAML
+        with open(ruta, encoding="utf-8") as f:
+            try:
+                datos = yaml.safe_load(f) or {}
+            except yaml.YAMLError as e:
+                raise ValueError(str(e)) from None
+    else:
+        try:
+            import tomllib                         # Python 3.11+
+        except ModuleNotFoundError:
+            import tomli as tomllib                # misma API, para Python < 3.11
+        with open(ruta, "rb") as f:
+            try:
+                datos = tomllib.load(f)
+            except tomllib.TOMLDecodeError as e:
+                raise ValueError(str(e)) from None
+
+    if not isinstance(datos, dict):
+        raise ValueError("la configuración debe ser una tabla de claves")
+    desconocidas = set(datos) - set(CLAVES_CONFIGURACION)
+    if desconocidas:
+        raise ValueError(f"claves desconocidas: {', '.join(sorted(desconocidas))}")
+    configuracion = {}
+    if "raices" in datos:
+        raices = [datos["raices"]] if isinstance(datos["raices"], str) else datos["raices"]
+        if not isinstance(raices, list) or not all(isinstance(r, str) for r in raices):
+            raise ValueError("'raices' debe ser una lista de rutas")
+        configuracion["raices"] = [os.path.expanduser(r) for r in raices]
+    if "profundidad" in datos:
+        profundidad = datos["profundidad"]
+        if not isinstance(profundidad, int) or isinstance(profundidad, bool) or profundidad < 1:
+            raise ValueError("'profundidad' debe ser un entero >= 1")
+        configuracion["profundidad"] = profundidad
+    if "subsitios" in datos:
+        subsitios = datos["subsitios"]
+        if not isinstance(subsitios, dict) or not all(
+                isinstance(v, list) and all(isinstance(s, str) for s in v) for v in subsitios.values()):
+            raise ValueError("'subsitios' debe asociar cada blog a una lista de subdirectorios")
+        configuracion["subsitios"] = subsitios
+    return configuracion
+
+
+def _podado(nombre: str) -> bool:
+    return any(fnmatch(nombre, patron) for patron in DIRECTORIOS_PODADOS)
+
+
+def descubrir_sitios(raices: Iterable[str], profundidad: int = PROFUNDIDAD
+                     ) -> Tuple[Dict[str, str], Dict[str, int]]:
+    """
+    Busca los directorios _site bajo cada raíz.
+
+    Returns:
+        ({nombre_blog: ruta del _site}, {directorio recorrido: st_mtime_ns, o
+        None si no existía});
+        el nombre es la ruta relativa a la raíz del directorio que contiene
+        el _site. Si dos raíces dan el mismo nombre se queda la primera.
+    """
+    sitios: Dict[str, str] = {}
+    directorios: Dict[str, Optional[int]] = {}
+    for raiz in raices:
+        raiz = os.path.abspath(raiz)
+        pila = [(raiz, 0)]
+        while pila:
+            directorio, nivel = pila.pop()
+            try:
+                directorios[directorio] = os.stat(directorio).st_mtime_ns
+                with os.scandir(directorio) as it:
+                    entradas = [e for e in it if e.is_dir(follow_symlinks=False)]
+            except OSError:                       # raíz inexistente o sin permiso:
+                directorios.setdefault(directorio, None)   # el índice vale hasta que aparezca
+                continue
+            for entrada in entradas:
+                if entrada.name == NOMBRE_SITE:
+                    # --root apuntando a un blog: el nombre es el de la propia raíz
+                    nombre = (os.path.relpath(directorio, raiz).replace(os.sep, "/")
+                              if directorio != raiz else os.path.basename(raiz))
+                    sitios.setdefault(nombre, entrada.path)
+                elif nivel + 1 < profundidad and not _podado(entrada.name):
+                    pila.append((entrada.path, nivel + 1))
+    return dict(sorted(sitios.items())), directorios
+
+
+def expandir_subsitios(sitios: Dict[str, str], subsitios: Dict[str, List[str]]) -> Dict[str, str]:
+    """Sustituye cada blog de 'subsitios' por '<blog>/<subdirectorio>' de su _site (si existe)."""
+    blogs = {}
+    for nombre, ruta in sitios.items():
+        if nombre not in subsitios:
+            blogs[nombre] = ruta
+            continue
+        for sub in subsitios[nombre]:
+            ruta_sub = os.path.join(ruta, sub)
+            if os.path.isdir(ruta_sub):
+                blogs[f"{nombre}/{sub}"] = ruta_sub
+    return blogs
+
+
+class IndiceSitios:
+    """
+    Sitios descubiertos, guardados en JSON con el mtime de cada directorio recorrido.
+
+    Uso:
+        indice = IndiceSitios(".indice_sitios.json")
+        sitios = indice.obtener(["/…/publicaciones"], profundidad=3)
+        indice.reutilizado      # True si no hizo falta recorrer
+    """
+
+    def __init__(self, archivo: str):
+        self.archivo = archivo
+        self.reutilizado = False
+        self.directorios_recorridos = 0
+        self.sitios: Dict[str, str] = {}
+
+    def _cargar(self, clave: dict) -> Optional[Dict[str, str]]:
+        try:
+            with open(self.archivo, encoding="utf-8") as f:
+                datos = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if datos.get("version") != _VERSION_INDICE or datos.get("clave") != clave:
+            return None
+        for directorio, mtime in datos.get("directorios", {}).items():
+            try:
+                actual = os.stat(directorio).st_mtime_ns
+            except OSError:
+                actual = None
+            if actual != mtime:
+                return None
+        return datos.get("sitios")
+
+    def _guardar(self, clave: dict, sitios: Dict[str, str], directorios: Dict[str, Optional[int]]):
+        temporal = f"{self.archivo}.tmp"
+        try:
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump({"version": _VERSION_INDICE, "clave": clave, "sitios": sitios,
+                           "directorios": directorios}, f, ensure_ascii=False)
+            os.replace(temporal, self.archivo)
+        except OSError as e:                      # sin índice se recorre la próxima vez
+            avisos.warning("⚠️  No se pudo guardar el índice de sitios: %s", e)
+
+    def obtener(self, raices: List[str], profundidad: int = PROFUNDIDAD,
+                redescubrir: bool = False) -> Dict[str, str]:
+        """
+        Sitios bajo las raíces: del índice si ningún directorio cambió, si
+        no (o con redescubrir) recorriendo de nuevo y actualizando el índice.
+        """
+        clave = {"raices": [os.path.abspath(r) for r in raices], "profundidad": profundidad,
+                 "podados": list(DIRECTORIOS_PODADOS)}
+        sitios = None if redescubrir else self._cargar(clave)
+        self.reutilizado = sitios is not None
+        if sitios is None:
+            sitios, directorios = descubrir_sitios(raices, profundidad)
+            self.directorios_recorridos = len(directorios)
+            self._guardar(clave, sitios, directorios)
+        self.sitios = sitios
+        return sitios
@@ -0,0 +1,248 @@
+"""
+Vigilancia de los _site con inotify (--watch).
+
+Tras el recorrido inicial, los autores siguen renderizando con Quarto y los
+totales quedan viejos al instante. Aquí se suscribe cada _site a inotify
+(Linux, vía ctypes sobre libc: sin watchdog ni servicios externos) y solo
+se vuelven a contar los PDF que cambian:
+
+  - inotify no es recursivo: se añade un watch por directorio, podando los
+    mismos patrones que el descubrimiento (site_libs, *_files…), y los
+    directorios creados después se incorporan al vuelo — Quarto crea
+    posts/<nuevo>/ y enseguida escribe el PDF, así que al añadirlo se
+    revisa también lo que ya contiene;
+  - IN_CLOSE_WRITE, IN_CREATE y IN_MOVED_TO anotan un PDF escrito;
+    IN_DELETE e IN_MOVED_FROM, uno que desaparece. IN_MODIFY no se usa:
+    llega una vez por cada write();
+  - antirrebote: un PDF se entrega cuando pasan ANTIRREBOTE segundos sin
+    eventos suyos, de modo que un render que reescribe el archivo varias
+    veces se cuenta una sola;
+  - si la cola del kernel se desborda (IN_Q_OVERFLOW), si un directorio se
+    mueve fuera del árbol o si el propio _site desaparece y vuelve, el blog
+    se marca para resincronizar: el llamador lo recorre entero (la caché
+    de conteos hace que eso cueste poco).
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import time
+from typing import Dict, List, Set, Tuple
+
+from lib.descubrimiento import NOMBRE_INDEX, _excluido
+
+avisos = logging.getLogger(__name__)
+
+ANTIRREBOTE = 2.0                 # segundos sin eventos antes de recontar un PDF
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+
+MASCARA = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+           | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_DONT_FOLLOW)
+
+_EVENTO = struct.Struct("iIII")   # wd, mask, cookie, len (+ nombre de 'len' bytes)
+
+
+class Inotify:
+    """Descriptor inotify no bloqueante sobre las funciones de libc."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify no está disponible en este sistema (requiere Linux)")
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            self._error("inotify_init1")
+
+    def _error(self, llamada: str, ruta: str = None):
+        codigo = ctypes.get_errno()
+        mensaje = f"{llamada}: {os.strerror(codigo)}"
+        if llamada == "inotify_add_watch" and codigo == 28:       # ENOSPC
+            mensaje += " (sube fs.inotify.max_user_watches con sysctl)"
+        raise OSError(codigo, mensaje, ruta)
+
+    def agregar(self, ruta: str, mascara: int) -> int:
+        """Vigila un directorio y devuelve su descriptor de watch."""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(ruta), ctypes.c_uint32(mascara))
+        if wd < 0:
+            self._error("inotify_add_watch", ruta)
+        return wd
+
+    def quitar(self, wd: int):
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def leer(self, espera: float) -> List[Tuple[int, int, str]]:
+        """Espera hasta 'espera' segundos y devuelve los eventos (wd, máscara, nombre)."""
+        listos, _, _ = select.select([self.fd], [], [], espera)
+        if not listos:
+            return []
+        try:
+            datos = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        eventos = []
+        pos = 0
+        while pos + _EVENTO.size <= len(datos):
+            wd, mascara, _, longitud = _EVENTO.unpack_from(datos, pos)
+            pos += _EVENTO.size
+            nombre = os.fsdecode(datos[pos:pos + longitud].rstrip(b"\0"))
+            pos += longitud
+            eventos.append((wd, mascara, nombre))
+        return eventos
+
+    def cerrar(self):
+        os.close(self.fd)
+
+
+class VigilanteSitios:
+    """
+    PDFs creados, modificados o eliminados en los _site de varios blogs.
+
+    Uso:
+        vigilante = VigilanteSitios({"axiomata": "/…/axiomata/_site"}, True, excluidos)
+        while True:
+            for blog, ruta in vigilante.esperar(30):      # ruta absoluta; puede ya no existir
+                ...
+            for blog in vigilante.pendientes_de_resincronizar():
+                ...                                       # recorrer el blog entero
+    """
+
+    def __init__(self, raices: Dict[str, str], solo_index: bool,
+                 excluidos: Tuple[str, ...] = (), antirrebote: float = ANTIRREBOTE):
+        self.raices = raices
+        self.solo_index = solo_index
+        self.excluidos = tuple(excluidos)
+        self.antirrebote = antirrebote
+        self.inotify = Inotify()
+        self._directorios: Dict[int, Tuple[str, str]] = {}     # wd → (blog, directorio)
+        self._pendientes: Dict[str, Tuple[str, float]] = {}    # ruta → (blog, último evento)
+        self._resincronizar: Set[str] = set()
+        self._perdidos: Set[str] = set()                      # blogs cuyo _site desapareció
+        for blog, raiz in raices.items():
+            self._vigilar_arbol(blog, raiz)
+
+    @property
+    def directorios(self) -> int:
+        """Número de directorios vigilados."""
+        return len(self._directorios)
+
+    def _es_pdf(self, nombre: str) -> bool:
+        return nombre == NOMBRE_INDEX if self.solo_index else nombre.endswith(".pdf")
+
+    def _anotar(self, blog: str, ruta: str):
+        self._pendientes[ruta] = (blog, time.monotonic())
+
+    def _vigilar_arbol(self, blog: str, directorio: str, nuevo: bool = False):
+        """
+        Vigila 'directorio' y sus subdirectorios no excluidos.
+
+        Con nuevo (directorio creado durante la vigilancia) los PDF que ya
+        contiene se anotan: se escribieron antes de que existiera su watch.
+        """
+        pila = [directorio]
+        while pila:
+            actual = pila.pop()
+            try:
+                self._directorios[self.inotify.agregar(actual, MASCARA)] = (blog, actual)
+                with os.scandir(actual) as it:
+                    for entrada in it:
+                        if entrada.is_dir(follow_symlinks=False):
+                            if not _excluido(entrada.name, self.excluidos):
+                                pila.append(entrada.path)
+                        elif nuevo and self._es_pdf(entrada.name):
+                            self._anotar(blog, entrada.path)
+            except (FileNotFoundError, NotADirectoryError):
+                continue                          # desapareció mientras se recorría
+            except PermissionError as e:
+                avisos.warning("   ⚠️  No se pudo vigilar: %s (%s)", actual, e.strerror)
+
+    def _procesar(self, wd: int, mascara: int, nombre: str):
+        if mascara & IN_Q_OVERFLOW:
+            self._resincronizar.update(self.raices)
+            return
+        origen = self._directorios.get(wd)
+        if origen is None:
+            return
+        blog, directorio = origen
+
+        if mascara & IN_IGNORED:                  # watch eliminado (directorio borrado)
+            del self._directorios[wd]
+            if directorio == self.raices[blog]:
+                self._perdidos.add(blog)
+            return
+        if mascara & IN_MOVE_SELF:
+            self.inotify.quitar(wd)               # su ruta ya no es válida; llegará IN_IGNORED
+            if directorio == self.raices[blog]:
+                self._resincronizar.add(blog)
+            return
+        if not nombre:
+            return
+
+        ruta = os.path.join(directorio, nombre)
+        if mascara & IN_ISDIR:
+            if mascara & (IN_CREATE | IN_MOVED_TO) and not _excluido(nombre, self.excluidos):
+                self._vigilar_arbol(blog, ruta, nuevo=True)
+            elif mascara & IN_MOVED_FROM:
+                self._resincronizar.add(blog)     # sus PDF desaparecen sin eventos propios
+        elif self._es_pdf(nombre):
+            self._anotar(blog, ruta)
+
+    def esperar(self, espera: float) -> List[Tuple[str, str]]:
+        """
+        Procesa eventos durante 'espera' segundos como mucho.
+
+        Returns:
+            (blog, ruta absoluta) de los PDF cuyo antirrebote venció; el
+            llamador comprueba si siguen existiendo
+        """
+        ahora = time.monotonic()
+        if self._pendientes:
+            proximo = min(t for _, t in self._pendientes.values()) + self.antirrebote
+            espera = min(espera, proximo - ahora)
+        if self._perdidos:
+            espera = min(espera, 1.0)             # sondeo hasta que el _site reaparezca
+        for wd, mascara, nombre in self.inotify.leer(max(0.0, espera)):
+            self._procesar(wd, mascara, nombre)
+
+        for blog in list(self._perdidos):
+            if os.path.isdir(self.raices[blog]):
+                self._perdidos.discard(blog)
+                self._vigilar_arbol(blog, self.raices[blog])
+                self._resincronizar.add(blog)
+
+        limite = time.monotonic() - self.antirrebote
+        vencidos = [(blog, ruta) for ruta, (blog, t) in self._pendientes.items() if t <= limite]
+        for _, ruta in vencidos:
+            del self._pendientes[ruta]
+        return vencidos
+
+    def vaciar(self) -> List[Tuple[str, str]]:
+        """Entrega los PDF anotados aunque su antirrebote no haya vencido (al terminar)."""
+        pendientes = [(blog, ruta) for ruta, (blog, _) in self._pendientes.items()]
+        self._pendientes.clear()
+        return pendientes
+
+    def pendientes_de_resincronizar(self) -> List[str]:
+        """Blogs que hay que recorrer enteros (y se dan por atendidos)."""
+        blogs = sorted(self._resincronizar)
+        self._resincronizar.clear()
+        return blogs
+
+    def cerrar(self):
+        self.inotify.cerrar()
@@ -9,58 +9,91 @@ v1.1.0
 
 import os
 import sys
+import time
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import List, Optional, Tuple, Dict, Iterable, Iterator, Union
 import argparse
+import importlib.util
+import logging
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
+from itertools import islice, tee
 
-try:
-    from PyPDF2 import PdfReader
-except ImportError:
-    print("❌ Error: PyPDF2 no está instalado.")
-    print("Por favor, instala con: conda install -c conda-forge pypdf2")
-    sys.exit(1)
+# Permite importar lib/ sin importar el directorio de trabajo
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-except ImportError:
-    print("❌ Error: openpyxl no está instalado.")
-    print("Por favor, instala con: conda install -c conda-forge openpyxl")
-    sys.exit(1)
+from lib.pdf_rapido import (analizar_pdf_rapido, fecha_pdf,
+                            CAMPOS_METADATOS, PDFEstructuraError)
+from lib.cache_paginas import CachePaginas, firma_entrada
+from lib.descubrimiento import iterar_pdfs, EntradaRuta
+from lib.escritores import FORMATOS, crear_escritor
+from lib.delta import RegistroEjecucion, calcular_cambios, escribir_cambios
+from lib.aislamiento import PoolAislado, PAGINAS_ERROR, PAGINAS_TIMEOUT, PAGINAS_OOM
+from lib.rendimiento import EstadisticasRendimiento, CAMPOS_RENDIMIENTO
+from lib.duplicados import Deduplicador
+from lib.vigilancia import VigilanteSitios
+from lib.manifiestos import candidatos_manifiesto, iterar_candidatos
+from lib.almacen import AlmacenResultados, escribir_resumenes
+from lib.progreso import LineaProgreso, ManejadorAvisos
+from lib.sitios import IndiceSitios, cargar_configuracion, expandir_subsitios, PROFUNDIDAD
+
+# PyPDF2 y openpyxl se importan solo cuando hacen falta (ver
+# verificar_dependencias): --listar y las salidas CSV/JSONL/SQLite con el
+# motor rápido arrancan sin cargarlos
 
 
 # ========================================================================
 # CONFIGURACIÓN - Personaliza estas rutas según tu sistema
 # ========================================================================
 
-# Ruta base donde están todos tus blogs
+# Ruta base donde están todos tus blogs (raíz por defecto si no hay archivo
+# de configuración ni --root). Cada <raíz>/<blog>/_site se descubre solo
 RUTA_BASE_PUBLICACIONES = "/home/achalmaedison/Documents/publicaciones"
 
-# Lista de blogs a procesar (estructura estándar con _site)
-BLOGS_ESTANDAR = [
-    "actus-mercator",
-    "aequilibria",
-    "axiomata",
-    "chaska",
-    "dialectica-y-mercado",
-    "epsilon-y-beta",
-    "methodica",
-    "numerus-scriptum",
-    "optimums",
-    "pecunia-fluxus",
-    "res-publica",
-]
-
-# Blogs dentro de website-achalma (no tienen _site propio, están en _site/blog o _site/teching)
-BLOGS_WEBSITE_ACHALMA = {
-    "blog": "website-achalma/_site/blog",
-    "teching": "website-achalma/_site/teching",
+# Sitios cuyo _site se reparte en varios blogs: website-achalma no tiene un
+# blog en la raíz, sino en _site/blog y _site/teching
+SUBSITIOS = {
+    "website-achalma": ["blog", "teching"],
 }
 
+# Configuración opcional junto al script (raices, profundidad, subsitios; ver
+# lib/sitios.py); se usa la primera que exista. --config elige otra
+ARCHIVOS_CONFIGURACION = ["pdf_page_counter.toml", "pdf_page_counter.yaml", "pdf_page_counter.yml"]
+
+# Sitios descubiertos, con el mtime de los directorios recorridos: mientras
+# no cambien, las siguientes ejecuciones no vuelven a recorrer las raíces
+ARCHIVO_INDICE_SITIOS = ".indice_sitios.json"
+
 # Directorio donde se guardarán los reportes Excel
 DIRECTORIO_EXCEL = "excel_databases"
 
+# Motor de conteo: "fast" (lee /Count de la estructura), "pypdf2" (análisis
+# completo con PdfReader) o "auto" (fast y, si el PDF está dañado, PyPDF2)
+MOTOR_PREDETERMINADO = "auto"
+
+# Caché SQLite de conteos (junto a excel_databases/): los PDF cuyo tamaño,
+# mtime e inodo no cambiaron no se vuelven a analizar
+ARCHIVO_CACHE = "cache_paginas.sqlite3"
+
+# Directorios de _site que nunca contienen los PDF de las publicaciones
+# (patrones sobre el nombre del directorio); no se recorren
+DIRECTORIOS_EXCLUIDOS = ["site_libs", "*_files", ".quarto"]
+
+# Con --jobs: PDFs enviados a un proceso en cada lote (menos comunicación
+# entre procesos) y lotes en vuelo por proceso (mejor reparto de la carga)
+TAMANO_LOTE = 16
+LOTES_POR_PROCESO = 4
+
+# Límites por archivo (--timeout, --max-memory; 0 = sin límite): cada PDF
+# se cuenta en un proceso aislado que se mata y reemplaza si los excede
+TIMEOUT_POR_ARCHIVO = 60          # segundos
+LIMITE_MEMORIA_MB = 2048          # RLIMIT_AS de cada proceso trabajador
+
+# Con --watch: cada cuántos segundos se reescribe el reporte si hubo cambios
+INTERVALO_VOLCADO = 30
+
 # ========================================================================
 # FUNCIONES AUXILIARES
 # ========================================================================
@@ -83,7 +116,9 @@ def imprimir_seccion(titulo: str):
     print("─" * 80)
 
 
-def imprimir_resumen(total_archivos: int, total_paginas: int, errores: int):
+def imprimir_resumen(total_archivos: int, total_paginas: int, errores: int,
+                     cache: CachePaginas = None, duplicados: int = 0,
+                     paginas_duplicadas: int = 0):
     """Imprime un resumen final bonito"""
     print("\n" + "=" * 80)
     print("📈 RESUMEN FINAL".center(80))
@@ -92,9 +127,93 @@ def imprimir_resumen(total_archivos: int, total_paginas: int, errores: int):
     print(f"❌ Archivos con errores: {errores}")
     print(f"📄 Total de archivos analizados: {total_archivos}")
     print(f"📑 Total de páginas contadas: {total_paginas:,}")
+    if duplicados:
+        print(f"♊ Duplicados: {duplicados} archivo(s) | {paginas_duplicadas:,} página(s) "
+              f"→ sin duplicados: {total_archivos - duplicados} archivos | "
+              f"{total_paginas - paginas_duplicadas:,} páginas")
+    if cache is not None:
+        print(f"⚡ Caché: {cache.aciertos} acierto(s) | {cache.fallos} fallo(s)")
     print("=" * 80 + "\n")
 
 
+def imprimir_cambios(cambios: List[dict], fecha_anterior: str, limite: int = 20):
+    """Imprime el resumen de cambios respecto a la ejecución anterior (--delta)"""
+    imprimir_seccion(f"CAMBIOS DESDE LA ÚLTIMA EJECUCIÓN ({fecha_anterior})")
+    if not cambios:
+        print("✨ Sin cambios.")
+        return
+    conteo: Dict[str, int] = {}
+    for cambio in cambios:
+        conteo[cambio["cambio"]] = conteo.get(cambio["cambio"], 0) + 1
+    print(" | ".join(f"{tipo}: {n}" for tipo, n in sorted(conteo.items())))
+    for cambio in cambios[:limite]:
+        antes = cambio["paginas_antes"] if cambio["paginas_antes"] is not None else "-"
+        ahora = cambio["paginas_ahora"] if cambio["paginas_ahora"] is not None else "-"
+        print(f"   {cambio['cambio']:<11} {cambio['blog']}/{cambio['ruta']} ({antes} → {ahora})")
+    if len(cambios) > limite:
+        print(f"   … y {len(cambios) - limite} más en el reporte")
+
+
+def imprimir_fuera_de_manifiesto(faltantes: List[str], limite: int = 20):
+    """Muestra los PDF que están en disco pero no en los manifiestos (--discovery audit)"""
+    imprimir_seccion("PDFs FUERA DEL MANIFIESTO")
+    if not faltantes:
+        print("✅ Todos los index.pdf del disco aparecen en los manifiestos")
+        return
+    print(f"🔍 {len(faltantes)} PDF(s) no aparecen en search.json / listings.json / sitemap.xml "
+          f"(borradores, páginas excluidas de la búsqueda o restos de renders anteriores):")
+    for ruta in faltantes[:limite]:
+        print(f"   • {ruta}")
+    if len(faltantes) > limite:
+        print(f"   … y {len(faltantes) - limite} más")
+
+
+def imprimir_rendimiento(estadisticas: EstadisticasRendimiento, limite: int):
+    """Imprime fases, rendimiento por blog y los PDF más lentos (--stats)"""
+    imprimir_seccion("RENDIMIENTO")
+    fases = estadisticas.cronometro.resumen()
+    print(" | ".join(f"{fase}: {segundos:.2f} s" for fase, segundos in fases.items()))
+    
+    print(f"\n{'Blog':<30} {'Archivos':>8} {'Analizados':>10} {'Reloj (s)':>10} {'Archivos/s':>11} {'MB leídos':>10}")
+    for fila in estadisticas.por_blog():
+        tasa = f"{fila['archivos_s']:.1f}" if fila["archivos_s"] else "-"
+        print(f"{fila['blog']:<30} {fila['archivos']:>8} {fila['analizados']:>10} "
+              f"{fila['segundos_reloj']:>10.2f} {tasa:>11} {fila['bytes_leidos'] / 1e6:>10.2f}")
+    
+    lentos = estadisticas.mas_lentos(limite)
+    if lentos:
+        print(f"\n🐢 Los {len(lentos)} PDF más lentos:")
+        for medicion in lentos:
+            leidos = f"{medicion.bytes_leidos / 1024:.0f} KB" if medicion.bytes_leidos is not None else "-"
+            print(f"   {medicion.segundos:>8.3f} s {leidos:>10}  {medicion.blog}/{medicion.ruta} [{medicion.estado}]")
+    else:
+        print("\nℹ️  Ningún PDF se analizó en esta ejecución (todos salieron de la caché).")
+
+
+def verificar_dependencias(formato: str, motor: str) -> bool:
+    """
+    Comprueba que estén instaladas las bibliotecas que esta ejecución usará.
+    
+    openpyxl solo es necesario para xlsx y PyPDF2 para el motor pypdf2; con
+    el motor auto, PyPDF2 es opcional (sin él, un PDF dañado queda en ERROR).
+    
+    Returns:
+        False si falta una dependencia obligatoria (ya se informó el error)
+    """
+    if formato == "xlsx" and importlib.util.find_spec("openpyxl") is None:
+        print("❌ Error: openpyxl no está instalado.")
+        print("Por favor, instala con: conda install -c conda-forge openpyxl")
+        print("   (o usa --format csv / jsonl / sqlite)")
+        return False
+    if motor != "fast" and importlib.util.find_spec("PyPDF2") is None:
+        if motor == "pypdf2":
+            print("❌ Error: PyPDF2 no está instalado.")
+            print("Por favor, instala con: conda install -c conda-forge pypdf2")
+            return False
+        print("⚠️  PyPDF2 no está instalado: los PDF dañados se marcarán como ERROR.")
+    return True
+
+
 def crear_directorio_excel():
     """Crea el directorio para guardar los archivos Excel si no existe"""
     script_dir = Path(__file__).parent
@@ -103,254 +222,607 @@ def crear_directorio_excel():
     return excel_dir
 
 
-def contar_paginas_pdf(ruta_pdf: str) -> int:
+def _metadatos_pypdf2(reader, ruta_pdf: str) -> dict:
+    """Metadatos (ver CAMPOS_METADATOS) de un PdfReader ya abierto"""
+    reader.stream.seek(0)
+    inicio = reader.stream.read(1024)
+    info = None if reader.is_encrypted else reader.metadata
+    return dict(zip(CAMPOS_METADATOS, (
+        os.path.getsize(ruta_pdf),
+        reader.pdf_header[5:] or None,
+        reader.is_encrypted,
+        b"/Linearized" in inicio,
+        info.title if info else None,
+        info.author if info else None,
+        fecha_pdf(info.get("/CreationDate")) if info else None,
+    )))
+
+
+def _analizar_pdf(ruta_pdf: str, motor: str, metadatos: bool) -> Tuple[int, dict]:
+    """Cuerpo de contar_paginas_pdf: siempre devuelve (páginas, detalles)"""
+    if motor in ("fast", "auto"):
+        try:
+            return analizar_pdf_rapido(ruta_pdf, metadatos)
+        except (PDFEstructuraError, OSError):
+            if motor == "fast":
+                return PAGINAS_ERROR, {}
+        except MemoryError:
+            return PAGINAS_OOM, {}
+    
+    try:
+        from PyPDF2 import PdfReader
+        reader = PdfReader(ruta_pdf)
+        paginas = len(reader.pages)
+    except MemoryError:
+        return PAGINAS_OOM, {}
+    except Exception as e:
+        return PAGINAS_ERROR, {}
+    detalles = {}
+    if metadatos:
+        # Un /Info dañado no invalida el conteo: los metadatos quedan vacíos
+        try:
+            detalles = _metadatos_pypdf2(reader, ruta_pdf)
+        except MemoryError:
+            return PAGINAS_OOM, {}
+        except Exception:
+            detalles = dict.fromkeys(CAMPOS_METADATOS)
+    try:
+        # PdfReader lee el archivo entero
+        detalles["bytes_leidos"] = os.path.getsize(ruta_pdf)
+    except OSError:
+        pass
+    return paginas, detalles
+
+
+def silenciar_pypdf2():
+    """
+    Calla los avisos de reparación de PyPDF2 ("Object ID N,0 ref repaired"…):
+    son detalle por PDF y con --progress romperían la línea de estado
+    """
+    registro = logging.getLogger("PyPDF2")
+    if registro.level < logging.CRITICAL:
+        registro.setLevel(logging.CRITICAL)
+
+
+def contar_paginas_pdf(ruta_pdf: str, motor: str = MOTOR_PREDETERMINADO,
+                       metadatos: bool = False, medir: bool = False,
+                       silencioso: bool = False) -> Union[int, Tuple[int, dict]]:
     """
     Cuenta el número de páginas de un archivo PDF.
     
     Args:
         ruta_pdf: Ruta al archivo PDF
+        motor: "fast", "pypdf2" o "auto" (fast con respaldo en PyPDF2)
+        metadatos: Devolver también los metadatos leídos en la misma pasada
+        medir: Devolver también 'segundos' de análisis y 'bytes_leidos' (--stats)
+        silencioso: Callar los avisos de PyPDF2 (--quiet, --progress); se aplica
+            aquí y no en main() porque el PDF puede contarse en otro proceso
         
     Returns:
-        Número de páginas del PDF, o -1 si hay error
+        Número de páginas del PDF, -1 si hay error o -3 si se agotó la
+        memoria (ver lib/aislamiento.py); con metadatos o medir, la tupla
+        (páginas, {campo: valor}), sin metadatos si hubo error
     """
-    try:
-        reader = PdfReader(ruta_pdf)
-        return len(reader.pages)
-    except Exception as e:
-        return -1
+    if silencioso:
+        silenciar_pypdf2()
+    inicio = time.perf_counter()
+    paginas, detalles = _analizar_pdf(ruta_pdf, motor, metadatos)
+    if not (metadatos or medir):
+        return paginas
+    if medir:
+        detalles["segundos"] = round(time.perf_counter() - inicio, 6)
+    else:
+        detalles.pop("bytes_leidos", None)
+    return paginas, detalles
+
 
+def separar_conteo(conteo: Union[int, Tuple[int, dict]]) -> Tuple[int, Optional[dict]]:
+    """Normaliza un conteo a (páginas, detalles); los códigos de error del pool y los
+    aciertos de caché sin --metadata no traen detalles"""
+    return conteo if isinstance(conteo, tuple) else (conteo, None)
 
-def buscar_pdfs_en_directorio(directorio: str, solo_index: bool = True) -> List[Tuple[str, int, str]]:
+
+def listar_pdfs(directorio: str, solo_index: bool = True,
+                candidatos: List[str] = None) -> Iterator[os.DirEntry]:
     """
-    Busca archivos PDF recursivamente en un directorio.
+    Produce los archivos PDF de un directorio, ordenados por ruta.
     
     Args:
         directorio: Directorio raíz donde buscar
         solo_index: Si es True, solo busca archivos llamados 'index.pdf'
+        candidatos: index.pdf que listan los manifiestos del sitio (ver
+            cargar_manifiestos); si se dan, solo se comprueban esos en lugar
+            de recorrer el directorio
         
+    Yields:
+        os.DirEntry (o EntradaRuta) de cada PDF (nada si el directorio no
+        existe); los directorios de DIRECTORIOS_EXCLUIDOS no se recorren
+    """
+    if candidatos is not None:
+        yield from iterar_candidatos(directorio, candidatos)
+    else:
+        yield from iterar_pdfs(directorio, solo_index, DIRECTORIOS_EXCLUIDOS)
+
+
+def cargar_manifiestos(rutas_blogs: Dict[str, str]) -> Dict[str, Optional[List[str]]]:
+    """
+    Lee los manifiestos de Quarto (search.json, listings.json, sitemap.xml) de cada blog.
+    
     Returns:
-        Lista de tuplas (ruta_relativa, numero_paginas, estado)
+        Diccionario {nombre_blog: rutas relativas de los index.pdf candidatos,
+        o None si el blog no tiene manifiestos}
     """
-    resultados = []
-    directorio_path = Path(directorio)
+    return {nombre: candidatos_manifiesto(ruta, DIRECTORIOS_EXCLUIDOS)
+            for nombre, ruta in rutas_blogs.items()}
+
+
+def registrar_resultado(ruta_relativa: str, paginas: int,
+                        mostrar: bool = True) -> Tuple[str, int, str]:
+    """Clasifica un conteo (OK / VACÍO / ERROR / TIMEOUT / OOM), lo imprime (salvo con
+    mostrar=False: --progress, --quiet) y devuelve (ruta, páginas, estado)"""
+    if paginas > 0:
+        resultado = (ruta_relativa, paginas, "OK")
+        linea = f"   ✓ {ruta_relativa:<60} {paginas:>3} página(s)"
+    elif paginas == 0:
+        resultado = (ruta_relativa, 0, "VACÍO")
+        linea = f"   ⚠ {ruta_relativa:<60} {'0':>3} página(s) [VACÍO]"
+    elif paginas == PAGINAS_TIMEOUT:
+        resultado = (ruta_relativa, 0, "TIMEOUT")
+        linea = f"   ⏱ {ruta_relativa:<60} {'ERR':>3} [TIEMPO AGOTADO]"
+    elif paginas == PAGINAS_OOM:
+        resultado = (ruta_relativa, 0, "OOM")
+        linea = f"   ✗ {ruta_relativa:<60} {'ERR':>3} [MEMORIA AGOTADA]"
+    else:
+        resultado = (ruta_relativa, 0, "ERROR")
+        linea = f"   ✗ {ruta_relativa:<60} {'ERR':>3} [ERROR LECTURA]"
+    if mostrar:
+        print(linea)
+    return resultado
+
+
+def stat_entrada(entrada: os.DirEntry) -> Optional[os.stat_result]:
+    """stat() del PDF sin seguir enlaces (en caché en el DirEntry), o None si ya no existe"""
+    try:
+        return entrada.stat(follow_symlinks=False)
+    except OSError:
+        return None
+
+
+def ruta_resumen(archivo_salida: Path) -> Path:
+    """Archivo de resúmenes junto al reporte CSV / JSON Lines: <nombre>_resumen.<ext>"""
+    return archivo_salida.with_name(f"{archivo_salida.stem}_resumen{archivo_salida.suffix}")
+
+
+def _contar_lote(rutas: List[str], motor: str, metadatos: bool = False,
+                 medir: bool = False, silencioso: bool = False) -> List[int]:
+    """Tarea de un proceso del pool: cuenta un lote de PDFs"""
+    return [contar_paginas_pdf(ruta, motor, metadatos, medir, silencioso) for ruta in rutas]
+
+
+def contar_paginas_lote(rutas: Iterable[str], motor: str = MOTOR_PREDETERMINADO,
+                        jobs: int = 1, timeout: float = 0,
+                        memoria_mb: int = 0, metadatos: bool = False,
+                        medir: bool = False, silencioso: bool = False) -> Iterator[int]:
+    """
+    Cuenta las páginas de muchos PDFs, en paralelo si jobs > 1.
     
-    if not directorio_path.exists():
-        print(f"⚠️  Directorio no encontrado: {directorio}")
-        return resultados
+    Con timeout o memoria_mb, los PDF se cuentan en un PoolAislado de jobs
+    procesos (también con jobs = 1), que también recibe lotes de
+    TAMANO_LOTE rutas: el proceso que se excede se mata y el PDF queda en
+    TIMEOUT u OOM. Sin límites se usa el camino descrito abajo.
     
-    # Patrón de búsqueda
-    patron = "**/index.pdf" if solo_index else "**/*.pdf"
+    PyPDF2 es Python puro y ocupa un solo núcleo; con jobs > 1 el trabajo
+    se reparte en un ProcessPoolExecutor. Las rutas se envían en lotes de
+    TAMANO_LOTE para reducir la comunicación entre procesos, y como mucho
+    jobs * LOTES_POR_PROCESO lotes están en vuelo: las rutas se consumen de
+    forma perezosa (el conteo empieza mientras el descubrimiento sigue) y
+    los conteos se devuelven en el mismo orden que las rutas.
     
-    # Buscar archivos
-    archivos_encontrados = list(directorio_path.glob(patron))
+    Args:
+        rutas: Rutas de los PDFs (cualquier iterable, también perezoso)
+        motor: Motor de conteo (ver contar_paginas_pdf)
+        jobs: Número de procesos (1 = secuencial, sin pool)
+        timeout: Segundos por PDF (0 = sin límite)
+        memoria_mb: Memoria por proceso en MB (0 = sin límite)
+        metadatos: Contar también los metadatos (ver contar_paginas_pdf)
+        medir: Medir tiempo y bytes leídos de cada PDF (ver contar_paginas_pdf)
+        silencioso: Callar los avisos de PyPDF2 también en los procesos hijos
+        
+    Yields:
+        Número de páginas (o código de error negativo) de cada ruta, en orden;
+        con metadatos o medir, lo que devuelve contar_paginas_pdf (ver separar_conteo)
+    """
+    if timeout or memoria_mb:
+        pool = PoolAislado(partial(contar_paginas_pdf, motor=motor, metadatos=metadatos, medir=medir,
+                                   silencioso=silencioso),
+                           jobs, timeout, memoria_mb, TAMANO_LOTE)
+        yield from pool.mapear(rutas)
+        return
     
-    if not archivos_encontrados:
-        print(f"   ℹ️  No se encontraron archivos en: {directorio_path.name}")
-        return resultados
+    if jobs <= 1:
+        for ruta in rutas:
+            yield contar_paginas_pdf(ruta, motor, metadatos, medir, silencioso)
+        return
     
-    for pdf_path in archivos_encontrados:
-        if pdf_path.is_file():
-            ruta_relativa = str(pdf_path.relative_to(directorio_path))
-            paginas = contar_paginas_pdf(str(pdf_path))
-            
-            if paginas > 0:
-                resultados.append((ruta_relativa, paginas, "OK"))
-                print(f"   ✓ {ruta_relativa:<60} {paginas:>3} página(s)")
-            elif paginas == 0:
-                resultados.append((ruta_relativa, 0, "VACÍO"))
-                print(f"   ⚠ {ruta_relativa:<60} {'0':>3} página(s) [VACÍO]")
-            else:
-                resultados.append((ruta_relativa, 0, "ERROR"))
-                print(f"   ✗ {ruta_relativa:<60} {'ERR':>3} [ERROR LECTURA]")
+    rutas = iter(rutas)
+    en_vuelo = deque()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        while True:
+            lote = list(islice(rutas, TAMANO_LOTE))
+            if lote:
+                en_vuelo.append(pool.submit(_contar_lote, lote, motor, metadatos, medir, silencioso))
+            if en_vuelo and (not lote or len(en_vuelo) >= jobs * LOTES_POR_PROCESO):
+                yield from en_vuelo.popleft().result()
+            elif not lote:
+                return
+
+
+def contar_con_cache(entradas: Iterable[os.DirEntry], motor: str, jobs: int,
+                     cache: CachePaginas = None, timeout: float = 0,
+                     memoria_mb: int = 0, metadatos: bool = False,
+                     medir: bool = False, silencioso: bool = False) -> Iterator[int]:
+    """
+    Igual que contar_paginas_lote, pero consultando antes la caché.
+    
+    Solo los PDF sin entrada válida (fallos) pasan a contar_paginas_lote;
+    los aciertos se devuelven sin abrir el archivo. La firma sale del
+    stat() de cada DirEntry. El orden de salida es el de entradas, y
+    cada conteo nuevo se guarda en la caché, salvo TIMEOUT y OOM, que
+    dependen de los límites de esta ejecución y no del archivo.
     
-    return resultados
+    Args:
+        entradas: DirEntry de los PDFs (iterable perezoso)
+        motor: Motor de conteo (ver contar_paginas_pdf)
+        jobs: Número de procesos para los fallos
+        cache: Caché abierta, o None para contar todo (--no-cache)
+        timeout, memoria_mb: Límites por PDF (ver contar_paginas_lote)
+        metadatos: Pedir también los metadatos (las entradas sin ellos son fallos)
+        medir: Medir los PDF analizados; los aciertos no se miden ni se guardan
+            las mediciones en la caché
+        silencioso: Callar los avisos de PyPDF2 (ver contar_paginas_lote)
+    """
+    if cache is None:
+        yield from contar_paginas_lote((e.path for e in entradas), motor, jobs,
+                                       timeout, memoria_mb, metadatos, medir, silencioso)
+        return
+    
+    # Cada entrada consultada se anota en 'orden'; solo los fallos siguen
+    # hacia el pool, que los consume a su ritmo
+    orden = deque()
+    
+    def fallos() -> Iterator[str]:
+        for entrada in entradas:
+            firma = firma_entrada(entrada)
+            guardado = cache.buscar(entrada.path, firma, motor, metadatos)
+            orden.append((entrada.path, firma, guardado))
+            if guardado is None:
+                yield entrada.path
+    
+    nuevos = contar_paginas_lote(fallos(), motor, jobs, timeout, memoria_mb, metadatos, medir,
+                                 silencioso)
+    listos = deque()
+    while True:
+        if not orden:
+            paginas = next(nuevos, None)          # hace avanzar el descubrimiento
+            if paginas is None and not orden:
+                return
+            if paginas is not None:
+                listos.append(paginas)
+        ruta, firma, guardado = orden.popleft()
+        if guardado is not None:
+            yield guardado
+            continue
+        if not listos:
+            listos.append(next(nuevos))
+        conteo = listos.popleft()
+        paginas, detalles = separar_conteo(conteo)
+        if paginas not in (PAGINAS_TIMEOUT, PAGINAS_OOM):
+            if metadatos:
+                paginas = (paginas, {campo: valor for campo, valor in (detalles or {}).items()
+                                     if campo in CAMPOS_METADATOS})
+            cache.guardar(ruta, firma, paginas, motor)
+        yield conteo
+
 
+def etiqueta_ruta(ruta: str, rutas_blogs: Dict[str, str]) -> str:
+    """Convierte una ruta absoluta en 'blog/ruta_relativa' (la ruta tal cual si no es de ningún blog)"""
+    for blog, raiz in rutas_blogs.items():
+        if ruta.startswith(raiz + os.sep):
+            return f"{blog}/{os.path.relpath(ruta, raiz)}"
+    return ruta
 
-def obtener_rutas_blogs(blogs_seleccionados: List[str] = None) -> Dict[str, str]:
+
+def cargar_raices(archivo_config: str = None, raices: List[str] = None) -> dict:
+    """
+    Configuración de las raíces: el archivo (--config o el primero de
+    ARCHIVOS_CONFIGURACION que exista), con --root por encima.
+    
+    Returns:
+        {"raices", "profundidad", "subsitios", "archivo"}
+        
+    Raises:
+        OSError, ImportError, ValueError: archivo ilegible, YAML sin PyYAML,
+        TOML sin tomli (Python < 3.11) o configuración inválida (ver cargar_configuracion)
+    """
+    configuracion = {"raices": [RUTA_BASE_PUBLICACIONES], "profundidad": PROFUNDIDAD,
+                     "subsitios": SUBSITIOS, "archivo": None}
+    if archivo_config is None:
+        candidatos = (Path(__file__).parent / nombre for nombre in ARCHIVOS_CONFIGURACION)
+        archivo_config = next((str(c) for c in candidatos if c.is_file()), None)
+    if archivo_config is not None:
+        try:
+            configuracion.update(cargar_configuracion(archivo_config), archivo=archivo_config)
+        except ValueError as e:
+            raise ValueError(f"{archivo_config}: {e}") from None
+    if raices:
+        configuracion["raices"] = [os.path.expanduser(r) for r in raices]
+    return configuracion
+
+
+def descubrir_blogs(configuracion: dict, redescubrir: bool = False) -> Tuple[Dict[str, str], IndiceSitios]:
+    """
+    Blogs bajo las raíces configuradas, del índice de sitios si sigue al día.
+    
+    Returns:
+        ({nombre_blog: ruta del _site}, índice usado)
+    """
+    indice = IndiceSitios(str(Path(__file__).parent / ARCHIVO_INDICE_SITIOS))
+    sitios = indice.obtener(configuracion["raices"], configuracion["profundidad"], redescubrir)
+    return expandir_subsitios(sitios, configuracion["subsitios"]), indice
+
+
+def obtener_rutas_blogs(blogs_seleccionados: List[str] = None, configuracion: dict = None,
+                        redescubrir: bool = False) -> Dict[str, str]:
     """
     Obtiene las rutas completas de los blogs a procesar.
     
     Args:
-        blogs_seleccionados: Lista de nombres de blogs a procesar (None = todos)
+        blogs_seleccionados: Lista de nombres de blogs a procesar (None = todos);
+            un sitio repartido ('website-achalma') selecciona todos sus blogs, y
+            los blogs de un subsitio también se aceptan por su nombre corto ('blog')
+        configuracion: Resultado de cargar_raices (None = la configuración por defecto)
+        redescubrir: Recorrer las raíces aunque el índice de sitios esté al día
         
     Returns:
         Diccionario {nombre_blog: ruta_completa}
     """
+    blogs, _ = descubrir_blogs(configuracion or cargar_raices(), redescubrir)
+    if not blogs_seleccionados:
+        return blogs
+    
     rutas = {}
-    base_path = Path(RUTA_BASE_PUBLICACIONES)
+    for seleccion in blogs_seleccionados:
+        encontrados = {nombre: ruta for nombre, ruta in blogs.items()
+                       if nombre == seleccion or nombre.startswith(seleccion + "/")
+                       or nombre.rpartition("/")[2] == seleccion}
+        if not encontrados:
+            print(f"⚠️  Blog no encontrado: {seleccion}")
+        rutas.update(encontrados)
+    return rutas
+
+
+def recontar_cambios(indice: Dict[Tuple[str, str], tuple], cambios: List[Tuple[str, str]],
+                     rutas_blogs: Dict[str, str], args, cache: CachePaginas = None) -> int:
+    """
+    Actualiza el índice de --watch con los PDF notificados por el vigilante.
     
-    # Procesar blogs estándar
-    blogs_a_procesar = blogs_seleccionados if blogs_seleccionados else BLOGS_ESTANDAR
+    Args:
+        indice: {(blog, ruta_relativa): (páginas, estado, detalles, duplicado_de)}, se modifica
+        cambios: (blog, ruta absoluta) de cada PDF creado, modificado o eliminado
+        rutas_blogs: {nombre_blog: ruta del _site}
+        args: Argumentos de la línea de comandos (motor, límites, --metadata…)
+        cache: Caché abierta, o None (--no-cache)
+        
+    Returns:
+        Número de entradas del índice que cambiaron (también las de los
+        duplicados de los PDF notificados)
+    """
+    presentes = []
+    cambiadas = 0
+    for blog, ruta in cambios:
+        clave = (blog, os.path.relpath(ruta, rutas_blogs[blog]))
+        if os.path.isfile(ruta):
+            presentes.append((clave, EntradaRuta(ruta)))
+        elif indice.pop(clave, None) is not None:
+            cambiadas += 1
+            if not args.quiet:
+                print(f"   🗑 {blog}/{clave[1]:<53} [ELIMINADO]")
     
-    for blog in blogs_a_procesar:
-        if blog in BLOGS_ESTANDAR:
-            ruta = base_path / blog / "_site"
-            if ruta.exists():
-                rutas[blog] = str(ruta)
+    conteos = contar_con_cache((entrada for _, entrada in presentes), args.engine, args.jobs, cache,
+                               args.timeout, args.max_memory, args.metadata, args.stats is not None,
+                               args.quiet or args.progress)
+    for (clave, _), conteo in zip(presentes, conteos):
+        paginas, detalles = separar_conteo(conteo)
+        nuevo = registrar_resultado(f"{clave[0]}/{clave[1]}", paginas,
+                                    mostrar=not args.quiet)[1:] + (detalles, None)
+        if indice.get(clave, (None, None))[:2] != nuevo[:2]:
+            cambiadas += 1
+        indice[clave] = nuevo
     
-    # Si no se especificaron blogs o se incluyeron los especiales
-    if not blogs_seleccionados or any(b in ["blog", "teching", "website-achalma"] for b in blogs_seleccionados):
-        for nombre, ruta_relativa in BLOGS_WEBSITE_ACHALMA.items():
-            if not blogs_seleccionados or nombre in blogs_seleccionados or "website-achalma" in blogs_seleccionados:
-                ruta = base_path / ruta_relativa
-                if ruta.exists():
-                    rutas[f"website-achalma/{nombre}"] = str(ruta)
+    # Los duplicados de un original que cambió o desapareció: si siguen siendo
+    # el mismo archivo físico reciben su nuevo conteo; si no, se cuentan solos
+    originales = {f"{blog}/{os.path.relpath(ruta, rutas_blogs[blog])}": (blog, ruta)
+                  for blog, ruta in cambios}
+    huerfanos = []
+    for clave, (paginas, estado, detalles, duplicado_de) in list(indice.items()):
+        if duplicado_de not in originales:
+            continue
+        blog, ruta_original = originales[duplicado_de]
+        ruta = os.path.join(rutas_blogs[clave[0]], clave[1])
+        clave_original = (blog, os.path.relpath(ruta_original, rutas_blogs[blog]))
+        try:
+            mismo_archivo = clave_original in indice and os.path.samefile(ruta, ruta_original)
+        except OSError:
+            mismo_archivo = False
+        if not mismo_archivo:
+            huerfanos.append((clave[0], ruta))
+            continue
+        paginas, estado, detalles_original, _ = indice[clave_original]
+        if detalles_original:                     # el tiempo y los bytes son del original
+            detalles = {campo: valor for campo, valor in detalles_original.items()
+                        if campo not in CAMPOS_RENDIMIENTO}
+        if indice[clave][:2] != (paginas, estado):
+            cambiadas += 1
+        indice[clave] = (paginas, estado, detalles, duplicado_de)
+    if huerfanos:
+        cambiadas += recontar_cambios(indice, huerfanos, rutas_blogs, args, cache)
+    return cambiadas
+
+
+def resincronizar_blog(indice: Dict[Tuple[str, str], tuple], blog: str,
+                       rutas_blogs: Dict[str, str], solo_index: bool) -> List[Tuple[str, str]]:
+    """
+    Cambios de un blog recorrido entero (--watch tras perder eventos).
     
-    return rutas
+    Returns:
+        (blog, ruta absoluta) de todos sus PDF actuales y de los que estaban
+        en el índice y ya no existen, listos para recontar_cambios
+    """
+    raiz = rutas_blogs[blog]
+    cambios = [(blog, entrada.path) for entrada in listar_pdfs(raiz, solo_index)]
+    encontrados = {ruta for _, ruta in cambios}
+    cambios += [(blog, os.path.join(raiz, ruta)) for (b, ruta) in indice
+                if b == blog and os.path.join(raiz, ruta) not in encontrados]
+    return cambios
 
 
-def crear_excel(resultados_por_blog: Dict[str, List[Tuple[str, int, str]]], 
-                archivo_salida: str, 
-                solo_index: bool):
+def volcar_reporte(indice: Dict[Tuple[str, str], tuple], rutas_blogs: Dict[str, str],
+                   archivo_salida: Path, args, cambios: dict = None,
+                   rendimiento: tuple = None) -> Tuple[int, int]:
     """
-    Crea un archivo Excel con los resultados.
+    Reescribe el reporte completo a partir del índice de --watch.
+    
+    Se escribe en un temporal junto al reporte y se renombra encima, así
+    quien lo abra en ese momento ve la versión anterior completa o la nueva.
+    Los cambios (--delta) y el rendimiento (--stats) de la ejecución inicial
+    se vuelven a incluir para que el reporte conserve sus hojas y tablas.
+    
+    Returns:
+        (total de archivos, total de páginas)
+    """
+    temporal = archivo_salida.with_name(f".{archivo_salida.name}.tmp")
+    temporal.unlink(missing_ok=True)
+    escritor = crear_escritor(args.format, str(temporal), solo_index=not args.todos,
+                              metadatos=args.metadata, rendimiento=args.stats is not None)
+    almacen = AlmacenResultados()
+    por_blog: Dict[str, list] = {}
+    for (blog, ruta), valor in indice.items():
+        por_blog.setdefault(blog, []).append((ruta, *valor))
+    for blog in rutas_blogs:
+        if blog not in por_blog:
+            continue
+        escritor.iniciar_blog(blog)
+        # Mismo orden que el recorrido: por directorio y, dentro, por nombre
+        for ruta, paginas, estado, detalles, duplicado_de in sorted(por_blog[blog],
+                                                                   key=lambda f: f[0].split(os.sep)):
+            escritor.agregar_fila(ruta, paginas, estado, detalles, duplicado_de)
+            almacen.agregar(blog, ruta, paginas, estado,
+                            stat_entrada(EntradaRuta(os.path.join(rutas_blogs[blog], ruta))))
+        escritor.cerrar_blog()
+    resumenes = almacen.resumenes()
+    if args.format == "xlsx":
+        escritor.agregar_hoja_resumen(resumenes)
+        if cambios is not None:
+            escritor.agregar_hoja_cambios(cambios)
+        if rendimiento is not None:
+            escritor.agregar_hoja_rendimiento(*rendimiento)
+    escritor.guardar()
+    if args.format == "sqlite":
+        escribir_resumenes(resumenes, str(temporal), args.format)
+        if cambios is not None:
+            escribir_cambios(cambios, str(temporal), args.format)
+    elif args.format != "xlsx":
+        temporal_resumen = temporal.with_name(f".{ruta_resumen(archivo_salida).name}.tmp")
+        escribir_resumenes(resumenes, str(temporal_resumen), args.format)
+        os.replace(temporal_resumen, ruta_resumen(archivo_salida))
+    os.replace(temporal, archivo_salida)
+    archivos, paginas, _ = almacen.totales()
+    return archivos, paginas
+
+
+def vigilar(vigilante: VigilanteSitios, indice: Dict[Tuple[str, str], tuple],
+            rutas_blogs: Dict[str, str], archivo_salida: Path, args,
+            cambios_iniciales: dict = None, rendimiento: tuple = None):
+    """
+    Modo --watch: mantiene el índice al día con inotify hasta Ctrl+C.
+    
+    El vigilante se crea antes del recorrido inicial: los PDF que Quarto
+    escribió mientras tanto esperan en su cola y se recuentan en la
+    primera vuelta. Solo se recuentan los PDF creados o modificados (con
+    antirrebote, ver lib/vigilancia.py); el reporte se reescribe cada
+    --flush-interval segundos si algo cambió, y una última vez al terminar.
     
     Args:
-        resultados_por_blog: Diccionario {nombre_blog: lista de tuplas}
-        archivo_salida: Nombre del archivo Excel de salida
-        solo_index: Si se buscaron solo archivos index.pdf
+        cambios_iniciales, rendimiento: Hojas de la ejecución inicial (--delta,
+            --stats) que cada volcado conserva (ver volcar_reporte)
     """
-    # Crear libro de trabajo
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Conteo de Páginas"
-    
-    # Estilos
-    header_font = Font(bold=True, size=12, color="FFFFFF")
-    header_fill = PatternFill(start_color="2E5090", end_color="2E5090", fill_type="solid")
-    header_alignment = Alignment(horizontal="center", vertical="center")
-    
-    blog_font = Font(bold=True, size=11, color="FFFFFF")
-    blog_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    
-    total_font = Font(bold=True, size=11)
-    total_fill = PatternFill(start_color="E7E6E6", end_color="E7E6E6", fill_type="solid")
-    
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+    cache = None
+    if not args.no_cache:
+        cache = CachePaginas(str(Path(__file__).parent / ARCHIVO_CACHE))
     
-    # Encabezados principales
-    ws['A1'] = "Blog"
-    ws['B1'] = "Ruta del Archivo"
-    ws['C1'] = "Número de Páginas"
-    ws['D1'] = "Estado"
-    
-    # Aplicar estilos a encabezados
-    for cell in ['A1', 'B1', 'C1', 'D1']:
-        ws[cell].font = header_font
-        ws[cell].fill = header_fill
-        ws[cell].alignment = header_alignment
-        ws[cell].border = thin_border
-    
-    # Agregar datos
-    fila_actual = 2
-    total_paginas_global = 0
-    total_archivos = 0
-    
-    for blog, resultados in sorted(resultados_por_blog.items()):
-        if not resultados:
-            continue
-        
-        # Fila de encabezado del blog
-        ws[f'A{fila_actual}'] = blog.upper()
-        ws[f'A{fila_actual}'].font = blog_font
-        ws[f'A{fila_actual}'].fill = blog_fill
-        ws[f'A{fila_actual}'].alignment = Alignment(horizontal="left", vertical="center")
-        ws.merge_cells(f'A{fila_actual}:D{fila_actual}')
-        fila_actual += 1
-        
-        # Datos del blog
-        total_paginas_blog = 0
-        for ruta, paginas, estado in resultados:
-            ws[f'A{fila_actual}'] = ""  # Blog name (empty for data rows)
-            ws[f'B{fila_actual}'] = ruta
-            ws[f'C{fila_actual}'] = paginas if estado == "OK" else 0
-            ws[f'C{fila_actual}'].alignment = Alignment(horizontal="center")
-            ws[f'D{fila_actual}'] = estado
-            ws[f'D{fila_actual}'].alignment = Alignment(horizontal="center")
-            
-            if estado == "OK":
-                total_paginas_blog += paginas
+    imprimir_seccion("VIGILANDO CAMBIOS (Ctrl+C para terminar)")
+    print(f"👀 {vigilante.directorios} directorios vigilados | "
+          f"reporte cada {args.flush_interval} s si hay cambios")
+    
+    pendientes_volcado = 0
+    proximo_volcado = time.monotonic() + args.flush_interval
+    try:
+        while True:
+            cambios = vigilante.esperar(max(0.0, proximo_volcado - time.monotonic()))
+            for blog in vigilante.pendientes_de_resincronizar():
+                print(f"   🔄 Resincronizando {blog}...")
+                cambios += resincronizar_blog(indice, blog, rutas_blogs, not args.todos)
+            if cambios:
+                pendientes_volcado += recontar_cambios(indice, cambios, rutas_blogs, args, cache)
             
-            fila_actual += 1
-            total_archivos += 1
-        
-        # Subtotal del blog
-        ws[f'A{fila_actual}'] = ""
-        ws[f'B{fila_actual}'] = f"SUBTOTAL {blog}"
-        ws[f'B{fila_actual}'].font = Font(bold=True, italic=True)
-        ws[f'C{fila_actual}'] = total_paginas_blog
-        ws[f'C{fila_actual}'].font = Font(bold=True, italic=True)
-        ws[f'C{fila_actual}'].alignment = Alignment(horizontal="center")
-        ws[f'C{fila_actual}'].fill = total_fill
-        ws[f'D{fila_actual}'] = f"{len(resultados)} archivos"
-        ws[f'D{fila_actual}'].font = Font(italic=True)
-        ws[f'D{fila_actual}'].alignment = Alignment(horizontal="center")
-        
-        total_paginas_global += total_paginas_blog
-        fila_actual += 2  # Espacio entre blogs
-    
-    # Total general
-    fila_total = fila_actual
-    ws[f'A{fila_total}'] = ""
-    ws[f'B{fila_total}'] = "TOTAL GENERAL"
-    ws[f'B{fila_total}'].font = total_font
-    ws[f'C{fila_total}'] = total_paginas_global
-    ws[f'C{fila_total}'].font = total_font
-    ws[f'C{fila_total}'].alignment = Alignment(horizontal="center")
-    ws[f'C{fila_total}'].fill = total_fill
-    ws[f'D{fila_total}'] = f"{total_archivos} archivos"
-    ws[f'D{fila_total}'].font = total_font
-    ws[f'D{fila_total}'].alignment = Alignment(horizontal="center")
-    
-    # Ajustar ancho de columnas
-    ws.column_dimensions['A'].width = 25
-    ws.column_dimensions['B'].width = 70
-    ws.column_dimensions['C'].width = 18
-    ws.column_dimensions['D'].width = 15
-    
-    # Agregar metadatos
-    ws = wb.create_sheet("Información")
-    ws['A1'] = "Información del Reporte"
-    ws['A1'].font = Font(bold=True, size=14)
-    ws['A3'] = "Fecha de generación:"
-    ws['B3'] = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-    ws['A4'] = "Tipo de búsqueda:"
-    ws['B4'] = "Solo index.pdf" if solo_index else "Todos los PDFs"
-    ws['A5'] = "Total de blogs procesados:"
-    ws['B5'] = len(resultados_por_blog)
-    ws['A6'] = "Total de archivos:"
-    ws['B6'] = total_archivos
-    ws['A7'] = "Total de páginas:"
-    ws['B7'] = total_paginas_global
-    ws['A8'] = "Generado por:"
-    ws['B8'] = "Edison Achalma - PDF Page Counter"
-    
-    # Guardar archivo
-    wb.save(archivo_salida)
-
-
-def listar_blogs_disponibles():
-    """Lista todos los blogs disponibles"""
+            if time.monotonic() >= proximo_volcado:
+                if pendientes_volcado:
+                    archivos, paginas = volcar_reporte(indice, rutas_blogs, archivo_salida, args,
+                                                       cambios_iniciales, rendimiento)
+                    if cache is not None:
+                        cache.confirmar()
+                    print(f"💾 [{datetime.now().strftime('%H:%M:%S')}] {archivo_salida.name}: "
+                          f"{archivos} archivos | {paginas:,} páginas ({pendientes_volcado} cambio(s))")
+                    pendientes_volcado = 0
+                proximo_volcado = time.monotonic() + args.flush_interval
+    except KeyboardInterrupt:
+        print("\n⏹️  Vigilancia detenida.")
+        cambios = vigilante.vaciar()
+        if cambios:
+            pendientes_volcado += recontar_cambios(indice, cambios, rutas_blogs, args, cache)
+    finally:
+        vigilante.cerrar()
+        if pendientes_volcado:
+            archivos, paginas = volcar_reporte(indice, rutas_blogs, archivo_salida, args,
+                                               cambios_iniciales, rendimiento)
+            print(f"💾 {archivo_salida.name}: {archivos} archivos | {paginas:,} páginas")
+        if cache is not None:
+            cache.cerrar()
+
+
+def listar_blogs_disponibles(configuracion: dict, redescubrir: bool = False):
+    """Lista los blogs descubiertos bajo las raíces configuradas"""
     imprimir_seccion("BLOGS DISPONIBLES")
     
-    print("\n📚 Blogs estándar:")
-    for i, blog in enumerate(BLOGS_ESTANDAR, 1):
-        ruta = Path(RUTA_BASE_PUBLICACIONES) / blog / "_site"
-        estado = "✓" if ruta.exists() else "✗"
-        print(f"   {i:2d}. {estado} {blog}")
+    blogs, indice = descubrir_blogs(configuracion, redescubrir)
+    print(f"\n📁 Raíces: {', '.join(configuracion['raices'])}")
+    if configuracion["archivo"]:
+        print(f"⚙️  Configuración: {configuracion['archivo']}")
+    print("🗂️  Índice de sitios: " + ("sin cambios, reutilizado" if indice.reutilizado else
+                                     f"actualizado ({indice.directorios_recorridos} directorios recorridos)"))
     
-    print("\n🌐 Blogs en website-achalma:")
-    for nombre, ruta_rel in BLOGS_WEBSITE_ACHALMA.items():
-        ruta = Path(RUTA_BASE_PUBLICACIONES) / ruta_rel
-        estado = "✓" if ruta.exists() else "✗"
-        print(f"       {estado} {nombre}")
+    print("\n📚 Blogs:")
+    for i, (nombre, ruta) in enumerate(blogs.items(), 1):
+        print(f"   {i:2d}. {nombre:<30} {ruta}")
+    if not blogs:
+        print("   (ninguno: no hay directorios _site bajo las raíces)")
     
-    print("\n✓ = Disponible | ✗ = No encontrado\n")
+    # Los subdirectorios configurados que no existen en un sitio encontrado no aparecen arriba
+    faltantes = [f"{sitio}/{sub}" for sitio, subs in configuracion["subsitios"].items()
+                 if sitio in indice.sitios for sub in subs if f"{sitio}/{sub}" not in blogs]
+    if faltantes:
+        print(f"\n✗ Subsitios configurados sin _site: {', '.join(faltantes)}")
+    print()
 
 
 def main():
@@ -369,11 +841,57 @@ Ejemplos de uso:
   # Contar todos los PDFs (no solo index.pdf)
   %(prog)s --todos
   
-  # Listar blogs disponibles
+  # Listar blogs disponibles (se descubren los _site bajo las raíces)
   %(prog)s --listar
   
+  # Otras raíces o archivo de configuración (TOML/YAML)
+  %(prog)s --root ~/publicaciones ~/cursos
+  %(prog)s --config ~/.config/pdf_page_counter.toml
+  
   # Archivo de salida personalizado
   %(prog)s -o mi_reporte.xlsx
+  
+  # Salida CSV / JSON Lines / SQLite (sin openpyxl)
+  %(prog)s --format csv
+  %(prog)s --format jsonl --engine fast
+  
+  # Ignorar la caché / reconstruirla desde cero
+  %(prog)s --no-cache
+  %(prog)s --rebuild-cache
+  
+  # Añadir metadatos (versión, cifrado, título, autor…) en la misma lectura
+  %(prog)s --metadata --format csv
+  
+  # Reportar qué cambió desde la ejecución anterior
+  %(prog)s --delta
+  
+  # Tiempos por fase y los 20 PDF más lentos (hoja "Rendimiento" en Excel)
+  %(prog)s --stats 20 --no-cache
+  
+  # Descubrir los index.pdf desde search.json/sitemap.xml sin recorrer _site
+  %(prog)s --discovery manifest
+  
+  # Recorrer el disco e informar de los PDF que faltan en los manifiestos
+  %(prog)s --discovery audit
+  
+  # Seguir contando mientras Quarto renderiza (reporte cada 60 s)
+  %(prog)s --todos --watch --flush-interval 60
+  
+  # Tratar también como duplicadas las copias idénticas (no solo enlaces duros)
+  %(prog)s --dedup-content
+  
+  # Una línea de progreso por blog en lugar de una por PDF (o nada con --quiet)
+  %(prog)s --todos --progress
+  %(prog)s --quiet --format csv
+  
+  # Contar en paralelo con 16 procesos
+  %(prog)s --todos --jobs 16
+  
+  # Cortar a los 20 s y 1 GB por PDF (0 desactiva cada límite)
+  %(prog)s --timeout 20 --max-memory 1024
+  
+  # Forzar el análisis completo con PyPDF2 (más lento)
+  %(prog)s --engine pypdf2
         """
     )
     
@@ -391,7 +909,137 @@ Ejemplos de uso:
     
     parser.add_argument(
         '-o', '--output',
-        help='Nombre del archivo Excel de salida (se guardará en excel_databases/)'
+        help='Nombre del archivo de salida (se guardará en excel_databases/)'
+    )
+    
+    parser.add_argument(
+        '-f', '--format',
+        choices=FORMATOS,
+        default='xlsx',
+        help='Formato del reporte: xlsx (por defecto), csv, jsonl o sqlite'
+    )
+    
+    parser.add_argument(
+        '--engine',
+        choices=['fast', 'pypdf2', 'auto'],
+        default=MOTOR_PREDETERMINADO,
+        help=f'Motor de conteo de páginas (por defecto: {MOTOR_PREDETERMINADO})'
+    )
+    
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Procesos para contar páginas en paralelo (0 = todos los núcleos; por defecto: 1)'
+    )
+    
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=TIMEOUT_POR_ARCHIVO,
+        help=f'Segundos máximos por PDF; al vencer queda en TIMEOUT (0 = sin límite; por defecto: {TIMEOUT_POR_ARCHIVO})'
+    )
+    
+    parser.add_argument(
+        '--max-memory',
+        type=int,
+        default=LIMITE_MEMORIA_MB,
+        help=f'Memoria máxima (MB) de cada proceso de conteo; al superarla el PDF queda en OOM (0 = sin límite; por defecto: {LIMITE_MEMORIA_MB})'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'No leer ni escribir la caché de conteos ({ARCHIVO_CACHE})'
+    )
+    
+    parser.add_argument(
+        '--rebuild-cache',
+        action='store_true',
+        help='Vaciar la caché de conteos y volver a analizar todos los PDFs'
+    )
+    
+    parser.add_argument(
+        '--metadata',
+        action='store_true',
+        help='Añadir tamaño, versión, cifrado, linealización, título, autor y fecha de creación de cada PDF'
+    )
+    
+    parser.add_argument(
+        '--delta',
+        action='store_true',
+        help='Reportar los PDF nuevos, eliminados, modificados o rotos desde la ejecución anterior'
+    )
+    
+    parser.add_argument(
+        '--stats',
+        nargs='?',
+        type=int,
+        const=10,
+        metavar='N',
+        help='Medir tiempo y bytes leídos de cada PDF y mostrar los N más lentos (por defecto: 10)'
+    )
+    
+    parser.add_argument(
+        '--dedup-content',
+        action='store_true',
+        help='Detectar también copias idénticas sin enlazar (resumen del contenido); los enlaces duros se detectan siempre'
+    )
+    
+    parser.add_argument(
+        '--discovery',
+        choices=['walk', 'manifest', 'audit'],
+        default='walk',
+        help='Cómo encontrar los index.pdf: recorrer _site (walk, por defecto), leer los manifiestos '
+             'de Quarto (manifest; recorre los blogs sin manifiesto) o recorrer y listar los que '
+             'faltan en los manifiestos (audit)'
+    )
+    
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Tras el conteo inicial, vigilar los _site (inotify) y recontar los PDF que cambien hasta Ctrl+C'
+    )
+    
+    parser.add_argument(
+        '--flush-interval',
+        type=float,
+        default=INTERVALO_VOLCADO,
+        metavar='SEGUNDOS',
+        help=f'Con --watch, cada cuántos segundos se reescribe el reporte si hubo cambios (por defecto: {INTERVALO_VOLCADO})'
+    )
+    
+    salida_consola = parser.add_mutually_exclusive_group()
+    salida_consola.add_argument(
+        '--progress',
+        action='store_true',
+        help='Mostrar una línea de progreso por blog (archivos, páginas, errores, ritmo y ETA) '
+             'en lugar de una línea por PDF; el detalle queda en el reporte'
+    )
+    salida_consola.add_argument(
+        '-q', '--quiet',
+        action='store_true',
+        help='No mostrar nada por PDF, solo los resúmenes; el detalle queda en el reporte'
+    )
+    
+    parser.add_argument(
+        '--config',
+        metavar='ARCHIVO',
+        help=f'Archivo de configuración TOML o YAML (raices, profundidad, subsitios; '
+             f'por defecto: {ARCHIVOS_CONFIGURACION[0]} junto al script, si existe)'
+    )
+    
+    parser.add_argument(
+        '--root',
+        nargs='+',
+        metavar='DIR',
+        help='Directorios donde buscar los _site de los blogs (reemplaza las raíces de la configuración)'
+    )
+    
+    parser.add_argument(
+        '--rediscover',
+        action='store_true',
+        help=f'Buscar de nuevo los _site aunque el índice de sitios ({ARCHIVO_INDICE_SITIOS}) esté al día'
     )
     
     parser.add_argument(
@@ -401,19 +1049,54 @@ Ejemplos de uso:
     )
     
     args = parser.parse_args()
+    if args.jobs < 0:
+        parser.error("--jobs debe ser >= 0")
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    if args.timeout < 0 or args.max_memory < 0:
+        parser.error("--timeout y --max-memory deben ser >= 0")
+    if args.flush_interval <= 0:
+        parser.error("--flush-interval debe ser > 0")
+    if args.stats is not None and args.stats < 1:
+        parser.error("--stats debe ser >= 1")
+    if args.no_cache and args.rebuild_cache:
+        parser.error("--no-cache y --rebuild-cache son incompatibles")
+    
+    # Avisos de lib/ (directorios ilegibles, manifiestos dañados…); --quiet los oculta
+    avisos = ManejadorAvisos()
+    logging.getLogger("lib").addHandler(avisos)
+    logging.getLogger("lib").setLevel(logging.ERROR if args.quiet else logging.WARNING)
     
     # Mostrar encabezado
     imprimir_encabezado()
     
+    # Raíces: archivo de configuración y --root
+    try:
+        configuracion = cargar_raices(args.config, args.root)
+    except ImportError as e:
+        if e.name == "yaml":
+            print("❌ Error: Para una configuración YAML instala PyYAML (pip3 install pyyaml) o usa TOML.")
+        else:
+            print("❌ Error: Para una configuración TOML con Python < 3.11 instala tomli (pip3 install tomli).")
+        return
+    except (OSError, ValueError) as e:
+        print(f"❌ Error en la configuración: {e}")
+        return
+    
     # Si solo quiere listar blogs
     if args.listar:
-        listar_blogs_disponibles()
+        listar_blogs_disponibles(configuracion, args.rediscover)
+        return
+    
+    # Importar solo lo que esta ejecución necesita
+    if not verificar_dependencias(args.format, args.engine):
         return
     
-    # Verificar que la ruta base existe
-    if not Path(RUTA_BASE_PUBLICACIONES).exists():
-        print(f"❌ Error: La ruta base no existe: {RUTA_BASE_PUBLICACIONES}")
-        print("   Por favor, actualiza RUTA_BASE_PUBLICACIONES en el script.")
+    # Verificar que alguna raíz existe
+    if not any(Path(raiz).exists() for raiz in configuracion["raices"]):
+        print(f"❌ Error: Ninguna raíz existe: {', '.join(configuracion['raices'])}")
+        print(f"   Por favor, configura 'raices' en {ARCHIVOS_CONFIGURACION[0]}, usa --root "
+              f"o actualiza RUTA_BASE_PUBLICACIONES en el script.")
         return
     
     # Crear directorio para Excel
@@ -425,62 +1108,238 @@ Ejemplos de uso:
     else:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         tipo = "todos" if args.todos else "index"
-        archivo_salida = excel_dir / f"conteo_paginas_{tipo}_{timestamp}.xlsx"
+        archivo_salida = excel_dir / f"conteo_paginas_{tipo}_{timestamp}.{args.format}"
     
-    # Obtener rutas de blogs
-    rutas_blogs = obtener_rutas_blogs(args.blogs)
+    # Obtener rutas de blogs (en orden alfabético, el mismo del Excel)
+    rutas_blogs = dict(sorted(obtener_rutas_blogs(args.blogs, configuracion, args.rediscover).items()))
     
     if not rutas_blogs:
         print("❌ No se encontraron blogs para procesar.")
         print("   Usa --listar para ver los blogs disponibles.")
         return
     
+    # Los manifiestos solo listan páginas: con --todos los adjuntos hay que recorrerlos
+    if args.discovery == "manifest" and args.todos:
+        print("ℹ️  --discovery manifest solo aplica a index.pdf; con --todos se recorre el disco.")
+        args.discovery = "walk"
+    
+    # Con --watch los watches se instalan antes del recorrido: lo que Quarto
+    # escriba mientras tanto queda en la cola de inotify y se recuenta después
+    vigilante = None
+    if args.watch:
+        try:
+            vigilante = VigilanteSitios(rutas_blogs, not args.todos, DIRECTORIOS_EXCLUIDOS)
+        except OSError as e:
+            print(f"❌ No se pudo iniciar la vigilancia: {e}")
+    
+    medir = args.stats is not None
+    estadisticas = EstadisticasRendimiento(args.timeout)
+    cronometro = estadisticas.cronometro
+    manifiestos = {}
+    if args.discovery != "walk":
+        with cronometro.fase("descubrimiento"):
+            manifiestos = cargar_manifiestos(rutas_blogs)
+    
     # Mostrar configuración
     imprimir_seccion("CONFIGURACIÓN")
-    print(f"📁 Ruta base: {RUTA_BASE_PUBLICACIONES}")
+    print(f"📁 Raíces: {', '.join(configuracion['raices'])}")
     print(f"📊 Modo: {'Todos los PDFs' if args.todos else 'Solo index.pdf'}")
+    print(f"⚙️  Motor: {args.engine} | Procesos: {args.jobs}")
+    print(f"⏱️  Límites por PDF: {args.timeout or '∞'} s | {args.max_memory or '∞'} MB")
+    if manifiestos:
+        con_manifiesto = sum(1 for c in manifiestos.values() if c is not None)
+        print(f"🗺️  Descubrimiento: {args.discovery} | {con_manifiesto}/{len(manifiestos)} blogs con manifiesto")
     print(f"📝 Blogs a procesar: {len(rutas_blogs)}")
     print(f"💾 Archivo de salida: {archivo_salida.name}")
     
     # Procesar cada blog
     imprimir_seccion("PROCESANDO BLOGS")
     
-    resultados_por_blog = {}
-    total_archivos = 0
-    total_paginas = 0
-    total_errores = 0
+    total_duplicados = 0
+    paginas_duplicadas = 0
+    
+    # La ejecución anterior da los archivos esperados por blog (ETA de --progress) y la base de --delta
+    registro = RegistroEjecucion(str(excel_dir), solo_index=not args.todos)
+    hay_anterior = registro.cargar()
+    progreso = None
+    if args.progress:
+        progreso = LineaProgreso()
+        avisos.progreso = progreso
+        esperados_por_blog = Counter(blog for blog, _ in registro.resultados)
+    
+    # Un único flujo perezoso de PDFs de todos los blogs: el pool de procesos
+    # reparte el trabajo entre blogs y el conteo empieza durante el recorrido
+    # (con --discovery manifest, solo los candidatos de los manifiestos)
+    tareas = ((nombre, ruta, entrada) for nombre, ruta in rutas_blogs.items()
+              for entrada in listar_pdfs(ruta, solo_index=not args.todos,
+                                         candidatos=manifiestos.get(nombre)
+                                         if args.discovery == "manifest" else None))
+    tareas, para_contar = tee(cronometro.medir("descubrimiento", tareas))
+    cache = None
+    if not args.no_cache:
+        cache = CachePaginas(str(Path(__file__).parent / ARCHIVO_CACHE),
+                             reconstruir=args.rebuild_cache)
+    # Cada archivo físico se analiza una vez; sus otras rutas reciben el mismo conteo
+    dedup = Deduplicador(por_contenido=args.dedup_content)
+    conteos = dedup.mapear((t[2] for t in para_contar), lambda unicos: contar_con_cache(
+        unicos, args.engine, args.jobs, cache, args.timeout, args.max_memory, args.metadata, medir,
+        args.quiet or args.progress))
+    conteos = cronometro.medir("conteo", conteos)
+    # Los conteos llegan en el mismo orden en que se descubrieron los PDFs
+    flujo = zip(tareas, conteos)
+    pendiente = next(flujo, None)
+    
+    # Las filas del reporte se escriben a medida que llegan los conteos; el
+    # almacén columnar guarda lo necesario para subtotales y resúmenes
+    escritor = None
+    almacen = AlmacenResultados()
+    # (blog, ruta) → (páginas, estado), para el registro de esta ejecución
+    actuales = {}
+    # (blog, ruta) → (páginas, estado, detalles, duplicado_de), el índice que mantiene --watch
+    indice = {}
+    # 'blog/ruta' de los index.pdf del disco que no están en los manifiestos (--discovery audit)
+    fuera_de_manifiesto = []
     
     for i, (nombre_blog, ruta) in enumerate(rutas_blogs.items(), 1):
         print(f"\n📖 [{i}/{len(rutas_blogs)}] Procesando: {nombre_blog}")
-        resultados = buscar_pdfs_en_directorio(ruta, solo_index=not args.todos)
+        esperados = manifiestos.get(nombre_blog)
+        if manifiestos and esperados is None:
+            print("   ℹ️  Sin manifiesto: se recorre el disco")
+        elif args.discovery == "audit":
+            esperados = set(esperados)
+        else:
+            esperados = None
         
-        if resultados:
-            resultados_por_blog[nombre_blog] = resultados
-            archivos_ok = sum(1 for _, _, estado in resultados if estado == "OK")
-            paginas_blog = sum(p for _, p, estado in resultados if estado == "OK")
-            errores_blog = sum(1 for _, _, estado in resultados if estado == "ERROR")
-            
-            total_archivos += len(resultados)
-            total_paginas += paginas_blog
-            total_errores += errores_blog
-            
-            print(f"   📊 Resumen: {archivos_ok} OK | {errores_blog} errores | {paginas_blog} páginas")
+        archivos_blog = 0
+        duplicados_blog = 0
+        estadisticas.iniciar_blog(nombre_blog)
+        if progreso is not None:
+            candidatos = manifiestos.get(nombre_blog) if args.discovery == "manifest" else None
+            progreso.iniciar(esperados_por_blog.get(nombre_blog)
+                             or (len(candidatos) if candidatos else None))
+        while pendiente is not None and pendiente[0][0] == nombre_blog:
+            (_, _, entrada), (conteo, original) = pendiente
+            paginas, detalles = separar_conteo(conteo)
+            duplicado_de = None
+            if original is not None:
+                duplicado_de = etiqueta_ruta(original, rutas_blogs)
+                if detalles:                      # el tiempo y los bytes son del original
+                    detalles = {campo: valor for campo, valor in detalles.items()
+                                if campo not in CAMPOS_RENDIMIENTO}
+            resultado = registrar_resultado(os.path.relpath(entrada.path, ruta), paginas,
+                                            mostrar=not (args.progress or args.quiet))
+            archivos_blog += 1
+            if progreso is not None:
+                progreso.avanzar(*resultado[1:])
+            almacen.agregar(nombre_blog, *resultado, stat_entrada(entrada))
+            if esperados is not None and entrada.name == "index.pdf" \
+                    and resultado[0] not in esperados:
+                fuera_de_manifiesto.append(f"{nombre_blog}/{resultado[0]}")
+            if duplicado_de:
+                duplicados_blog += 1
+                paginas_duplicadas += resultado[1] if resultado[2] == "OK" else 0
+            with cronometro.fase("reporte"):
+                if escritor is None:
+                    escritor = crear_escritor(args.format, str(archivo_salida), solo_index=not args.todos,
+                                              metadatos=args.metadata, rendimiento=medir)
+                if archivos_blog == 1:
+                    escritor.iniciar_blog(nombre_blog)
+                escritor.agregar_fila(*resultado, detalles, duplicado_de)
+            actuales[(nombre_blog, resultado[0])] = resultado[1:]
+            if vigilante is not None:
+                indice[(nombre_blog, resultado[0])] = resultado[1:] + (detalles, duplicado_de)
+            if medir:
+                estadisticas.registrar(nombre_blog, *resultado, detalles)
+            pendiente = next(flujo, None)
+        estadisticas.cerrar_blog()
+        if progreso is not None:
+            progreso.cerrar()
+        
+        if not archivos_blog:
+            print(f"   ℹ️  No se encontraron archivos en: {Path(ruta).name}")
+            continue
+        with cronometro.fase("reporte"):
+            escritor.cerrar_blog()
+        
+        _, paginas_blog, estados_blog = almacen.totales(nombre_blog)
+        errores_blog = archivos_blog - estados_blog["OK"] - estados_blog["VACÍO"]
+        total_duplicados += duplicados_blog
+        
+        print(f"   📊 Resumen: {estados_blog['OK']} OK | {errores_blog} errores | {paginas_blog} páginas"
+              + (f" | {duplicados_blog} duplicado(s)" if duplicados_blog else ""))
+    
+    # Cerrar el flujo termina los procesos del pool (--watch sigue en este proceso)
+    conteos.close()
+    if cache is not None:
+        cache.cerrar()
     
-    if not resultados_por_blog:
+    # Comparar con la ejecución anterior y dejar esta como la nueva base
+    cambios = None
+    if hay_anterior and args.delta:
+        cambios = calcular_cambios(registro.resultados, actuales, rutas_blogs)
+        imprimir_cambios(cambios, registro.fecha)
+    elif args.delta:
+        print("\nℹ️  No hay una ejecución anterior con la que comparar; esta será la base.")
+    with cronometro.fase("guardado"):
+        registro.guardar(actuales, rutas_blogs)
+    
+    if escritor is None:
         print("\n⚠️  No se encontraron archivos PDF en ningún blog.")
+        if vigilante is not None:
+            vigilar(vigilante, indice, rutas_blogs, archivo_salida, args)
         return
     
-    # Crear reporte Excel
+    # Resúmenes por blog, sección y año en una pasada sobre el almacén
+    with cronometro.fase("reporte"):
+        resumenes = almacen.resumenes()
+    
+    # Cerrar el reporte (en Excel: total general + hojas de cambios, resumen e información)
     imprimir_seccion("GENERANDO REPORTE")
-    print(f"📝 Creando archivo Excel...")
-    crear_excel(resultados_por_blog, str(archivo_salida), solo_index=not args.todos)
-    print(f"✅ Archivo creado: {archivo_salida}")
+    print(f"📝 Guardando archivo {args.format}...")
+    rendimiento = None
+    with cronometro.fase("guardado"):
+        if args.format == "xlsx":
+            escritor.agregar_hoja_resumen(resumenes)
+        if cambios is not None and args.format == "xlsx":
+            escritor.agregar_hoja_cambios(cambios)
+        if medir and args.format == "xlsx":
+            # Las fases llegan hasta aquí: el propio guardado queda fuera de la hoja
+            rendimiento = (cronometro.resumen(), estadisticas.por_blog(),
+                           estadisticas.mas_lentos(args.stats))
+            escritor.agregar_hoja_rendimiento(*rendimiento)
+        escritor.guardar()
+        print(f"✅ Archivo creado: {archivo_salida}")
+        if args.format == "sqlite":
+            escribir_resumenes(resumenes, str(archivo_salida), args.format)
+            print("✅ Resúmenes en la tabla 'resumenes' del mismo archivo")
+        elif args.format != "xlsx":
+            escribir_resumenes(resumenes, str(ruta_resumen(archivo_salida)), args.format)
+            print(f"✅ Resúmenes: {ruta_resumen(archivo_salida)}")
+        if cambios is not None and args.format == "sqlite":
+            escribir_cambios(cambios, str(archivo_salida), args.format)
+            print("✅ Cambios en la tabla 'cambios' del mismo archivo")
+        elif cambios is not None and args.format != "xlsx":
+            archivo_cambios = archivo_salida.with_name(
+                f"{archivo_salida.stem}_cambios{archivo_salida.suffix}")
+            escribir_cambios(cambios, str(archivo_cambios), args.format)
+            print(f"✅ Cambios: {archivo_cambios}")
+    
+    if args.discovery == "audit":
+        imprimir_fuera_de_manifiesto(fuera_de_manifiesto)
+    
+    if medir:
+        imprimir_rendimiento(estadisticas, args.stats)
     
     # Mostrar resumen final
-    imprimir_resumen(total_archivos, total_paginas, total_errores)
+    total_archivos, total_paginas, estados = almacen.totales()
+    imprimir_resumen(total_archivos, total_paginas, total_archivos - estados["OK"] - estados["VACÍO"],
+                     cache, total_duplicados, paginas_duplicadas)
     
     print(f"💡 Tip: El archivo se guardó en: {excel_dir}/")
     print(f"💡 Tip: Usa --listar para ver todos los blogs disponibles\n")
+    
+    if vigilante is not None:
+        vigilar(vigilante, indice, rutas_blogs, archivo_salida, args, cambios, rendimiento)
 
 
 if __name__ == "__main__":